@@ -0,0 +1,62 @@
+"""Offered rate of the open-model load in a fake distributed locust run.
+
+Importing locust monkey patches the process with gevent, so this runs in a separate process:
+python -m benchmarks.arrival_scaling --rate 100 --users 100 --workers 4
+"""
+import argparse
+import json
+import types
+import typing as tp
+
+from locust import argument_parser, events
+from locust.runners import LocalRunner, MasterRunner, WorkerRunner
+
+from loadtesting.proxy.common.arrival import RateSchedule
+
+
+def parse_options(*args: str) -> argparse.Namespace:
+    # the parser gets custom options of the imported modules by init_command_line_parser
+    return argument_parser.get_parser().parse_args(["-f", "arrival_rate.py", *args])
+
+
+def fake_environment(runner_class: tp.Type, options: argparse.Namespace, target_user_count: int):
+    # runners are not started, only their type and user count matter
+    runner = runner_class.__new__(runner_class)
+    runner.greenlet = None
+    runner.target_user_count = target_user_count
+    return types.SimpleNamespace(parsed_options=options, runner=runner)
+
+
+def worker_options(master_options: argparse.Namespace) -> argparse.Namespace:
+    """Options of a worker started with defaults after a spawn message, the same way as WorkerRunner updates them"""
+    options = parse_options()
+    defaults = argument_parser.default_args_dict()
+    vars(options).update({k: v for k, v in vars(master_options).items() if k not in defaults})
+    return options
+
+
+def offered_rate(rate: float, users: int, workers: int, spawned: int, *args: str) -> float:
+    """Total rate of all workers when each of them has `spawned` users running"""
+    master = fake_environment(MasterRunner, parse_options("-u", str(users), "--arrival-rate", str(rate), *args), users)
+    events.test_start.fire(environment=master)
+    worker = fake_environment(WorkerRunner, worker_options(master.parsed_options), spawned)
+    return RateSchedule.per_user(worker).rate_at(0) * spawned * workers
+
+
+def run(rate: float, users: int, workers: int) -> tp.Dict[str, float]:
+    local = fake_environment(LocalRunner, parse_options("-u", str(users), "--arrival-rate", str(rate)), users)
+    return {
+        "local": RateSchedule.per_user(local).rate_at(0) * users,
+        "distributed": offered_rate(rate, users, workers, users // workers),
+        "ramp_up": offered_rate(rate, users, workers, 1),
+        "explicit": offered_rate(rate, users, workers, users // workers, "--arrival-users", str(users * 2)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=100)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rate, args.users, args.workers)))
@@ -0,0 +1,12 @@
+"""Benchmarks don't need a stand, so network-bound autouse fixtures from the root conftest are disabled here"""
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def allure_environment():
+    yield {}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def faucet():
+    return None
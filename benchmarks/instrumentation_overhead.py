@@ -0,0 +1,57 @@
+"""Measure per-call overhead of locust statistics instrumentation.
+
+Importing locust monkey patches the process with gevent, so this runs in a separate process:
+python -m benchmarks.instrumentation_overhead --calls 200000
+"""
+import argparse
+import json
+import timeit
+import typing as tp
+
+import locust
+
+from loadtesting.proxy.common.instrumentation import instrument, instrument_class
+
+
+class Client:
+    def get_block_number(self):
+        return 1
+
+    def send_neon(self):
+        return self.get_block_number()
+
+
+def overhead_us(instrumented: tp.Callable, raw: tp.Callable, calls: int) -> float:
+    instrumented_time = min(timeit.repeat(instrumented, number=calls, repeat=5))
+    raw_time = min(timeit.repeat(raw, number=calls, repeat=5))
+    return (instrumented_time - raw_time) / calls * 1_000_000
+
+
+def reported_requests() -> tp.List[str]:
+    """Request types reported by one call of an instrumented method which calls another one"""
+    requests = []
+
+    def listener(request_type, **kwargs):
+        requests.append(request_type)
+
+    locust.events.request.add_listener(listener)
+    try:
+        client_cls = instrument_class(type("InstrumentedClient", (Client,), {}))
+        client_cls().send_neon()
+    finally:
+        locust.events.request.remove_listener(listener)
+    return requests
+
+
+def run(calls: int) -> tp.Dict[str, tp.Any]:
+    def call():
+        return 1
+
+    return {"overhead_us": overhead_us(instrument(call, "Call"), call, calls), "nested": reported_requests()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls)))
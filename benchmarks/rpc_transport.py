@@ -0,0 +1,57 @@
+"""Compare throughput of web3 transports used by locust workers against a local JSON-RPC stub.
+
+Run: python -m benchmarks.rpc_transport --greenlets 50 --requests 5000
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import json
+import time
+import typing as tp
+
+import gevent.pool
+import web3
+from gevent.pywsgi import WSGIServer
+
+from loadtesting.proxy.common.transport import GeventHTTPProvider
+
+
+def rpc_stub(environ, start_response):
+    request = json.loads(environ["wsgi.input"].read())
+    body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0x10"}).encode()
+    start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+def measure_rps(provider: web3.providers.BaseProvider, greenlets: int, requests_count: int) -> float:
+    client = web3.Web3(provider)
+    client.eth.block_number  # warm up connections
+    pool = gevent.pool.Pool(greenlets)
+    started = time.perf_counter()
+    for _ in range(requests_count):
+        pool.spawn(lambda: client.eth.block_number)
+    pool.join(raise_error=True)
+    return requests_count / (time.perf_counter() - started)
+
+
+def run(greenlets: int, requests_count: int) -> tp.Dict[str, float]:
+    server = WSGIServer(("127.0.0.1", 0), rpc_stub, log=None)
+    server.start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        return {
+            "requests": measure_rps(web3.HTTPProvider(url), greenlets, requests_count),
+            "gevent": measure_rps(GeventHTTPProvider(url, concurrency=greenlets), greenlets, requests_count),
+        }
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--greenlets", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.greenlets, args.requests)))
@@ -0,0 +1,122 @@
+"""HTTP plumbing shared by the local stands and the JSON stubs of benchmarks.
+
+Handlers keep connections alive and answer without TCP delays like a real node behind a load balancer: Nagle is
+disabled for the responses, and requests are ACKed at once because clients (httpx) write the headers and the body
+separately, so their Nagle would otherwise wait for the delayed ACK (40 ms) on every request.
+"""
+import contextlib
+import json
+import logging
+import socket
+import threading
+import time
+import typing as tp
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOG = logging.getLogger(__name__)
+
+
+class RPCError(Exception):
+    def __init__(self, message: str, code: int = -32000, data: tp.Optional[tp.Any] = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class JsonRpcSimulator:
+    """Dispatches JSON-RPC requests to the `_methods` of the simulator"""
+
+    _methods: tp.Dict[str, tp.Callable]
+
+    def call(self, request: tp.Dict) -> tp.Dict:
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        method = self._methods.get(request.get("method"))
+        if method is None:
+            response["error"] = {"code": -32601, "message": f"Method {request.get('method')} not found"}
+            return response
+        try:
+            response["result"] = method(*request.get("params", []))
+        except RPCError as e:
+            response["error"] = {"code": e.code, "message": str(e)}
+            if e.data is not None:
+                response["error"]["data"] = e.data
+        except (TypeError, ValueError, KeyError) as e:
+            response["error"] = {"code": -32602, "message": f"Invalid params: {e}"}
+        except Exception as e:
+            LOG.exception(f"Failed to handle {request}")
+            response["error"] = {"code": -32603, "message": f"Internal error: {e}"}
+        return response
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Answers POST requests with JSON bodies, subclasses implement `post`"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # seconds added to every request
+    latency: float = 0.0
+
+    def handle_one_request(self):
+        if hasattr(socket, "TCP_QUICKACK"):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        super().handle_one_request()
+
+    def log_message(self, format, *args):
+        LOG.debug(format, *args)
+
+    def post(self, request: tp.Any) -> tp.Tuple[int, tp.Any]:
+        """Return the status and the body of the response"""
+        raise NotImplementedError
+
+    def reply(self, status: int, body: tp.Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except json.JSONDecodeError:
+            self.reply(400, {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+            return
+        self.reply(*self.post(request))
+
+
+class JsonRpcHandler(JSONHandler):
+    """Serves single and batch JSON-RPC requests of the simulator"""
+
+    simulator: JsonRpcSimulator
+
+    @classmethod
+    def bind(cls, simulator: JsonRpcSimulator, latency: float = 0.0) -> tp.Type["JsonRpcHandler"]:
+        """Handler class serving the simulator"""
+        return type(cls.__name__, (cls,), {"simulator": simulator, "latency": latency})
+
+    def post(self, request: tp.Any) -> tp.Tuple[int, tp.Any]:
+        if isinstance(request, list):
+            return 200, [self.simulator.call(item) for item in request]
+        return 200, self.simulator.call(request)
+
+
+def make_server(handler: tp.Type[BaseHTTPRequestHandler], port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+@contextlib.contextmanager
+def running_server(handler: tp.Type[BaseHTTPRequestHandler], port: int = 0) -> tp.Iterator[str]:
+    """Serve in a background thread, yields the base url"""
+    server = make_server(handler, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
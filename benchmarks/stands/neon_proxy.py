@@ -0,0 +1,326 @@
+"""Deterministic in-memory stand-in for the Neon proxy and faucet.
+
+Serves the eth_*/neon_*/net_* methods used by Web3Client, Faucet, JsonRPCSession and the locust task sets, so client
+changes can be measured on one machine without a stand. Transactions are always successful, receipts appear after
+the configured latency.
+
+Run: python -m benchmarks.stands.neon_proxy --port 9090 --receipt-latency 0.4 --rpc-latency 0.005
+Then use http://127.0.0.1:9090/solana as proxy_url and http://127.0.0.1:9090/ as faucet_url.
+"""
+import argparse
+import contextlib
+import dataclasses
+import logging
+import threading
+import time
+import typing as tp
+
+import base58
+import rlp
+from eth_account import Account
+from eth_account._utils.legacy_transactions import Transaction
+from eth_account._utils.typed_transactions import TypedTransaction
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+from benchmarks.stands.jsonrpc import JsonRpcHandler, JsonRpcSimulator, RPCError, make_server, running_server
+
+LOG = logging.getLogger(__name__)
+
+CHAIN_ID = 111
+GAS_PRICE = 1_500_000_000
+TOKEN_PRICE_USD = 0.25
+TRANSFER_GAS = 21_000
+VERSION = "simulator"
+
+
+@dataclasses.dataclass
+class SimulatedTransaction:
+    hash: str
+    sender: str
+    to: tp.Optional[str]
+    nonce: int
+    value: int
+    gas: int
+    gas_price: int
+    data: str
+    block_number: int
+    ready_at: float
+    contract_address: tp.Optional[str] = None
+
+    @property
+    def block_hash(self) -> str:
+        return block_hash(self.block_number)
+
+    def as_transaction(self) -> tp.Dict:
+        return {
+            "hash": self.hash,
+            "blockHash": self.block_hash,
+            "blockNumber": hex(self.block_number),
+            "transactionIndex": "0x0",
+            "from": self.sender,
+            "to": self.to,
+            "nonce": hex(self.nonce),
+            "value": hex(self.value),
+            "gas": hex(self.gas),
+            "gasPrice": hex(self.gas_price),
+            "input": self.data,
+            "type": "0x0",
+            "chainId": hex(CHAIN_ID),
+            "v": "0x0",
+            "r": "0x0",
+            "s": "0x0",
+        }
+
+    def as_receipt(self) -> tp.Dict:
+        return {
+            "transactionHash": self.hash,
+            "transactionIndex": "0x0",
+            "blockHash": self.block_hash,
+            "blockNumber": hex(self.block_number),
+            "from": self.sender,
+            "to": self.to,
+            "contractAddress": self.contract_address,
+            "cumulativeGasUsed": hex(self.gas_used),
+            "gasUsed": hex(self.gas_used),
+            "effectiveGasPrice": hex(self.gas_price),
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x0",
+        }
+
+    @property
+    def gas_used(self) -> int:
+        return min(self.gas, TRANSFER_GAS)
+
+
+def block_hash(number: int) -> str:
+    return "0x" + keccak(number.to_bytes(32, "big")).hex()
+
+
+def solana_signatures(tx_hash: str, count: int = 1) -> tp.List[str]:
+    return [base58.b58encode(keccak(bytes.fromhex(tx_hash[2:]) + bytes([i])) * 2).decode() for i in range(count)]
+
+
+def decode_raw_transaction(raw: bytes) -> tp.Dict:
+    """Fields of a signed legacy or typed transaction in the web3 naming, `to` is a checksum address or None"""
+    if raw[0] > 0x7F:
+        tx = Transaction.from_bytes(raw)
+        fields = {name: getattr(tx, name) for name in ("nonce", "gasPrice", "gas", "to", "value", "data")}
+    else:
+        tx = TypedTransaction.from_bytes(HexBytes(raw)).as_dict()
+        fields = {
+            "nonce": tx["nonce"],
+            "gasPrice": tx.get("gasPrice", tx.get("maxFeePerGas")),
+            "gas": tx["gas"],
+            "to": tx["to"],
+            "value": tx["value"],
+            "data": tx["data"],
+        }
+    # typed transactions have HexBytes fields, their hex() is already 0x-prefixed
+    fields["to"] = to_checksum_address(fields["to"]) if fields["to"] else None
+    fields["data"] = bytes(fields["data"])
+    return fields
+
+
+class NeonProxySimulator(JsonRpcSimulator):
+    def __init__(self, receipt_latency: float = 0.0, chain_id: int = CHAIN_ID):
+        self.receipt_latency = receipt_latency
+        self.chain_id = chain_id
+        self.balances: tp.Dict[str, int] = {}
+        self.nonces: tp.Dict[str, int] = {}
+        self.code: tp.Dict[str, str] = {}
+        self.transactions: tp.Dict[str, SimulatedTransaction] = {}
+        self.block_number = 0
+        self._lock = threading.Lock()
+        self._methods: tp.Dict[str, tp.Callable] = {
+            "eth_chainId": lambda: hex(self.chain_id),
+            "net_version": lambda: str(self.chain_id),
+            "net_listening": lambda: True,
+            "net_peerCount": lambda: "0x0",
+            "web3_clientVersion": lambda: f"Neon/v{VERSION}",
+            "eth_gasPrice": lambda: hex(GAS_PRICE),
+            "eth_maxPriorityFeePerGas": lambda: "0x0",
+            "eth_blockNumber": lambda: hex(self.block_number),
+            "eth_syncing": lambda: False,
+            "eth_getBlockByNumber": self.get_block_by_number,
+            "eth_getBalance": lambda address, block="latest": hex(self.balances.get(address.lower(), 0)),
+            "eth_getTransactionCount": lambda address, block="latest": hex(self.nonces.get(address.lower(), 0)),
+            "eth_getCode": lambda address, block="latest": self.code.get(address.lower(), "0x"),
+            "eth_getStorageAt": lambda address, position, block="latest": "0x" + "00" * 32,
+            "eth_getLogs": lambda params: [],
+            "eth_estimateGas": self.estimate_gas,
+            "eth_call": lambda tx, block="latest": "0x" + "00" * 32,
+            "eth_sendRawTransaction": self.send_raw_transaction,
+            "eth_getTransactionByHash": self.get_transaction_by_hash,
+            "eth_getTransactionReceipt": self.get_transaction_receipt,
+            "neon_getTransactionReceipt": self.get_transaction_receipt,
+            "neon_getSolanaTransactionByNeonTransaction": self.get_solana_transactions,
+            "neon_emulate": self.emulate,
+            "neon_gasPrice": self.neon_gas_price,
+            "neon_proxy_version": lambda: f"Neon-proxy/v{VERSION}",
+            "neon_cli_version": lambda: f"Neon-cli/v{VERSION}",
+            "neon_evm_version": lambda: f"Neon-EVM/v{VERSION}",
+            "neon_solana_version": lambda: f"Solana/v{VERSION}",
+            "neon_versions": lambda: {
+                "proxy": f"Neon-proxy/v{VERSION}",
+                "evm": f"Neon-EVM/v{VERSION}",
+                "core_api": f"Neon-Core-API/v{VERSION}",
+                "solana": f"Solana/v{VERSION}",
+            },
+            "neon_finalizedBlockNumber": lambda: hex(self.block_number),
+        }
+
+    def request_neon(self, wallet: str, amount: int) -> None:
+        with self._lock:
+            address = wallet.lower()
+            self.balances[address] = self.balances.get(address, 0) + amount * 10**18
+
+    def get_block_by_number(self, block: tp.Union[str, int], full_transactions: bool = False) -> tp.Dict:
+        if block == "earliest":
+            number = 0
+        elif block in ("latest", "pending", "finalized", "safe"):
+            number = self.block_number
+        else:
+            number = int(block, 16) if isinstance(block, str) else block
+        return {
+            "number": hex(number),
+            "hash": block_hash(number),
+            "parentHash": block_hash(max(number - 1, 0)),
+            "timestamp": hex(1_700_000_000 + number),
+            "gasLimit": hex(48_000_000_000_000),
+            "gasUsed": "0x0",
+            "baseFeePerGas": "0x0",
+            "miner": "0x" + "00" * 20,
+            "transactions": [],
+        }
+
+    def estimate_gas(self, tx: tp.Dict, block: str = "latest") -> str:
+        data = bytes.fromhex(tx.get("data", tx.get("input", "0x"))[2:])
+        return hex(TRANSFER_GAS + 16 * len(data))
+
+    def send_raw_transaction(self, raw_tx: str) -> str:
+        raw = bytes.fromhex(raw_tx[2:])
+        fields = decode_raw_transaction(raw)
+        sender = Account.recover_transaction(raw).lower()
+        tx_hash = "0x" + keccak(raw).hex()
+        to = fields["to"]
+        with self._lock:
+            if tx_hash in self.transactions:
+                raise RPCError("already known")
+            nonce = self.nonces.get(sender, 0)
+            if fields["nonce"] < nonce:
+                raise RPCError(f"nonce too low: address {sender}, tx: {fields['nonce']} state: {nonce}")
+            if fields["nonce"] > nonce:
+                raise RPCError(f"nonce too high: address {sender}, tx: {fields['nonce']} state: {nonce}")
+            cost = fields["value"] + min(fields["gas"], TRANSFER_GAS) * fields["gasPrice"]
+            if self.balances.get(sender, 0) < cost:
+                raise RPCError(f"insufficient funds for transfer: address {sender}")
+
+            # the state changes only after the transaction is accepted
+            tx = SimulatedTransaction(
+                hash=tx_hash,
+                sender=to_checksum_address(sender),
+                to=to,
+                nonce=fields["nonce"],
+                value=fields["value"],
+                gas=fields["gas"],
+                gas_price=fields["gasPrice"],
+                data="0x" + fields["data"].hex(),
+                block_number=self.block_number + 1,
+                ready_at=time.monotonic() + self.receipt_latency,
+            )
+            if to is None:
+                address = "0x" + keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:].hex()
+                tx.contract_address = to_checksum_address(address)
+                # the init code stands in for the runtime code, it only has to be non-empty
+                self.code[address] = tx.data if len(tx.data) > 2 else "0x00"
+            self.block_number = tx.block_number
+            self.nonces[sender] = nonce + 1
+            self.balances[sender] -= cost
+            if to is not None:
+                self.balances[to.lower()] = self.balances.get(to.lower(), 0) + fields["value"]
+            self.transactions[tx_hash] = tx
+        return tx_hash
+
+    def _ready_transaction(self, tx_hash: str) -> tp.Optional[SimulatedTransaction]:
+        tx = self.transactions.get(tx_hash.lower())
+        if tx is None or tx.ready_at > time.monotonic():
+            return None
+        return tx
+
+    def get_transaction_by_hash(self, tx_hash: str) -> tp.Optional[tp.Dict]:
+        tx = self.transactions.get(tx_hash.lower())
+        return tx.as_transaction() if tx else None
+
+    def get_transaction_receipt(self, tx_hash: str, *args) -> tp.Optional[tp.Dict]:
+        tx = self._ready_transaction(tx_hash)
+        return tx.as_receipt() if tx else None
+
+    def get_solana_transactions(self, tx_hash: str, *args) -> tp.List[str]:
+        tx = self._ready_transaction(tx_hash)
+        return solana_signatures(tx.hash) if tx else []
+
+    def emulate(self, params: tp.Any, *args) -> tp.Dict:
+        return {
+            "exitCode": "succeed",
+            "externalSolanaCall": False,
+            "revertBeforeSolanaCall": False,
+            "revertAfterSolanaCall": False,
+            "result": "",
+            "numEvmSteps": 10,
+            "gasUsed": TRANSFER_GAS,
+            "numIterations": 1,
+            "solanaAccounts": [],
+        }
+
+    def neon_gas_price(self, *args) -> tp.Dict:
+        return {
+            "chainId": hex(self.chain_id),
+            "gasPrice": hex(GAS_PRICE),
+            "suggestedGasPrice": hex(GAS_PRICE),
+            "isConstGasPrice": True,
+            "minAcceptableGasPrice": hex(GAS_PRICE),
+            "minExecutableGasPrice": hex(GAS_PRICE),
+            "minWoChainIdAcceptableGasPrice": hex(GAS_PRICE),
+            "allowUnderpricedTxWoChainId": True,
+            "lastUpdate": hex(1_700_000_000),
+            "solPriceUsd": hex(int(100 * 100000)),
+            "tokenPriceUsd": hex(int(TOKEN_PRICE_USD * 100000)),
+            "operatorFee": hex(0),
+            "gasPriceSlippage": hex(0),
+        }
+
+
+class ProxyHandler(JsonRpcHandler):
+    simulator: NeonProxySimulator
+
+    def post(self, request: tp.Any) -> tp.Tuple[int, tp.Any]:
+        if self.path.rstrip("/").endswith("request_neon"):
+            self.simulator.request_neon(request["wallet"], int(request["amount"]))
+            return 200, {"result": "ok"}
+        return super().post(request)
+
+
+@contextlib.contextmanager
+def running_simulator(
+    port: int = 0, receipt_latency: float = 0.0, rpc_latency: float = 0.0, chain_id: int = CHAIN_ID
+) -> tp.Iterator[tp.Tuple[str, NeonProxySimulator]]:
+    """Serve the simulator in a background thread, yields the base url and the simulator for the state checks"""
+    simulator = NeonProxySimulator(receipt_latency, chain_id)
+    with running_server(ProxyHandler.bind(simulator, rpc_latency), port) as url:
+        yield url, simulator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9090)
+    parser.add_argument("--chain-id", type=int, default=CHAIN_ID)
+    parser.add_argument("--receipt-latency", type=float, default=0.0, help="Seconds before a receipt is available")
+    parser.add_argument("--rpc-latency", type=float, default=0.0, help="Seconds added to every HTTP request")
+    args = parser.parse_args()
+    simulator = NeonProxySimulator(args.receipt_latency, args.chain_id)
+    server = make_server(ProxyHandler.bind(simulator, args.rpc_latency), args.port)
+    print(f"Neon proxy simulator: http://127.0.0.1:{args.port}/solana, faucet: http://127.0.0.1:{args.port}/")
+    server.serve_forever()
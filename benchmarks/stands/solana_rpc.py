@@ -0,0 +1,338 @@
+"""In-memory stand-in for the Solana JSON-RPC subset used by SolanaClient and EvmLoader.
+
+Transactions are decoded only to get the signature and the invoked programs, they don't execute: account data is
+seeded by the caller (Neon balance, contract and storage accounts are built with utils/layouts, tags are left zero)
+and the log messages are scripted, by default every Neon instruction ends with exit_status. Failures can be injected
+by rate: sendTransaction errors and landed transactions with an instruction error.
+
+Run: python -m benchmarks.stands.solana_rpc --port 8899 --confirmation-latency 0.4 --rpc-latency 0.005
+"""
+import argparse
+import base64
+import collections
+import contextlib
+import dataclasses
+import hashlib
+import logging
+import random
+import threading
+import time
+import typing as tp
+
+import base58
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from benchmarks.stands.jsonrpc import JsonRpcHandler, JsonRpcSimulator, RPCError, make_server, running_server
+from integration.tests.neon_evm.utils.constants import EVM_LOADER
+from utils.layouts import BALANCE_ACCOUNT_LAYOUT, CONTRACT_ACCOUNT_LAYOUT, STORAGE_CELL_LAYOUT
+
+LOG = logging.getLogger(__name__)
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+LAMPORTS_PER_SIGNATURE = 5000
+COMPUTE_UNITS = 1_400_000
+NEON_EXIT_LOGS = ["Program log: exit_status=0x12", "Program data: UkVUVVJO Eg=="]
+
+
+def preflight_failure(message: str, err: tp.Union[str, tp.Dict]) -> RPCError:
+    """sendTransaction simulation error, solders requires its data to parse the response"""
+    data = {"err": err, "logs": [], "accounts": None, "unitsConsumed": 0, "returnData": None}
+    return RPCError(f"Transaction simulation failed: {message}", code=-32002, data=data)
+
+
+@dataclasses.dataclass
+class SimulatedAccount:
+    lamports: int
+    owner: str = SYSTEM_PROGRAM
+    data: bytes = b""
+    executable: bool = False
+
+    def as_info(self, config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        data = self.data
+        data_slice = (config or {}).get("dataSlice")
+        if data_slice:
+            data = data[data_slice["offset"] : data_slice["offset"] + data_slice["length"]]
+        return {
+            "lamports": self.lamports,
+            "owner": self.owner,
+            "data": [base64.b64encode(data).decode(), "base64"],
+            "executable": self.executable,
+            "rentEpoch": 0,
+            "space": len(self.data),
+        }
+
+
+@dataclasses.dataclass
+class SimulatedTransaction:
+    slot: int
+    ready_at: float
+    message: tp.Dict
+    signatures: tp.List[str]
+    log_messages: tp.List[str]
+    err: tp.Optional[tp.Dict] = None
+
+    def as_status(self) -> tp.Dict:
+        return {
+            "slot": self.slot,
+            "confirmations": None,
+            "err": self.err,
+            "status": {"Ok": None} if self.err is None else {"Err": self.err},
+            "confirmationStatus": "finalized",
+        }
+
+    def as_transaction(self) -> tp.Dict:
+        accounts_count = len(self.message["accountKeys"])
+        fee = LAMPORTS_PER_SIGNATURE * len(self.signatures)
+        return {
+            "slot": self.slot,
+            "blockTime": 1_700_000_000 + self.slot,
+            "version": "legacy",
+            "transaction": {"signatures": self.signatures, "message": self.message},
+            "meta": {
+                "err": self.err,
+                "status": {"Ok": None} if self.err is None else {"Err": self.err},
+                "fee": fee,
+                "preBalances": [0] * accounts_count,
+                "postBalances": [0] * accounts_count,
+                "innerInstructions": [],
+                "logMessages": self.log_messages,
+                "preTokenBalances": [],
+                "postTokenBalances": [],
+                "rewards": [],
+                "loadedAddresses": {"writable": [], "readonly": []},
+                "computeUnitsConsumed": COMPUTE_UNITS // 10,
+            },
+        }
+
+
+def program_logs(program_id: str, logs: tp.List[str], err: tp.Optional[tp.Dict] = None) -> tp.List[str]:
+    """Log messages of one top level instruction"""
+    result = [f"Program {program_id} invoke [1]", *logs]
+    result.append(f"Program {program_id} consumed {COMPUTE_UNITS // 10} of {COMPUTE_UNITS} compute units")
+    result.append(f"Program {program_id} success" if err is None else f"Program {program_id} failed: {err}")
+    return result
+
+
+def decode_transaction(raw: bytes) -> tp.Tuple[tp.List[str], tp.Dict, tp.List[str]]:
+    """Signatures, the message in the json encoding and the invoked programs of a wire transaction"""
+    tx = VersionedTransaction.from_bytes(raw)
+    message = tx.message
+    keys = [str(key) for key in message.account_keys]
+    header = message.header
+    instructions = [
+        {
+            "programIdIndex": instruction.program_id_index,
+            "accounts": list(instruction.accounts),
+            "data": base58.b58encode(bytes(instruction.data)).decode(),
+            "stackHeight": None,
+        }
+        for instruction in message.instructions
+    ]
+    encoded = {
+        "accountKeys": keys,
+        "header": {
+            "numRequiredSignatures": header.num_required_signatures,
+            "numReadonlySignedAccounts": header.num_readonly_signed_accounts,
+            "numReadonlyUnsignedAccounts": header.num_readonly_unsigned_accounts,
+        },
+        "recentBlockhash": str(message.recent_blockhash),
+        "instructions": instructions,
+    }
+    programs = [keys[instruction.program_id_index] for instruction in message.instructions]
+    return [str(signature) for signature in tx.signatures], encoded, programs
+
+
+class SolanaRpcSimulator(JsonRpcSimulator):
+    def __init__(
+        self,
+        evm_loader: str = EVM_LOADER,
+        confirmation_latency: float = 0.0,
+        send_failure_rate: float = 0.0,
+        tx_error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.evm_loader = evm_loader
+        self.confirmation_latency = confirmation_latency
+        self.send_failure_rate = send_failure_rate
+        self.tx_error_rate = tx_error_rate
+        self.accounts: tp.Dict[str, SimulatedAccount] = {}
+        self.transactions: tp.Dict[str, SimulatedTransaction] = {}
+        self.slot = 1
+        self.scripted_logs: tp.Deque[tp.List[str]] = collections.deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._methods: tp.Dict[str, tp.Callable] = {
+            "getHealth": lambda: "ok",
+            "getVersion": lambda: {"solana-core": "1.18.0", "feature-set": 0},
+            "getSlot": lambda config=None: self.slot,
+            "getBlockHeight": lambda config=None: self.slot,
+            "getLatestBlockhash": self.get_latest_blockhash,
+            "getMinimumBalanceForRentExemption": lambda size, config=None: (size + 128) * 6960,
+            "getBalance": self.get_balance,
+            "getAccountInfo": self.get_account_info,
+            "getMultipleAccounts": self.get_multiple_accounts,
+            "sendTransaction": self.send_transaction,
+            "getSignatureStatuses": self.get_signature_statuses,
+            "getTransaction": self.get_transaction,
+            "requestAirdrop": self.request_airdrop,
+        }
+
+    def _context(self, value: tp.Any) -> tp.Dict:
+        return {"context": {"slot": self.slot, "apiVersion": "1.18.0"}, "value": value}
+
+    def set_account(
+        self, pubkey: tp.Union[str, Pubkey], data: bytes = b"", owner: tp.Optional[str] = None, lamports: int = 0
+    ) -> None:
+        owner = owner or (self.evm_loader if data else SYSTEM_PROGRAM)
+        lamports = lamports or (len(data) + 128) * 6960
+        with self._lock:
+            self.accounts[str(pubkey)] = SimulatedAccount(lamports, owner, data)
+
+    def set_balance_account(
+        self, pubkey: tp.Union[str, Pubkey], address: bytes, chain_id: int, balance: int = 0, trx_count: int = 0
+    ) -> None:
+        data = BALANCE_ACCOUNT_LAYOUT.build(
+            dict(
+                type=0,
+                header_version=0,
+                address=address,
+                chain_id=chain_id,
+                trx_count=trx_count,
+                balance=balance.to_bytes(32, "little"),
+            )
+        )
+        self.set_account(pubkey, data)
+
+    def set_contract_account(
+        self, pubkey: tp.Union[str, Pubkey], address: bytes, chain_id: int, revision: int = 0, code: bytes = b""
+    ) -> None:
+        data = CONTRACT_ACCOUNT_LAYOUT.build(
+            dict(
+                type=0,
+                header_version=0,
+                address=address,
+                chain_id=chain_id,
+                generation=0,
+                revision=revision,
+            )
+        )
+        self.set_account(pubkey, data + code)
+
+    def set_storage_cell(self, pubkey: tp.Union[str, Pubkey], revision: int = 0) -> None:
+        data = STORAGE_CELL_LAYOUT.build(dict(type=0, header_version=0, revision=revision))
+        self.set_account(pubkey, data)
+
+    def script_logs(self, *logs: tp.List[str]) -> None:
+        """Neon instruction logs of the next transactions, one list per transaction"""
+        with self._lock:
+            self.scripted_logs.extend(logs)
+
+    def get_latest_blockhash(self, config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        blockhash = base58.b58encode(hashlib.sha256(self.slot.to_bytes(8, "little")).digest()).decode()
+        return self._context({"blockhash": blockhash, "lastValidBlockHeight": self.slot + 150})
+
+    def get_balance(self, pubkey: str, config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        account = self.accounts.get(pubkey)
+        return self._context(account.lamports if account else 0)
+
+    def get_account_info(self, pubkey: str, config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        account = self.accounts.get(pubkey)
+        return self._context(account.as_info(config) if account else None)
+
+    def get_multiple_accounts(self, pubkeys: tp.List[str], config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        accounts = [self.accounts.get(pubkey) for pubkey in pubkeys]
+        return self._context([account.as_info(config) if account else None for account in accounts])
+
+    def _land(self, signatures: tp.List[str], message: tp.Dict, programs: tp.List[str]) -> str:
+        with self._lock:
+            err = None
+            if self.tx_error_rate and self._random.random() < self.tx_error_rate:
+                err = {"InstructionError": [0, {"Custom": 1}]}
+            log_messages = []
+            for index, program in enumerate(programs):
+                if program == self.evm_loader:
+                    logs = self.scripted_logs.popleft() if self.scripted_logs else NEON_EXIT_LOGS
+                else:
+                    logs = []
+                failed = err is not None and index == err["InstructionError"][0]
+                log_messages.extend(program_logs(program, logs, "custom program error: 0x1" if failed else None))
+                if failed:
+                    break
+            self.slot += 1
+            self.transactions[signatures[0]] = SimulatedTransaction(
+                slot=self.slot,
+                ready_at=time.monotonic() + self.confirmation_latency,
+                message=message,
+                signatures=signatures,
+                log_messages=log_messages,
+                err=err,
+            )
+        return signatures[0]
+
+    def send_transaction(self, tx: str, config: tp.Optional[tp.Dict] = None) -> str:
+        if self.send_failure_rate and self._random.random() < self.send_failure_rate:
+            raise preflight_failure("Blockhash not found", "BlockhashNotFound")
+        encoding = (config or {}).get("encoding", "base58")
+        if encoding != "base64":
+            raise RPCError(f"unsupported encoding: {encoding}", code=-32602)
+        signatures, message, programs = decode_transaction(base64.b64decode(tx))
+        if signatures[0] in self.transactions:
+            raise preflight_failure("This transaction has already been processed", "AlreadyProcessed")
+        return self._land(signatures, message, programs)
+
+    def request_airdrop(self, pubkey: str, lamports: int, config: tp.Optional[tp.Dict] = None) -> str:
+        with self._lock:
+            account = self.accounts.setdefault(pubkey, SimulatedAccount(0))
+            account.lamports += lamports
+            seed = f"{pubkey}:{self.slot}:{account.lamports}".encode()
+            signature = base58.b58encode(hashlib.sha512(seed).digest()).decode()
+        message = {
+            "accountKeys": [pubkey, SYSTEM_PROGRAM],
+            "header": {"numRequiredSignatures": 1, "numReadonlySignedAccounts": 0, "numReadonlyUnsignedAccounts": 1},
+            "recentBlockhash": self.get_latest_blockhash()["value"]["blockhash"],
+            "instructions": [],
+        }
+        return self._land([signature], message, [])
+
+    def _ready_transaction(self, signature: str) -> tp.Optional[SimulatedTransaction]:
+        tx = self.transactions.get(signature)
+        if tx is None or tx.ready_at > time.monotonic():
+            return None
+        return tx
+
+    def get_signature_statuses(self, signatures: tp.List[str], config: tp.Optional[tp.Dict] = None) -> tp.Dict:
+        transactions = [self._ready_transaction(signature) for signature in signatures]
+        return self._context([tx.as_status() if tx else None for tx in transactions])
+
+    def get_transaction(self, signature: str, config: tp.Optional[tp.Dict] = None) -> tp.Optional[tp.Dict]:
+        tx = self._ready_transaction(signature)
+        return tx.as_transaction() if tx else None
+
+
+@contextlib.contextmanager
+def running_simulator(
+    port: int = 0, rpc_latency: float = 0.0, **kwargs
+) -> tp.Iterator[tp.Tuple[str, SolanaRpcSimulator]]:
+    """Serve the simulator in a background thread, yields the url and the simulator to seed accounts and logs"""
+    simulator = SolanaRpcSimulator(**kwargs)
+    with running_server(JsonRpcHandler.bind(simulator, rpc_latency), port) as url:
+        yield url, simulator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--evm-loader", default=EVM_LOADER)
+    parser.add_argument("--confirmation-latency", type=float, default=0.0, help="Seconds before a status is available")
+    parser.add_argument("--rpc-latency", type=float, default=0.0, help="Seconds added to every HTTP request")
+    parser.add_argument("--send-failure-rate", type=float, default=0.0, help="Share of rejected sendTransaction")
+    parser.add_argument("--tx-error-rate", type=float, default=0.0, help="Share of transactions with an error")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    simulator = SolanaRpcSimulator(
+        args.evm_loader, args.confirmation_latency, args.send_failure_rate, args.tx_error_rate, args.seed
+    )
+    server = make_server(JsonRpcHandler.bind(simulator, args.rpc_latency), args.port)
+    print(f"Solana RPC simulator: http://127.0.0.1:{args.port}/")
+    server.serve_forever()
@@ -0,0 +1,52 @@
+"""Open-model load offers the target rate however many locust workers share the users"""
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).absolute().parent.parent
+
+RATE = 100
+USERS = 100
+WORKERS = 4
+
+
+@pytest.fixture(scope="module")
+def offered() -> dict:
+    # importing locust monkey patches the process with gevent, this must not leak into pytest
+    for module in ("locust", "geventhttpclient", "tabulate"):
+        if importlib.util.find_spec(module) is None:
+            pytest.skip(f"{module} is not installed")
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.arrival_scaling",
+            *("--rate", str(RATE), "--users", str(USERS), "--workers", str(WORKERS)),
+        ],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_local_run(offered):
+    assert offered["local"] == pytest.approx(RATE)
+
+
+def test_distributed_run(offered):
+    assert offered["distributed"] == pytest.approx(RATE)
+
+
+def test_ramp_up(offered):
+    # one user of a hundred started on every worker
+    assert offered["ramp_up"] == pytest.approx(RATE * WORKERS / USERS)
+
+
+def test_explicit_users(offered):
+    assert offered["explicit"] == pytest.approx(RATE / 2)
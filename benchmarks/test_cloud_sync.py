@@ -0,0 +1,83 @@
+"""Allure history sync with S3 transfers only changed files, local ETags match the ones of S3 multipart uploads"""
+import os
+
+import pytest
+
+pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+import boto3  # noqa: E402
+
+from utils import cloud  # noqa: E402
+
+# moto 5 mocks all services with one decorator
+mock_aws = getattr(moto, "mock_aws", None) or moto.mock_s3
+BUCKET = "neon-test-allure"
+SIZES = {
+    "single.json": 1024,
+    "exact.bin": cloud.MULTIPART_CHUNKSIZE,
+    "multipart.bin": cloud.MULTIPART_CHUNKSIZE + 1,
+}
+
+
+@pytest.fixture()
+def s3(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="eu-central-1")
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
+        monkeypatch.setattr(cloud, "client", client)
+        yield client
+
+
+@pytest.fixture()
+def report(tmp_path):
+    source = tmp_path / "report"
+    (source / "history").mkdir(parents=True)
+    for name, size in SIZES.items():
+        (source / "history" / name).write_bytes(os.urandom(size))
+    return source
+
+
+def test_etags_match_s3(s3, report):
+    cloud.upload(report, "run/1", BUCKET)
+    objects = {obj["Key"]: obj for obj in cloud.iter_objects("run/1/", BUCKET)}
+
+    assert objects["run/1/history/single.json"]["ETag"].count("-") == 0
+    assert objects["run/1/history/exact.bin"]["ETag"].strip('"').endswith("-1")
+    assert objects["run/1/history/multipart.bin"]["ETag"].strip('"').endswith("-2")
+    for name in SIZES:
+        assert cloud.is_unchanged(report / "history" / name, objects[f"run/1/history/{name}"])
+
+
+def test_unchanged_files_are_skipped(s3, report, tmp_path):
+    assert cloud.upload(report, "run/1", BUCKET) == (3, 0)
+    assert cloud.upload(report, "run/1", BUCKET) == (0, 3)
+
+    # same size, other content
+    (report / "history" / "exact.bin").write_bytes(os.urandom(cloud.MULTIPART_CHUNKSIZE))
+    assert cloud.upload(report, "run/1", BUCKET) == (1, 2)
+
+    downloaded = tmp_path / "downloaded"
+    assert cloud.download("run/1", downloaded, BUCKET) == (3, 0)
+    for name in SIZES:
+        assert (downloaded / "history" / name).read_bytes() == (report / "history" / name).read_bytes()
+    assert cloud.download("run/1", downloaded, BUCKET) == (0, 3)
+
+    (downloaded / "history" / "single.json").write_bytes(b"{}")
+    assert cloud.download("run/1", downloaded, BUCKET) == (1, 2)
+
+
+def test_single_file_is_compared_by_key(s3, report, monkeypatch):
+    cloud.upload(report, "run/1", BUCKET)
+    single = report / "history" / "single.json"
+    assert cloud.upload(single, "run/1", BUCKET) == (1, 0)
+    assert cloud.upload(single, "run/1", BUCKET) == (0, 1)
+
+    # other objects under the destination are not listed
+    monkeypatch.setattr(cloud, "iter_objects", None)
+    single.write_bytes(b"{}")
+    assert cloud.upload(single, "run/1", BUCKET) == (1, 0)
+    assert cloud.head_object("run/1/single.json", BUCKET)["Size"] == 2
+    assert cloud.head_object("run/1/missing.json", BUCKET) is None
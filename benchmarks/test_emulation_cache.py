@@ -0,0 +1,129 @@
+"""Repeated emulations are served from the cache until a touched account changes its revision"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("solana")
+
+from solana.keypair import Keypair  # noqa: E402
+
+from benchmarks.stands.jsonrpc import JSONHandler, running_server  # noqa: E402
+from benchmarks.stands.solana_rpc import running_simulator  # noqa: E402
+from integration.tests.neon_evm.utils.constants import CHAIN_ID, EVM_LOADER  # noqa: E402
+from integration.tests.neon_evm.utils.neon_api_client import CachedNeonApiClient  # noqa: E402
+from utils.evm_loader import EvmLoader  # noqa: E402
+
+SENDER = "0x" + "11" * 20
+CONTRACT = "0x" + "22" * 20
+BALANCE_ACCOUNT = str(Keypair.from_seed(bytes([1] * 32)).public_key)
+CONTRACT_ACCOUNT = str(Keypair.from_seed(bytes([2] * 32)).public_key)
+STORAGE_CELL = str(Keypair.from_seed(bytes([3] * 32)).public_key)
+
+
+class EmulatorStub(JSONHandler):
+    calls = 0
+    # called while the request is emulated, e.g. to land a transaction
+    during_emulation = None
+
+    def post(self, request):
+        EmulatorStub.calls += 1
+        if EmulatorStub.during_emulation is not None:
+            EmulatorStub.during_emulation()
+        if request["tx"]["data"] == "ff":
+            return 400, {"error": "revert"}
+        accounts = [BALANCE_ACCOUNT, CONTRACT_ACCOUNT, STORAGE_CELL]
+        value = {
+            "exit_status": "succeed",
+            "result": request["tx"]["data"],
+            "steps_executed": 100,
+            "solana_accounts": [{"pubkey": pubkey, "is_writable": True} for pubkey in accounts],
+        }
+        return 200, {"value": value}
+
+
+@pytest.fixture(scope="module")
+def api_url():
+    with running_server(EmulatorStub) as url:
+        yield url.rstrip("/")
+
+
+@pytest.fixture()
+def simulator():
+    with running_simulator() as (url, state):
+        address = bytes.fromhex(SENDER[2:])
+        state.set_balance_account(BALANCE_ACCOUNT, address, CHAIN_ID, balance=10**18, trx_count=1)
+        state.set_contract_account(CONTRACT_ACCOUNT, bytes.fromhex(CONTRACT[2:]), CHAIN_ID, revision=1)
+        state.set_storage_cell(STORAGE_CELL, revision=1)
+        yield url, state
+
+
+@pytest.fixture()
+def client(api_url, simulator) -> CachedNeonApiClient:
+    return CachedNeonApiClient(api_url, EvmLoader(EVM_LOADER, simulator[0]))
+
+
+def test_revision_changes_invalidate(client, simulator):
+    EmulatorStub.calls = 0
+    first = client.emulate(SENDER, CONTRACT, b"\x01")
+    # the accounts aren't known before the first emulation, the second one verifies them
+    assert client.emulate(SENDER, CONTRACT, b"\x01") == first
+    assert client.emulate(SENDER, CONTRACT, b"\x01") == first
+    assert client.emulate(SENDER.upper().replace("0X", "0x"), CONTRACT, "01") == first
+    assert (EmulatorStub.calls, client.hits) == (2, 2)
+
+    client.emulate(SENDER, CONTRACT, b"\x02")
+    assert EmulatorStub.calls == 3
+
+    simulator[1].set_storage_cell(STORAGE_CELL, revision=2)
+    assert client.emulate(SENDER, CONTRACT, b"\x01") == first
+    assert client.emulate(SENDER, CONTRACT, b"\x01") == first
+    assert EmulatorStub.calls == 4
+
+    simulator[1].set_balance_account(BALANCE_ACCOUNT, bytes.fromhex(SENDER[2:]), CHAIN_ID, 10**18, trx_count=2)
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    assert EmulatorStub.calls == 5
+
+
+def test_lamports_and_owner_changes_invalidate(client, simulator):
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    EmulatorStub.calls = 0
+
+    simulator[1].request_airdrop(CONTRACT_ACCOUNT, 1)
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    assert EmulatorStub.calls == 1
+
+    simulator[1].accounts[STORAGE_CELL].owner = str(Keypair.from_seed(bytes([4] * 32)).public_key)
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    assert EmulatorStub.calls == 2
+
+
+def test_changes_during_emulation_are_not_cached(client, simulator):
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    revisions = iter(range(2, 100))
+    EmulatorStub.calls = 0
+    EmulatorStub.during_emulation = lambda: simulator[1].set_storage_cell(STORAGE_CELL, revision=next(revisions))
+    try:
+        client.emulate(SENDER, CONTRACT, b"\x01")
+        client.emulate(SENDER, CONTRACT, b"\x01")
+    finally:
+        EmulatorStub.during_emulation = None
+    assert (EmulatorStub.calls, client.hits) == (2, 0)
+
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    assert (EmulatorStub.calls, client.hits) == (3, 1)
+
+
+def test_errors_are_not_cached(client):
+    EmulatorStub.calls = 0
+    assert client.emulate(SENDER, CONTRACT, b"\xff") == {"error": "revert"}
+    assert client.emulate(SENDER, CONTRACT, b"\xff") == {"error": "revert"}
+    assert EmulatorStub.calls == 2
+
+
+def test_cache_hit(benchmark, client):
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    client.emulate(SENDER, CONTRACT, b"\x01")
+    result = benchmark(client.emulate, SENDER, CONTRACT, b"\x01")
+    assert result["result"] == "01"
+    assert client.misses == 2
@@ -0,0 +1,85 @@
+"""EvmLoader round trips against the local Solana RPC simulator, no validator is needed"""
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("solana")
+
+from eth_account import Account  # noqa: E402
+from solana.keypair import Keypair  # noqa: E402
+from solana.publickey import PublicKey  # noqa: E402
+from solana.rpc.core import RPCException  # noqa: E402
+
+from benchmarks.stands.solana_rpc import running_simulator  # noqa: E402
+from integration.tests.neon_evm.utils.constants import CHAIN_ID, EVM_LOADER  # noqa: E402
+from utils.evm_loader import EvmLoader  # noqa: E402
+from utils.types import TreasuryPool  # noqa: E402
+
+RPC_LATENCY = float(os.environ.get("SIMULATOR_RPC_LATENCY", "0.002"))
+
+SENDER = Account.from_key("0x" + "22" * 32)
+OPERATOR = Keypair.from_seed(bytes(range(32)))
+HOLDER = Keypair.from_seed(bytes([7] * 32)).public_key
+TREASURY = TreasuryPool(0, Keypair.from_seed(bytes([8] * 32)).public_key, (0).to_bytes(4, "little"))
+# 6 holder writes of 920 bytes
+SIGNED_TX = SENDER.sign_transaction(
+    {"nonce": 0, "gasPrice": 10**9, "gas": 10**7, "to": None, "value": 0, "data": b"\x60" * 5000, "chainId": CHAIN_ID}
+)
+NOT_FINISHED_LOGS = ["Program log: Instruction: Begin or Continue Transaction from Instruction"]
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    with running_simulator(rpc_latency=RPC_LATENCY) as (url, state):
+        yield url, state
+
+
+@pytest.fixture(scope="module")
+def evm_loader(simulator) -> EvmLoader:
+    return EvmLoader(EVM_LOADER, simulator[0])
+
+
+def test_get_neon_balance(benchmark, simulator, evm_loader):
+    address = bytes.fromhex(SENDER.address[2:])
+    simulator[1].set_balance_account(
+        evm_loader.ether2balance(address, CHAIN_ID), address, CHAIN_ID, balance=10**21, trx_count=3
+    )
+    assert benchmark(evm_loader.get_neon_balance, address, CHAIN_ID) == 10**21
+    assert evm_loader.get_neon_nonce(address, CHAIN_ID) == 3
+
+
+def test_get_contract_account_revision(benchmark, simulator, evm_loader):
+    address = bytes.fromhex(SENDER.address[2:])
+    contract = PublicKey(evm_loader.ether2program(address)[0])
+    simulator[1].set_contract_account(contract, address, CHAIN_ID, revision=5)
+    assert benchmark(evm_loader.get_contract_account_revision, contract) == 5
+
+
+def test_write_transaction_to_holder(benchmark, evm_loader):
+    benchmark(evm_loader.write_transaction_to_holder_account, SIGNED_TX, HOLDER, OPERATOR)
+
+
+def test_execute_transaction_steps(benchmark, simulator, evm_loader):
+    def script_three_steps():
+        simulator[1].script_logs(NOT_FINISHED_LOGS, NOT_FINISHED_LOGS)
+
+    receipt = benchmark.pedantic(
+        evm_loader.execute_transaction_steps_from_instruction,
+        args=(OPERATOR, TREASURY, HOLDER, SIGNED_TX, []),
+        setup=script_three_steps,
+        rounds=10,
+    )
+    assert any("exit_status" in log for log in receipt.value.transaction.meta.log_messages)
+    assert not simulator[1].scripted_logs
+
+
+def test_injected_failures():
+    with running_simulator(tx_error_rate=1.0) as (url, _):
+        with pytest.raises(AssertionError, match="Transaction failed"):
+            EvmLoader(EVM_LOADER, url).execute_transaction_steps_from_instruction(
+                OPERATOR, TREASURY, HOLDER, SIGNED_TX, []
+            )
+    with running_simulator(send_failure_rate=1.0) as (url, _):
+        with pytest.raises(RPCException, match="Blockhash not found"):
+            EvmLoader(EVM_LOADER, url).write_transaction_to_holder_account(SIGNED_TX, HOLDER, OPERATOR)
@@ -0,0 +1,100 @@
+"""--profile-fixtures splits fixture time into categories, ranks fixtures and merges xdist workers"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("solcx")
+
+pytest_plugins = ["pytester"]
+
+ROOT_DIR = Path(__file__).absolute().parent.parent
+
+CONFTEST = """
+import time
+
+import pytest
+import requests
+import solcx
+
+
+class SlowAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        time.sleep(0.05)
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    def close(self):
+        pass
+
+
+# replaced before the profiler wraps it, so no solc binary is needed
+solcx.compile_source = lambda source: time.sleep(0.05) or {}
+
+
+@pytest.fixture(scope="session")
+def contract_source():
+    return solcx.compile_source("contract A {}")
+
+
+@pytest.fixture(scope="session")
+def deployed(contract_source):
+    session = requests.Session()
+    session.mount("http://", SlowAdapter())
+    return session.post("http://stand/").status_code
+
+
+@pytest.fixture()
+def waiting():
+    time.sleep(0.1)
+    return 1
+"""
+
+TESTS = """
+def test_first(deployed, waiting):
+    pass
+
+
+def test_second(deployed, waiting):
+    pass
+"""
+
+
+def profile(pytester, monkeypatch, *args):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TESTS)
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(ROOT_DIR), os.environ.get("PYTHONPATH")])))
+    result = pytester.runpytest_subprocess("-p", "utils.fixture_profiler", "--profile-fixtures", *args)
+    result.assert_outcomes(passed=2)
+    report = json.loads((pytester.path / "fixtures-profile.json").read_text())
+    return result, {item["name"]: item for item in report}, [item["name"] for item in report]
+
+
+def test_categories_and_ranking(pytester, monkeypatch):
+    result, report, ranked = profile(pytester, monkeypatch)
+
+    assert ranked[:3] == ["waiting", "deployed", "contract_source"]
+    result.stdout.fnmatch_lines(["*fixtures profile*", "waiting *function*2*widen scope to session", "deployed *"])
+
+    # time of a nested fixture is not counted in its parent
+    assert report["contract_source"]["categories"]["compile"] >= 0.05
+    assert "rpc" not in report["contract_source"]["categories"]
+    assert report["deployed"]["categories"]["rpc"] >= 0.05
+    assert report["deployed"]["setup_time"] < 0.1
+    # a sleep inside a request is counted as rpc only
+    assert "wait" not in report["deployed"]["categories"]
+    assert report["waiting"]["categories"]["wait"] >= 0.2
+    assert report["waiting"]["setups"] == 2
+
+
+def test_xdist_workers_are_merged(pytester, monkeypatch):
+    pytest.importorskip("xdist")
+    _, report, _ = profile(pytester, monkeypatch, "-n", "2")
+
+    # the controller runs no tests, so the whole profile comes from workers
+    assert report["waiting"]["setups"] == 2
+    assert report["waiting"]["categories"]["wait"] >= 0.2
+    assert 1 <= report["deployed"]["setups"] <= 2
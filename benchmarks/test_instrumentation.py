@@ -0,0 +1,38 @@
+"""Per-call overhead of locust statistics instrumentation"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).absolute().parent.parent
+
+MAX_OVERHEAD_US = float(os.environ.get("INSTRUMENTATION_MAX_OVERHEAD_US", "5"))
+CALLS = 200_000
+
+
+@pytest.fixture(scope="module")
+def measurement() -> dict:
+    # importing locust monkey patches the process with gevent, this must not leak into pytest
+    if importlib.util.find_spec("locust") is None:
+        pytest.skip("locust is not installed")
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.instrumentation_overhead", "--calls", str(CALLS)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_call_overhead(measurement):
+    overhead = measurement["overhead_us"]
+    assert overhead < MAX_OVERHEAD_US, f"Instrumentation overhead: {overhead:.2f}us per call"
+
+
+def test_nested_calls_are_reported_once(measurement):
+    assert measurement["nested"] == ["Send Neon"]
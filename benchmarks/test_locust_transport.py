@@ -0,0 +1,31 @@
+"""Locust workers must not be limited by the web3 HTTP transport"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).absolute().parent.parent
+
+MIN_SPEEDUP = float(os.environ.get("GEVENT_TRANSPORT_MIN_SPEEDUP", "1.5"))
+
+
+def test_gevent_transport_throughput():
+    # importing locust monkey patches the process with gevent, this must not leak into pytest
+    for module in ("gevent", "geventhttpclient", "locust", "web3"):
+        if importlib.util.find_spec(module) is None:
+            pytest.skip(f"{module} is not installed")
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.rpc_transport", "--greenlets", "50", "--requests", "3000"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rps = json.loads(result.stdout.splitlines()[-1])
+    assert (
+        rps["gevent"] >= rps["requests"] * MIN_SPEEDUP
+    ), f"RPS: requests - {rps['requests']:.0f}, gevent - {rps['gevent']:.0f}"
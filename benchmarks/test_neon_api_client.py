@@ -0,0 +1,72 @@
+"""Emulations of the neon_evm tests go through pooled connections and can run concurrently"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("solana")
+
+from benchmarks.stands.jsonrpc import JSONHandler, running_server  # noqa: E402
+from integration.tests.neon_evm.utils.neon_api_client import NeonApiClient  # noqa: E402
+from integration.tests.neon_evm.utils.neon_api_rpc_client import NeonApiRpcClient  # noqa: E402
+
+EMULATION_TIME = 0.02
+CALLS = [{"sender": "0x" + "11" * 20, "contract": "0x" + f"{i:040x}", "data": bytes([i])} for i in range(16)]
+
+
+class EmulatorStub(JSONHandler):
+    connections = set()
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def post(self, request):
+        with EmulatorStub.lock:
+            EmulatorStub.connections.add(self.client_address)
+            EmulatorStub.in_flight += 1
+            EmulatorStub.max_in_flight = max(EmulatorStub.max_in_flight, EmulatorStub.in_flight)
+        time.sleep(EMULATION_TIME)
+        with EmulatorStub.lock:
+            EmulatorStub.in_flight -= 1
+        params = request["params"][0] if "jsonrpc" in request else request
+        value = {"exit_status": "succeed", "result": params["tx"]["data"], "steps_executed": 1, "solana_accounts": []}
+        if "jsonrpc" in request:
+            return 200, {"jsonrpc": "2.0", "id": request["id"], "result": value}
+        return 200, {"value": value}
+
+
+@pytest.fixture(scope="module")
+def api_url():
+    with running_server(EmulatorStub) as url:
+        yield url.rstrip("/")
+
+
+@pytest.fixture(params=[NeonApiClient, NeonApiRpcClient], ids=["rest", "rpc"])
+def client(request, api_url):
+    return request.param(api_url)
+
+
+def test_connections_are_reused(client):
+    EmulatorStub.connections.clear()
+    for call in CALLS[:5]:
+        client.emulate(**call)
+    assert len(EmulatorStub.connections) == 1
+
+
+def run_measuring_concurrency(func, *args):
+    EmulatorStub.max_in_flight = 0
+    result = func(*args)
+    return result, EmulatorStub.max_in_flight
+
+
+def test_emulate_many(client):
+    sequential, sequential_in_flight = run_measuring_concurrency(lambda: [client.emulate(**call) for call in CALLS])
+    concurrent, concurrent_in_flight = run_measuring_concurrency(client.emulate_many, CALLS)
+    async_results, async_in_flight = run_measuring_concurrency(asyncio.run, client.emulate_many_async(CALLS))
+
+    assert concurrent == sequential == async_results
+    assert [result["result"] for result in concurrent] == [call["data"].hex() for call in CALLS]
+    assert sequential_in_flight == 1
+    assert concurrent_in_flight > 1
+    assert async_in_flight > 1
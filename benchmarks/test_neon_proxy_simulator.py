@@ -0,0 +1,97 @@
+"""Client throughput against the offline Neon proxy simulator, no stand is needed"""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("web3")
+pytest.importorskip("base58")
+
+from benchmarks.stands.neon_proxy import CHAIN_ID, running_simulator  # noqa: E402
+from utils.apiclient import JsonRPCSession  # noqa: E402
+from utils.faucet import Faucet  # noqa: E402
+from utils.web3client import NeonChainWeb3Client  # noqa: E402
+
+RPC_LATENCY = float(os.environ.get("SIMULATOR_RPC_LATENCY", "0.005"))
+MIN_BATCH_SPEEDUP = float(os.environ.get("SIMULATOR_MIN_BATCH_SPEEDUP", "5"))
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    with running_simulator(rpc_latency=RPC_LATENCY) as (url, state):
+        yield url, state
+
+
+@pytest.fixture(scope="module")
+def web3_client(simulator) -> NeonChainWeb3Client:
+    return NeonChainWeb3Client(f"{simulator[0]}solana")
+
+
+@pytest.fixture(scope="module")
+def sender(simulator, web3_client):
+    account = web3_client.create_account()
+    Faucet(simulator[0], web3_client).request_neon(account.address, amount=1000)
+    return account
+
+
+def test_send_neon(benchmark, web3_client, sender):
+    recipient = web3_client.create_account()
+    receipt = benchmark(web3_client.send_neon, sender, recipient, 0.01)
+    assert receipt["status"] == 1
+    assert web3_client.chain_id == CHAIN_ID
+    assert web3_client.get_balance(recipient.address) > 0
+
+
+def test_batch_rpc_pipelining(simulator, sender):
+    session = JsonRPCSession(f"{simulator[0]}solana")
+    calls = [("eth_getTransactionCount", [sender.address, "latest"])] * 50
+
+    started = time.perf_counter()
+    sequential = [session.send_rpc(method, params)["result"] for method, params in calls]
+    sequential_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = [response["result"] for response in session.send_batch_rpc(calls)]
+    batch_time = time.perf_counter() - started
+
+    assert batched == sequential
+    assert (
+        sequential_time >= batch_time * MIN_BATCH_SPEEDUP
+    ), f"50 calls: sequential - {sequential_time * 1000:.1f} ms, batch - {batch_time * 1000:.1f} ms"
+
+
+def test_dynamic_fee_transfer(simulator, web3_client, sender):
+    recipient = web3_client.create_account()
+    session = JsonRPCSession(f"{simulator[0]}solana")
+    nonce = int(session.send_rpc("eth_getTransactionCount", [sender.address, "latest"])["result"], 16)
+    transaction = {
+        "type": 2,
+        "chainId": CHAIN_ID,
+        "nonce": nonce,
+        "to": recipient.address,
+        "value": 10**15,
+        "gas": 21_000,
+        "maxFeePerGas": 2 * 10**9,
+        "maxPriorityFeePerGas": 10**9,
+        "data": b"\x01",
+    }
+    signed = sender.sign_transaction(transaction)
+    tx_hash = session.send_rpc("eth_sendRawTransaction", ["0x" + bytes(signed.rawTransaction).hex()])["result"]
+
+    tx = session.send_rpc("eth_getTransactionByHash", [tx_hash])["result"]
+    assert tx["to"] == recipient.address
+    assert tx["input"] == "0x01"
+    assert web3_client.get_balance(recipient.address) > 0
+
+
+def test_rejected_transaction_keeps_state(simulator, web3_client, sender):
+    session = JsonRPCSession(f"{simulator[0]}solana")
+    block = session.send_rpc("eth_blockNumber")["result"]
+    nonce = int(session.send_rpc("eth_getTransactionCount", [sender.address, "latest"])["result"], 16)
+    transaction = {"chainId": CHAIN_ID, "nonce": nonce + 1, "to": sender.address, "gas": 21_000, "gasPrice": 1}
+    signed = sender.sign_transaction(transaction)
+
+    response = session.send_rpc("eth_sendRawTransaction", ["0x" + bytes(signed.rawTransaction).hex()])
+    assert "nonce too high" in response["error"]["message"]
+    assert session.send_rpc("eth_blockNumber")["result"] == block
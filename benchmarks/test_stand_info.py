@@ -0,0 +1,117 @@
+"""Stand metadata is fetched once, then served from xdist worker input and the pytest cache"""
+import dataclasses
+import json
+import sys
+import types
+
+import pytest
+
+from benchmarks.stands.jsonrpc import JsonRpcHandler, JsonRpcSimulator, running_server
+from utils import stand_info
+
+NETWORK = "night-stand"
+
+
+class StandSimulator(JsonRpcSimulator):
+    def __init__(self):
+        self.calls = 0
+        self._methods = {
+            "neon_proxy_version": self.count(lambda: "Neon-proxy/v1.0.0"),
+            "web3_clientVersion": self.count(lambda: "Neon/v1.0.0"),
+            "neon_cli_version": self.count(lambda: "Neon-cli/v1.0.0"),
+            "eth_chainId": self.count(lambda: "0x6f"),
+        }
+
+    def count(self, method):
+        def counted(*args):
+            self.calls += 1
+            return method(*args)
+
+        return counted
+
+
+class FakeCache:
+    """pytest cache keeps JSON values"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default):
+        return json.loads(self.values[key]) if key in self.values else default
+
+    def set(self, key, value):
+        self.values[key] = json.dumps(value)
+
+
+@pytest.fixture()
+def stand():
+    simulator = StandSimulator()
+    with running_server(JsonRpcHandler.bind(simulator)) as url:
+        yield url, simulator
+
+
+def make_config(proxy_url, cache=None, ttl=stand_info.DEFAULT_TTL, **attrs):
+    options = {"--stand-info-ttl": ttl, "--network": NETWORK, "--test-group": None}
+    return types.SimpleNamespace(
+        environment=types.SimpleNamespace(proxy_url=proxy_url), getoption=options.get, cache=cache, **attrs
+    )
+
+
+def test_fetch(stand):
+    url, simulator = stand
+    info = stand_info.StandInfo.fetch(url)
+    assert (info.proxy_version, info.evm_version, info.cli_version) == (
+        "Neon-proxy/v1.0.0",
+        "Neon/v1.0.0",
+        "Neon-cli/v1.0.0",
+    )
+    assert info.chain_id == 111
+    # an unsupported method leaves the default
+    assert info.evm_params == {}
+    assert simulator.calls == 4
+
+
+def test_cache_is_reused_until_expired(stand):
+    url, simulator = stand
+    cache = FakeCache()
+    info = stand_info.get_stand_info(make_config(url, cache))
+    assert stand_info.get_stand_info(make_config(url, cache)) == info
+    assert simulator.calls == 4
+
+    # another stand under the same network name
+    stand_info.get_stand_info(make_config(url.rstrip("/"), cache))
+    assert simulator.calls == 8
+
+    key = f"{stand_info.CACHE_KEY}/{NETWORK}"
+    cache.set(key, {**cache.get(key, None), "fetched_at": 0.0})
+    stand_info.get_stand_info(make_config(url.rstrip("/"), cache))
+    assert simulator.calls == 12
+
+
+def test_no_cache_with_zero_ttl(stand):
+    url, simulator = stand
+    cache = FakeCache()
+    stand_info.get_stand_info(make_config(url, cache, ttl=0))
+    stand_info.get_stand_info(make_config(url, cache, ttl=0))
+    assert (simulator.calls, cache.values) == (8, {})
+
+
+def test_worker_input_round_trip(stand):
+    url, simulator = stand
+    info = stand_info.get_stand_info(make_config(url))
+    # execnet passes worker input as plain data
+    worker_input = {"stand_info": json.loads(json.dumps(dataclasses.asdict(info)))}
+    assert stand_info.get_stand_info(make_config(url, workerinput=worker_input)) == info
+    assert simulator.calls == 4
+
+
+def test_unreachable_stand_does_not_fail_workers():
+    root_conftest = sys.modules.get("conftest")
+    if root_conftest is None or not hasattr(root_conftest, "pytest_configure_node"):
+        pytest.skip("root conftest is not loaded")
+    config = make_config("http://127.0.0.1:1/")
+    nodes = [types.SimpleNamespace(config=config, workerinput={}) for _ in range(2)]
+    for node in nodes:
+        root_conftest.pytest_configure_node(node)
+    assert [node.workerinput for node in nodes] == [{}, {}]
+    assert config.stand_info_failed
@@ -0,0 +1,70 @@
+"""Guard cold-start latency of ./clickfile.py and of every pytest worker.
+
+Heavy SDKs must be imported only by commands/fixtures which use them, budgets can be tuned with env variables.
+"""
+import os
+import subprocess
+import sys
+import time
+import typing as tp
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).absolute().parent.parent
+
+CLICKFILE_HELP_BUDGET = float(os.environ.get("CLICKFILE_HELP_BUDGET", "1.0"))
+WORKER_STARTUP_BUDGET = float(os.environ.get("WORKER_STARTUP_BUDGET", "5.0"))
+
+# These SDKs are used by a few commands only
+CLICKFILE_FORBIDDEN_MODULES = (
+    "boto3",
+    "paramiko",
+    "scp",
+    "python_terraform",
+    "pythclient",
+    "web3",
+    "solana",
+    "solcx",
+    "tabulate",
+    "pytest",
+    "pydantic",
+    "slack_sdk",
+)
+# click is not listed: workers need solana clients, and httpx under them imports it
+WORKER_FORBIDDEN_MODULES = ("boto3", "paramiko", "scp", "python_terraform", "pythclient", "tabulate")
+
+
+def import_profile(*args: str) -> tp.Tuple[float, tp.Set[str]]:
+    """Run python with -X importtime, return wall time and names of imported top level packages"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - started
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return elapsed, modules
+
+
+def best_of(runs: int, *args: str) -> tp.Tuple[float, tp.Set[str]]:
+    results = [import_profile(*args) for _ in range(runs)]
+    return min(elapsed for elapsed, _ in results), results[0][1]
+
+
+def test_clickfile_help_startup():
+    elapsed, modules = best_of(3, "clickfile.py", "--help")
+    heavy = sorted(modules.intersection(CLICKFILE_FORBIDDEN_MODULES))
+    assert not heavy, f"`clickfile.py --help` imports heavy modules: {heavy}"
+    assert elapsed < CLICKFILE_HELP_BUDGET, f"`clickfile.py --help` took {elapsed:.2f}s"
+
+
+@pytest.mark.parametrize("module", ["conftest", "integration.tests.conftest"])
+def test_worker_startup(module):
+    elapsed, modules = best_of(3, "-c", f"import {module}")
+    heavy = sorted(modules.intersection(WORKER_FORBIDDEN_MODULES))
+    assert not heavy, f"{module} imports modules which are used only by clickfile commands: {heavy}"
+    assert elapsed < WORKER_STARTUP_BUDGET, f"import {module} took {elapsed:.2f}s"
@@ -0,0 +1,178 @@
+"""Micro-benchmarks of the pure-Python helpers every test and load user calls many times.
+
+Run and compare with the stored baseline: ./clickfile.py benchmarks compare
+"""
+import base64
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("solana")
+
+from eth_account import Account  # noqa: E402
+from solana.keypair import Keypair  # noqa: E402
+from solana.publickey import PublicKey  # noqa: E402
+
+from integration.tests.neon_evm.utils import eth_tx_utils  # noqa: E402
+from integration.tests.neon_evm.utils.constants import CHAIN_ID, EVM_LOADER  # noqa: E402
+from integration.tests.neon_evm.utils.transaction_checks import decode_logs  # noqa: E402
+from utils import helpers, instructions, layouts  # noqa: E402
+from utils.evm_loader import EvmLoader  # noqa: E402
+from utils.types import TreasuryPool  # noqa: E402
+
+SENDER = Account.from_key("0x" + "11" * 32)
+ETHER = bytes.fromhex(SENDER.address[2:])
+OPERATOR = Keypair.from_seed(bytes(range(32)))
+PUBKEYS = [Keypair.from_seed(bytes([i] * 32)).public_key for i in range(1, 11)]
+LOADER_ID = PublicKey(EVM_LOADER)
+TX_HASH = bytes(range(32))
+
+RAW_TX = SENDER.sign_transaction(
+    {
+        "nonce": 7,
+        "gasPrice": 10**9,
+        "gas": 100_000,
+        "to": SENDER.address,
+        "value": 10**18,
+        "data": b"\x12" * 200,
+        "chainId": CHAIN_ID,
+    }
+).rawTransaction
+
+ABI = [
+    {
+        "type": "function",
+        "name": "transfer",
+        "inputs": [
+            {"name": "to", "type": "address", "internalType": "address"},
+            {"name": "amount", "type": "uint256", "internalType": "uint256"},
+        ],
+    },
+    {
+        "type": "function",
+        "name": "submit",
+        "inputs": [
+            {
+                "name": "orders",
+                "type": "tuple[]",
+                "internalType": "struct Exchange.Order[]",
+                "components": [
+                    {"name": "maker", "type": "address"},
+                    {"name": "amount", "type": "uint256"},
+                ],
+            }
+        ],
+    },
+    {"type": "event", "name": "Transfer", "inputs": []},
+] + [
+    {"type": "function", "name": f"f{i}", "inputs": [{"name": "x", "type": "bytes32", "internalType": "bytes32"}]}
+    for i in range(20)
+]
+
+LOG_MESSAGES = [
+    f"Program {EVM_LOADER} invoke [1]",
+    "Program log: Instruction: Execute Transaction from Instruction",
+    "Program data: " + " ".join(base64.b64encode(bytes([i]) * 40).decode() for i in range(3)),
+    f"Program {EVM_LOADER} consumed 120000 of 1400000 compute units",
+    f"Program {EVM_LOADER} success",
+] * 4
+
+
+@pytest.fixture(scope="module")
+def evm_loader() -> EvmLoader:
+    # no requests are made, only the derivations are called
+    return EvmLoader(EVM_LOADER, "http://127.0.0.1:8899")
+
+
+def test_decode_function_signature(benchmark):
+    benchmark(helpers.decode_function_signature, "transfer(address,uint256)", [SENDER.address, 10**18])
+
+
+def test_get_selectors(benchmark):
+    assert len(benchmark(helpers.get_selectors, ABI)) == 22
+
+
+def test_serialize_instruction(benchmark):
+    instruction = instructions.make_WriteHolder(OPERATOR.public_key, LOADER_ID, PUBKEYS[0], TX_HASH, 0, RAW_TX)
+    benchmark(helpers.serialize_instruction, LOADER_ID, instruction)
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [layouts.BALANCE_ACCOUNT_LAYOUT, layouts.CONTRACT_ACCOUNT_LAYOUT, layouts.HOLDER_ACCOUNT_INFO_LAYOUT],
+    ids=["balance", "contract", "holder"],
+)
+def test_layout_parse(benchmark, layout):
+    data = bytes(layout.sizeof())
+    benchmark(layout.parse, data)
+
+
+def test_rlp_unpack(benchmark):
+    benchmark(eth_tx_utils.unpack, memoryview(RAW_TX))
+
+
+def test_rlp_pack(benchmark):
+    (fields, _) = eth_tx_utils.unpack(memoryview(RAW_TX))
+    assert benchmark(eth_tx_utils.pack, fields) == bytes(RAW_TX)
+
+
+def test_ether2balance(benchmark, evm_loader):
+    benchmark(evm_loader.ether2balance, ETHER, CHAIN_ID)
+
+
+def test_ether2program(benchmark, evm_loader):
+    benchmark(evm_loader.ether2program, ETHER)
+
+
+def test_make_write_holder(benchmark):
+    benchmark(instructions.make_WriteHolder, OPERATOR.public_key, LOADER_ID, PUBKEYS[0], TX_HASH, 0, RAW_TX)
+
+
+def test_make_execute_trx_from_instruction(benchmark):
+    benchmark(
+        instructions.make_ExecuteTrxFromInstruction,
+        OPERATOR,
+        PUBKEYS[0],
+        LOADER_ID,
+        PUBKEYS[1],
+        (0).to_bytes(4, "little"),
+        bytes(RAW_TX),
+        PUBKEYS[2:],
+    )
+
+
+def test_make_execute_trx_from_account(benchmark):
+    benchmark(
+        instructions.make_ExecuteTrxFromAccount,
+        OPERATOR,
+        PUBKEYS[0],
+        LOADER_ID,
+        PUBKEYS[1],
+        PUBKEYS[2],
+        (0).to_bytes(4, "little"),
+        PUBKEYS[3:],
+    )
+
+
+def test_make_execute_trx_iterative(benchmark):
+    benchmark(
+        instructions.make_ExecuteTrxFromAccountDataIterativeOrContinue,
+        0,
+        500,
+        OPERATOR,
+        PUBKEYS[0],
+        LOADER_ID,
+        PUBKEYS[1],
+        TreasuryPool(0, PUBKEYS[2], (0).to_bytes(4, "little")),
+        PUBKEYS[3:],
+    )
+
+
+def test_make_create_balance_account(benchmark):
+    benchmark(
+        instructions.make_CreateBalanceAccount, LOADER_ID, OPERATOR.public_key, ETHER, PUBKEYS[0], PUBKEYS[1], CHAIN_ID
+    )
+
+
+def test_decode_logs(benchmark):
+    benchmark(decode_logs, LOG_MESSAGES)
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
-import enum
+import concurrent.futures
+import csv
 import functools
 import glob
 import json
+import math
+import queue
 import time
 from collections import defaultdict
 from multiprocessing.dummy import Pool
 
 import os
+import platform
 import re
 import shutil
 import subprocess
@@ -16,35 +20,30 @@ import typing as tp
 from pathlib import Path
 from urllib.parse import urlparse
 
-import pytest
-
-from utils.error_log import error_log
-from utils.slack_notification import SlackNotification
-from utils.types import TestGroup
+from utils.lazy import lazy_import
+from utils.types import TestGroup, TEST_GROUPS, EnvName
 
 try:
     import click
-    import requests
-    import tabulate
     import yaml
+
+    # heavy modules are executed on the first use, so `./clickfile.py --help` and conftest.py stay fast
+    pytest = lazy_import("pytest")
+    requests = lazy_import("requests")
+    tabulate = lazy_import("tabulate")
 except ImportError:
     print("Please install dependencies: pip3 install -r deploy/requirements/click.txt")
     sys.exit(1)
 
 try:
-    from deploy.cli.github_api_client import GithubClient
     from deploy.cli.network_manager import NetworkManager
-    from deploy.cli import dapps as dapps_cli
-
     from utils import create_allure_environment_opts, time_measure
-    from deploy.cli import infrastructure
-    from utils import web3client
-    from utils import cloud
-    from utils.operator import Operator
-    from utils.web3client import NeonChainWeb3Client
-    from utils.prices import get_sol_price
-    from utils.helpers import wait_condition
-    from utils.apiclient import JsonRPCSession
+
+    dapps_cli = lazy_import("deploy.cli.dapps")
+    infrastructure = lazy_import("deploy.cli.infrastructure")
+    web3client = lazy_import("utils.web3client")
+    cloud = lazy_import("utils.cloud")
+    error_log_module = lazy_import("utils.error_log")
 except ImportError:
     print("Please run ./clickfile.py requirements to install all requirements")
 
@@ -67,8 +66,11 @@ EXTENSIONS_PATH = "ui/extensions/chrome/plugins"
 EXTENSIONS_USER_DATA_PATH = "ui/extensions/chrome"
 
 HOME_DIR = Path(__file__).absolute().parent
+BENCHMARKS_STORAGE = "benchmarks/baselines"
 
 OZ_BALANCES = "./compatibility/results/oz_balance.json"
+OZ_SUMMARY = "./compatibility/results/summary.json"
+OZ_RESULT_RE = re.compile(r"(\d+) (passing|pending|failing)")
 NEON_EVM_GITHUB_URL = "https://api.github.com/repos/neonlabsorg/neon-evm"
 HOODIES_CHAINLINK_GITHUB_URL = "https://github.com/hoodieshq/chainlink-neon"
 PROXY_GITHUB_URL = "https://api.github.com/repos/neonlabsorg/neon-proxy.py"
@@ -76,24 +78,9 @@ FAUCET_GITHUB_URL = "https://api.github.com/repos/neonlabsorg/neon-faucet"
 EXTERNAL_CONTRACT_PATH = Path.cwd() / "contracts" / "external"
 VERSION_BRANCH_TEMPLATE = r"[vt]{1}\d{1,2}\.\d{1,2}\.x.*"
 
-TEST_GROUPS: tp.Tuple[TestGroup, ...] = tp.get_args(TestGroup)
-
 network_manager = NetworkManager()
 
 
-class EnvName(str, enum.Enum):
-    NIGHT_STAND = "night-stand"
-    RELEASE_STAND = "release-stand"
-    MAINNET = "mainnet"
-    DEVNET = "devnet"
-    TESTNET = "testnet"
-    LOCAL = "local"
-    TERRAFORM = "terraform"
-    GETH = "geth"
-    TRACER_CI = "tracer_ci"
-    CUSTOM = "custom"
-
-
 def green(s):
     return click.style(s, fg="green")
 
@@ -110,7 +97,7 @@ def catch_traceback(func: tp.Callable) -> tp.Callable:
     """Catch traceback to file"""
     def add_error_log_comment(func_name, exc: BaseException):
         err_msg = ERR_MESSAGES.get(func_name) or f"{exc.__class__.__name__}({exc})"
-        error_log.add_comment(text=f"{func_name}: {err_msg}")
+        error_log_module.error_log.add_comment(text=f"{func_name}: {err_msg}")
 
     @functools.wraps(func)
     def wrap(*args, **kwargs) -> tp.Any:
@@ -129,7 +116,7 @@ def catch_traceback(func: tp.Callable) -> tp.Callable:
 
         finally:
             if error:
-                if not error_log.has_logs():
+                if not error_log_module.error_log.has_logs():
                     add_error_log_comment(func.__name__, error)
                 raise error
 
@@ -141,6 +128,9 @@ def check_profitability(func: tp.Callable) -> tp.Callable:
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> None:
+        from utils.operator import Operator
+        from utils.prices import get_sol_price
+
         network = network_manager.get_network_object(args[0])
         w3client = web3client.NeonChainWeb3Client(network["proxy_url"])
 
@@ -197,74 +187,85 @@ def run_openzeppelin_tests(network, jobs=8, amount=20000, users=8):
     log_dir = cwd.parent / "results"
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    tests = list(Path(f"{cwd}/test").rglob("*.test.js"))
+    # Longest files go first, files without history are considered as long as the longest known one
+    durations = load_oz_durations(log_dir, cwd)
+    unknown_duration = max(durations.values(), default=0.0)
     priority_names = [
         "test/token/ERC721/ERC721.test.js",
         "test/token/ERC721/ERC721Enumerable.test.js",
         "test/token/ERC721/extensions/ERC721Wrapper.test.js",
     ]
-    priority_tests = []
-    other_tests = []
-    for test in tests:
-        test = str(test)
-        if any(test.endswith(priority_name) for priority_name in priority_names):
-            priority_tests.append(test)
-        else:
-            other_tests.append(test)
 
-    prioritised_tests = priority_tests + other_tests
+    def expected_duration(file_name: str) -> float:
+        name = os.path.relpath(file_name, cwd)
+        if name in durations:
+            return durations[name]
+        return math.inf if name in priority_names else unknown_duration
 
-    keys_env = [infrastructure.prepare_accounts(network, users, amount) for i in range(jobs)]
+    tests = [str(test) for test in Path(f"{cwd}/test").rglob("*.test.js")]
+    prioritised_tests = sorted(tests, key=expected_duration, reverse=True)
+
+    with Pool(jobs) as pool:
+        keys_sets = pool.map(lambda _: infrastructure.prepare_accounts(network, users, amount), range(jobs))
+    keys_env = queue.Queue()
+    for keys in keys_sets:
+        keys_env.put(keys)
 
     def run_oz_file(file_name):
         print(f"Run {file_name}")
-        keys = keys_env.pop(0)
+        keys = keys_env.get()
         env = os.environ.copy()
         env["PRIVATE_KEYS"] = ",".join(keys)
         env["NETWORK_ID"] = str(network_manager.get_network_param(network, "network_ids.neon"))
         env["PROXY_URL"] = network_manager.get_network_param(network, "proxy_url")
 
+        log_dirs = log_dir / file_name.replace(".", "_").replace("/", "_")
+        log_dirs.mkdir(parents=True, exist_ok=True)
+        result = dict(file=os.path.relpath(file_name, cwd), log_dir=log_dirs.name, passing=0, pending=0, failing=0)
+        stdout = []
+
         start_time = time.time()
-        out = subprocess.run(
-            f"npx hardhat test {file_name}",
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            env=env,
-        )
+        with open(log_dirs / "stdout.log", "w") as stdout_log, open(log_dirs / "stderr.log", "w") as stderr_log:
+            process = subprocess.Popen(
+                f"npx hardhat test {file_name}",
+                shell=True,
+                cwd=cwd,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=stderr_log,
+                text=True,
+            )
+            # counts are collected while the output is streamed to the log
+            for line in process.stdout:
+                stdout_log.write(line)
+                stdout.append(line)
+                for count, state in OZ_RESULT_RE.findall(line):
+                    result[state] += int(count)
+            result["returncode"] = process.wait()
         end_time = time.time()
-        stdout = out.stdout.decode()
-        stderr = out.stderr.decode()
+        keys_env.put(keys)
+
+        result["duration"] = round(end_time - start_time, 2)
         time_info = time_measure(start_time=start_time, end_time=end_time, job_name=file_name)
-        print(f"Test {file_name} finished with code {out.returncode}")
-        print(stdout)
-        print(stderr)
+        print(f"Test {file_name} finished with code {result['returncode']}")
+        print("".join(stdout))
+        print((log_dirs / "stderr.log").read_text())
         print(time_info)
-
-        keys_env.append(keys)
-        log_dirs = cwd.parent / "results" / file_name.replace(".", "_").replace("/", "_")
-        log_dirs.mkdir(parents=True, exist_ok=True)
-        with open(log_dirs / "stdout.log", "w") as f:
-            f.write(stdout)
-        with open(log_dirs / "stderr.log", "w") as f:
-            f.write(stderr)
         with open(log_dirs / "time.log", "w") as f:
             f.write(time_info)
+        result["time_info"] = time_info
+        return result
 
     print("Run tests in parallel")
-    pool = Pool(jobs)
-    pool.map(run_oz_file, prioritised_tests, chunksize=1)
-    pool.close()
-    pool.join()
+    # chunksize=1 hands the next longest file to whichever job frees up first
+    with Pool(jobs) as pool:
+        results = pool.map(run_oz_file, prioritised_tests, chunksize=1)
 
     with open(log_dir / "time.log", "w") as merged_log:
-        for sub_dir in log_dir.iterdir():
-            if sub_dir.is_dir():
-                time_log_path = sub_dir / "time.log"
-                if time_log_path.exists():
-                    with open(time_log_path, "r") as time_log:
-                        contents = time_log.read()
-                        merged_log.write(contents + "\n")
+        merged_log.write("\n".join(result.pop("time_info") for result in results) + "\n")
+    with open(OZ_SUMMARY, "w") as f:
+        total = {state: sum(result[state] for result in results) for state in ("passing", "pending", "failing")}
+        json.dump({"total": total, "files": results}, f, indent=4)
 
     # Add allure environment
     settings = network_manager.get_network_object(network)
@@ -281,12 +282,31 @@ def run_openzeppelin_tests(network, jobs=8, amount=20000, users=8):
     shutil.copyfile(log_dir / "time.log", openzeppelin_reports / "time_consolidated.log")
     print("Fix allure results: {}".format(len(res_file_list)))
 
-    for res_file in res_file_list:
-        with open(res_file, "r+") as f:
-            report = json.load(f)
-        report["labels"].append({"name": "epic", "value": "OpenZeppelin contracts"})
-        with open(res_file, "w+") as f:
-            json.dump(report, f)
+    # json parsing is CPU bound, so results are processed by several processes
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        list(executor.map(add_allure_epic, res_file_list, chunksize=64))
+
+
+def add_allure_epic(res_file: str, epic: str = "OpenZeppelin contracts"):
+    with open(res_file, "r+") as f:
+        report = json.load(f)
+        label = {"name": "epic", "value": epic}
+        if label in report["labels"]:
+            return
+        report["labels"].append(label)
+        f.seek(0)
+        json.dump(report, f)
+        f.truncate()
+
+
+def load_oz_durations(log_dir: Path, cwd: Path) -> tp.Dict[str, float]:
+    """Read durations of OZ test files (relative to cwd) from time.log files of the previous runs"""
+    durations = {}
+    for time_log_path in log_dir.glob("*/time.log"):
+        match = re.match(r"Job (.+), Time: ([\d.]+)s", time_log_path.read_text())
+        if match:
+            durations[os.path.relpath(match.group(1), cwd)] = float(match.group(2))
+    return durations
 
 
 def parse_openzeppelin_results():
@@ -294,13 +314,22 @@ def parse_openzeppelin_results():
 
     skipped_files = []
 
+    if os.path.exists(OZ_SUMMARY):
+        with open(OZ_SUMMARY, "r") as f:
+            summary = json.load(f)
+        print("Results of {} files found in {}\n".format(len(summary["files"]), OZ_SUMMARY))
+        for result in summary["files"]:
+            if not any(result[state] for state in test_report):
+                skipped_files.append(f"./compatibility/results/{result['log_dir']}/stdout.log")
+        return summary["total"], skipped_files
+
     stdout_files = glob.glob("./compatibility/results/**/stdout.log", recursive=True)
     print("`stdout` files found: {}. Processing ...\n".format(len(stdout_files)))
 
     for stdout in stdout_files:
         with open(stdout, "r+", encoding="utf8") as f:
             rep = f.read()
-            result = re.findall(r"(\d+) (passing|pending|failing)", rep)
+            result = OZ_RESULT_RE.findall(rep)
             if not result:
                 skipped_files.append(stdout)
             for count in result:
@@ -355,6 +384,9 @@ def print_oz_balances():
 
 
 def wait_for_tracer_service(network: str):
+    from utils.apiclient import JsonRPCSession
+    from utils.helpers import wait_condition
+
     settings = network_manager.get_network_object(network)
     web3_client = web3client.NeonChainWeb3Client(proxy_url=settings["proxy_url"])
     tracer_api = JsonRPCSession(settings["tracer_url"])
@@ -540,7 +572,7 @@ def update_contracts(branch):
     "--keep-error-log",
     is_flag=True,
     default=False,
-    help=f"Don't clear {error_log.file_path.name} before run"
+    help="Don't clear click_cmd_err.log before run"
 )
 @click.argument(
     "name",
@@ -590,7 +622,7 @@ def run(
             command = f"{command} --numprocesses {numprocesses}"
     elif name == "oz":
         if not keep_error_log:
-            error_log.clear()
+            error_log_module.error_log.clear()
         run_openzeppelin_tests(network, jobs=int(jobs), amount=int(amount), users=int(users))
         return
     elif name == "ui":
@@ -661,7 +693,7 @@ def analyze_openzeppelin_results():
             threshold = 2293
         print(f"Threshold: {threshold}")
         if test_report["passing"] < threshold:
-            error_log.add_failures(test_group="oz", test_names=dummy_failed_test_names)
+            error_log_module.error_log.add_failures(test_group="oz", test_names=dummy_failed_test_names)
             raise click.ClickException(
                 f"OpenZeppelin {version} tests failed. \n" f"Passed: {test_report['passing']}, expected: {threshold}"
             )
@@ -669,7 +701,7 @@ def analyze_openzeppelin_results():
             print("OpenZeppelin tests passed")
     else:
         if test_report["failing"] > 0 or test_report["passing"] == 0:
-            error_log.add_failures(test_group="oz", test_names=dummy_failed_test_names)
+            error_log_module.error_log.add_failures(test_group="oz", test_names=dummy_failed_test_names)
             raise click.ClickException(
                 f"OpenZeppelin {version} tests failed. \n"
                 f"Failed: {test_report['failing']}, passed: {test_report['passing']}"
@@ -744,6 +776,33 @@ def locust(ctx):
     """Commands for load test manipulation."""
 
 
+def print_locust_stats(csv_prefix: str) -> None:
+    stats_file = Path(f"{csv_prefix}_stats.csv")
+    if not stats_file.exists():
+        return
+    with open(stats_file) as f:
+        rows = list(csv.DictReader(f))
+    columns = ["Type", "Name", "Request Count", "Failure Count", "Median Response Time", "99%", "Requests/s"]
+    print(tabulate.tabulate([[row.get(c, "") for c in columns] for row in rows], headers=columns, tablefmt="github"))
+
+
+def run_locust_distributed(master_command: str, worker_command: str, workers: int, timeout: int = 60) -> int:
+    """Start a master and workers on this host, return the first non-zero exit code"""
+    master = subprocess.Popen(f"{master_command} --master --expect-workers={workers}", shell=True)
+    worker_processes = [
+        subprocess.Popen(f"{worker_command} --worker --master-host=127.0.0.1", shell=True) for _ in range(workers)
+    ]
+    codes = [master.wait()]
+    for process in worker_processes:
+        try:
+            codes.append(process.wait(timeout=timeout))
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            codes.append(process.wait())
+    print(f"Locust master exit code: {codes[0]}, workers: {codes[1:]}")
+    return next((code for code in codes if code != 0), 0)
+
+
 @locust.command("run", help="Run `neon` pipeline performance test")
 @locust_credentials
 @locust_host
@@ -766,7 +825,15 @@ def locust(ctx):
     help="NEON RPC entry point.",
     show_default=True,
 )
-def run(credentials, host, users, spawn_rate, run_time, tag, web_ui, locustfile, neon_rpc):
+@click.option(
+    "--workers",
+    default=1,
+    type=int,
+    help="Number of worker processes started with a master, 1 runs a single locust process",
+    show_default=True,
+)
+@click.option("--csv", "csv_prefix", default="locust", help="Prefix of CSV stats files", show_default=True)
+def run(credentials, host, users, spawn_rate, run_time, tag, web_ui, locustfile, neon_rpc, workers, csv_prefix):
     """Run `Neon` pipeline performance test
 
     path it's sub-folder and file name  `loadtesting/locustfile.py`.
@@ -775,24 +842,32 @@ def run(credentials, host, users, spawn_rate, run_time, tag, web_ui, locustfile,
     path = base_path / f"loadtesting/{locustfile}/locustfile.py"
     if not (path.exists() and path.is_file()):
         raise FileNotFoundError(f"path doe's not exists. {path.resolve()}")
-    command = f"locust -f {path.as_posix()} --host={host} --users={users} --spawn-rate={spawn_rate}"
+    # options every locust process needs, the master passes the other ones to workers
+    common = f"locust -f {path.as_posix()}"
     if credentials:
-        command += f" --credentials={credentials}"
+        common += f" --credentials={credentials}"
     elif locustfile == "tracerapi":
-        command += f" --credentials={base_path.absolute()}/loadtesting/tracerapi/envs.json"
-    if run_time:
-        command += f" --run-time={run_time}"
+        common += f" --credentials={base_path.absolute()}/loadtesting/tracerapi/envs.json"
     if neon_rpc and locustfile == "tracerapi":
-        command += f" --neon-rpc={neon_rpc}"
+        common += f" --neon-rpc={neon_rpc}"
     if tag:
-        command += f" --tags {' '.join(tag)}"
+        common += f" --tags {' '.join(tag)}"
+
+    command = f"{common} --host={host} --users={users} --spawn-rate={spawn_rate} --csv={csv_prefix}"
+    if run_time:
+        command += f" --run-time={run_time}"
     if not web_ui:
         command += f" --headless"
 
-    cmd = subprocess.run(command, shell=True)
+    if workers > 1:
+        # the master aggregates stats of all workers into the same CSV files
+        returncode = run_locust_distributed(command, common, workers)
+    else:
+        returncode = subprocess.run(command, shell=True).returncode
+    print_locust_stats(csv_prefix)
 
-    if cmd.returncode != 0:
-        sys.exit(cmd.returncode)
+    if returncode != 0:
+        sys.exit(returncode)
 
 
 @locust.command("prepare", help="Run preparation stage for `tracer api` performance test")
@@ -828,6 +903,127 @@ def prepare(credentials, host, users, spawn_rate, run_time, tag):
         sys.exit(cmd.returncode)
 
 
+@locust.command("corpus", help="Sign transactions for the max-rate replay (loadtesting/proxy/tests/replay.py)")
+@locust_host
+@click.option("-k", "--accounts", default=100, type=int, help="Number of funded sender accounts", show_default=True)
+@click.option("-n", "--count", default=1_000_000, type=int, help="Number of transactions", show_default=True)
+@click.option(
+    "--mix",
+    default="transfer=1",
+    type=str,
+    help='Weights of transaction kinds, e.g. "transfer=8,erc20=1,swap=1"',
+    show_default=True,
+)
+@click.option("-a", "--amount", default=1000, type=int, help="Requested amount from faucet per account")
+@click.option("-o", "--output", default="corpus.bin", type=click.Path(dir_okay=False), show_default=True)
+@click.option("--shards", default=1, type=int, help="Split senders into files <name>.<index>.bin, one per worker")
+@click.option("-j", "--jobs", default=os.cpu_count(), type=int, help="Number of signing processes")
+@click.option(
+    "--uniswap-contracts",
+    default="uniswap_contracts.json",
+    type=click.Path(dir_okay=False),
+    help="Contracts saved by the `uniswap` locust tag, needed for swaps",
+    show_default=True,
+)
+def corpus(host, accounts, count, mix, amount, output, shards, jobs, uniswap_contracts):
+    """Fund accounts and sign transactions with sequential nonces offline into a binary file"""
+    from deploy.cli import faucet as faucet_cli
+    from loadtesting.proxy.common import corpus as corpus_module
+
+    settings = network_manager.get_network_object(host)
+    web3_client = web3client.NeonChainWeb3Client(settings["proxy_url"])
+    uniswap = None
+    if Path(uniswap_contracts).is_file():
+        uniswap = json.loads(Path(uniswap_contracts).read_text())
+
+    keys = faucet_cli.prepare_wallets_with_balance(settings, accounts, amount)
+    senders = [web3_client.eth.account.from_key(key) for key in keys]
+    per_sender = math.ceil(count / accounts)
+    templates = corpus_module.prepare_templates(web3_client, senders, mix, per_sender, uniswap=uniswap, jobs=jobs)
+    gas_price = web3_client.gas_price()
+
+    started = time.time()
+    for shard in range(shards):
+        path = Path(output) if shards == 1 else corpus_module.shard_path(output, shard)
+        indexes = range(shard, accounts, shards)
+        header = corpus_module.CorpusHeader(
+            chain_id=web3_client.chain_id,
+            gas_price=gas_price,
+            mix=mix,
+            senders=[senders[i].address for i in indexes],
+            start_nonces=[web3_client.get_nonce(senders[i]) for i in indexes],
+            per_sender=per_sender,
+        )
+        shard_templates = {kind: [fields[i] for i in indexes] for kind, fields in templates.items()}
+        corpus_module.write_corpus(path, header, [keys[i] for i in indexes], shard_templates, processes=jobs)
+        print(f"{header.count} transactions of {len(header.senders)} senders are written to {path}")
+    print(f"Signed in {time.time() - started:.1f}s, gas price {gas_price} is fixed, replay the corpus soon")
+
+
+@locust.command("check-lost-trx", help="Check that transactions saved by SAVE_TRANSACTIONS are in Neon and Solana")
+@locust_host
+@click.argument("files", nargs=-1)
+@click.option("--report", default="lost_trx.jsonl", help="Report of missing and failed transactions", show_default=True)
+@click.option("-j", "--concurrency", default=8, type=int, help="Number of requests at a time", show_default=True)
+def check_lost_trx(host, files, report, concurrency):
+    """Verify receipts and solana signatures of all capture files"""
+    from deploy.cli import lost_trx
+
+    settings = network_manager.get_network_object(host)
+    counts = lost_trx.check_lost_transactions(
+        settings["proxy_url"],
+        settings["solana_url"],
+        files or ["transactions-*.json", "transactions-*.jsonl"],
+        report,
+        concurrency,
+    )
+    print(
+        tabulate.tabulate(
+            [[chain, c["checked"], c["missing"], c["failed"]] for chain, c in counts.items()],
+            headers=["Chain", "Checked", "Missing", "Failed"],
+            tablefmt="fancy_outline",
+        )
+    )
+    if any(c["missing"] or c["failed"] for c in counts.values()):
+        print(f"Lost transactions are saved to {report}")
+        sys.exit(1)
+
+
+@locust.command("ws-subscribers", help="Load the websocket subscriber with eth_subscribe sockets")
+@locust_host
+@click.option("-s", "--subscribers", default=1000, type=int, help="Number of sockets, kinds in turn", show_default=True)
+@click.option("-n", "--events", default=300, type=int, help="Number of emitted EventCaller events", show_default=True)
+@click.option("-r", "--rate", default=5.0, type=float, help="Events per second", show_default=True)
+@click.option("--drain", default=60.0, type=float, help="Seconds to wait for late notifications", show_default=True)
+@click.option("--ws-url", help="Websocket subscriber URL, by default the ws_subscriber_url of the host in envs.json")
+def ws_subscribers(host, subscribers, events, rate, drain, ws_url):
+    """Measure notification latency, drops and fan-out throughput of newHeads and logs subscriptions"""
+    from deploy.cli import faucet as faucet_cli
+    from loadtesting.wssubscriber import harness
+
+    settings = network_manager.get_network_object(host)
+    # checked before the wallets are funded and the contract is deployed
+    ws_url = ws_url or settings.get("ws_subscriber_url")
+    if not ws_url:
+        raise click.UsageError(f"{host} has no ws_subscriber_url, pass --ws-url")
+    web3_client = web3client.NeonChainWeb3Client(settings["proxy_url"])
+    [key] = faucet_cli.prepare_wallets_with_balance(settings, 1, 1000)
+    account = web3_client.eth.account.from_key(key)
+    event_caller, _ = web3_client.deploy_and_get_contract("common/EventCaller", "0.8.12", account)
+    rows, throughput = harness.run_subscription_load(
+        ws_url,
+        settings["proxy_url"],
+        event_caller,
+        key,
+        subscribers,
+        events,
+        rate,
+        drain,
+    )
+    print(tabulate.tabulate(rows, headers=harness.HEADERS, tablefmt="fancy_outline"))
+    print(f"Fan-out throughput: {throughput:.1f} notifications/s")
+
+
 @cli.group("allure")
 @click.pass_context
 def allure_cli(ctx):
@@ -848,11 +1044,8 @@ def get_allure_history(name: str, network: str, destination: str = "./allure-res
     path = Path(name) / network / branch
 
     runs = []
-    previous_runs = cloud.client.list_objects_v2(
-        Bucket=cloud.NEON_TESTS_BUCKET_NAME, Prefix=f"{path}/", Delimiter="/"
-    ).get("CommonPrefixes", [])
-    for run in previous_runs:
-        run_id = re.findall(r"(\d+)", run["Prefix"])
+    for run in cloud.list_prefixes(f"{path}/"):
+        run_id = re.findall(r"(\d+)", run)
         if len(run_id) > 0:
             runs.append(int(run_id[0]))
     if len(runs) > 0:
@@ -907,6 +1100,8 @@ def generate_allure_report():
               help="In which stand run tests")
 @click.option("--test-group", help="Name of the failed test group")
 def send_notification(url, build_url, network, test_group: str):
+    from utils.slack_notification import SlackNotification
+
     slack_notification = SlackNotification()
 
     # build info
@@ -915,7 +1110,7 @@ def send_notification(url, build_url, network, test_group: str):
     build_info = {"id": build_id, "url": build_url}
 
     # failed tests group or count if available
-    failed_count_by_group: defaultdict[TestGroup, int] = error_log.get_count_by_group()
+    failed_count_by_group: defaultdict[TestGroup, int] = error_log_module.error_log.get_count_by_group()
     if failed_count_by_group:
         failed_tests = "\n".join(f"{group}: {count}" for group, count in failed_count_by_group.items())
     else:
@@ -934,7 +1129,7 @@ def send_notification(url, build_url, network, test_group: str):
         network=network,
         failed_tests=failed_tests,
         report_url=allure_report_url,
-        comments=error_log.read().comments,
+        comments=error_log_module.error_log.read().comments,
     )
 
     # add the divider
@@ -953,6 +1148,8 @@ def send_notification(url, build_url, network, test_group: str):
 @cli.command(name="get-balances", help="Get operator balances in NEON and SOL")
 @click.option("-n", "--network", default="night-stand", type=str, help="In which stand run tests")
 def get_operator_balances(network: str):
+    from utils.operator import Operator
+
     net = network_manager.get_network_object(network)
     operator = Operator(
         net["proxy_url"],
@@ -1064,11 +1261,61 @@ def make_dapps_report(directory, pr_url_for_report, token):
     report_data = dapps_cli.prepare_report_data(directory)
     dapps_cli.print_report(report_data)
     if pr_url_for_report:
+        from deploy.cli.github_api_client import GithubClient
+
         gh_client = GithubClient(token)
         gh_client.delete_last_comment(pr_url_for_report)
         format_data = dapps_cli.format_report_for_github_comment(report_data)
         gh_client.add_comment_to_pr(pr_url_for_report, format_data)
 
 
+@cli.group("benchmarks", help="Micro-benchmarks of utils hot paths")
+def benchmarks():
+    pass
+
+
+def run_benchmarks(*options: str) -> None:
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "benchmarks",
+        "--benchmark-only",
+        f"--benchmark-storage=file://{BENCHMARKS_STORAGE}",
+        "--benchmark-columns=min,median,mean,stddev,ops",
+        *options,
+    ]
+    sys.exit(subprocess.run(command).returncode)
+
+
+@benchmarks.command("save", help="Run the benchmarks and store the results as a new baseline")
+@click.argument("name", default="baseline")
+def save_benchmarks(name):
+    run_benchmarks(f"--benchmark-save={name}")
+
+
+@benchmarks.command("compare", help="Run the benchmarks and fail if they are slower than a stored baseline")
+@click.option("-b", "--baseline", default="", help="Id of the stored run, e.g. 0001, the latest one by default")
+@click.option("-t", "--threshold", default=10, type=int, help="Allowed slowdown of min time, %", show_default=True)
+def compare_benchmarks(baseline, threshold):
+    # pytest-benchmark compares only with runs stored for the same interpreter and passes if there are none
+    machine_id = "-".join(
+        (
+            platform.system(),
+            platform.python_implementation(),
+            ".".join(platform.python_version_tuple()[:2]),
+            platform.architecture()[0],
+        )
+    )
+    if not list((HOME_DIR / BENCHMARKS_STORAGE / machine_id).glob(f"{baseline}*.json")):
+        name = f"run {baseline}" if baseline else "runs"
+        raise click.ClickException(
+            f"No stored benchmark {name} for {machine_id} in {BENCHMARKS_STORAGE}, "
+            "record them with `./clickfile.py benchmarks save` on this interpreter"
+        )
+    compare = f"--benchmark-compare={baseline}" if baseline else "--benchmark-compare"
+    run_benchmarks(compare, f"--benchmark-compare-fail=min:{threshold}%")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,9 +1,10 @@
 import os
 import json
 import shutil
+import logging
 import pathlib
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 import pytest
 from _pytest.config import Config
@@ -12,17 +13,19 @@ from _pytest.nodes import Item
 from _pytest.runner import runtestprotocol
 from solana.keypair import Keypair
 
-from clickfile import TEST_GROUPS, EnvName
-from utils.types import TestGroup
+from utils.types import TestGroup, TEST_GROUPS, EnvName
 from utils.error_log import error_log
 from utils import create_allure_environment_opts, setup_logging
 from utils.faucet import Faucet
 from utils.accounts import EthAccounts
 from utils.web3client import NeonChainWeb3Client
 from utils.solana_client import SolanaClient
+from utils.stand_info import DEFAULT_TTL, get_stand_info
 
 
-pytest_plugins = ["ui.plugins.browser"]
+pytest_plugins = ["ui.plugins.browser", "utils.fixture_profiler"]
+
+LOG = logging.getLogger(__name__)
 
 
 @dataclass
@@ -73,6 +76,13 @@ def pytest_addoption(parser: Parser):
         default=False,
         help=f"Don't clear file {error_log.file_path.name}",
     )
+    parser.addoption(
+        "--stand-info-ttl",
+        action="store",
+        type=int,
+        default=DEFAULT_TTL,
+        help="How long (in seconds) stand versions are kept in the pytest cache, 0 disables caching",
+    )
 
 
 def pytest_sessionstart(session: pytest.Session):
@@ -140,6 +150,19 @@ def pytest_configure(config: Config):
     setup_logging()
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Fetch stand metadata once on the xdist controller and share it with all workers"""
+    if node.config.getoption("--network") == "geth" or getattr(node.config, "stand_info_failed", False):
+        return
+    try:
+        node.workerinput["stand_info"] = asdict(get_stand_info(node.config))
+    except Exception as e:
+        # the stand may be unreachable for tests which don't need it, workers fetch it themselves when they do
+        LOG.warning(f"Failed to fetch stand info for xdist workers: {e}")
+        node.config.stand_info_failed = True
+
+
 @pytest.fixture(scope="session")
 def env_name(pytestconfig: Config) -> EnvName:
     return pytestconfig.environment.name  # noqa
@@ -160,15 +183,16 @@ def evm_loader_keypair():
 
 
 @pytest.fixture(scope="session", autouse=True)
-def allure_environment(pytestconfig: Config, web3_client_session: NeonChainWeb3Client):
+def allure_environment(pytestconfig: Config):
     opts = {}
     network_name = pytestconfig.getoption("--network")
     if  network_name != "geth" and network_name != "mainnet" and "neon_evm" not in os.getenv("PYTEST_CURRENT_TEST"):
+        stand_info = get_stand_info(pytestconfig)
         opts = {
             "Network": pytestconfig.environment.proxy_url,
-            "Proxy.Version": web3_client_session.get_proxy_version()["result"],
-            "EVM.Version": web3_client_session.get_evm_version()["result"],
-            "CLI.Version": web3_client_session.get_cli_version()["result"],
+            "Proxy.Version": stand_info.proxy_version,
+            "EVM.Version": stand_info.evm_version,
+            "CLI.Version": stand_info.cli_version,
         }
 
     yield opts
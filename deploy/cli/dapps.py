@@ -3,17 +3,22 @@ import glob
 import json
 import typing as tp
 import pathlib
+from multiprocessing.dummy import Pool
 
 import tabulate
 
-from deploy.cli.infrastructure import get_solana_accounts_in_tx
 from deploy.cli.network_manager import NetworkManager
 
+from utils.apiclient import JsonRPCSession
 from utils.web3client import NeonChainWeb3Client
 
 
 REPORT_HEADERS = ["Action", "Fee", "Cost in $", "Accounts", "TRx", "Estimated Gas", "Used Gas", "Used % of EG"]
 NETWORK_MANAGER = NetworkManager()
+# transaction details don't change, so they are fetched once for all report runs
+COST_CACHE_FILE = ".cost-report-cache.json"
+BATCH_SIZE = 20
+CONCURRENCY = 8
 
 
 def set_github_env(envs: tp.Dict, upper=True) -> None:
@@ -25,10 +30,7 @@ def set_github_env(envs: tp.Dict, upper=True) -> None:
                 env_file.write(f"\n{key.upper() if upper else key}={str(value)}")
 
 
-def prepare_report_data(directory):
-    proxy_url = NETWORK_MANAGER.get_network_param(os.environ.get("NETWORK"), "proxy_url")
-    web3_client = NeonChainWeb3Client(proxy_url)
-    out = {}
+def load_reports(directory) -> tp.Dict[str, tp.List[tp.Dict]]:
     reports = {}
     for path in glob.glob(str(pathlib.Path(directory) / "*-report.json")):
         with open(path, "r") as f:
@@ -40,21 +42,82 @@ def prepare_report_data(directory):
             else:
                 if "actions" in rep:
                     reports[rep["name"]] = rep["actions"]
+    return reports
+
+
+def count_solana_accounts(solana_tx: tp.Optional[tp.Dict]) -> tp.Optional[int]:
+    """Number of accounts of the transaction, accounts of the first lookup table if it uses one"""
+    if not solana_tx:
+        return None
+    message = solana_tx["transaction"]["message"]
+    lookups = message.get("addressTableLookups")
+    if lookups:
+        return len(lookups[0]["writableIndexes"]) + len(lookups[0]["readonlyIndexes"])
+    return len(message["accountKeys"])
+
+
+def fetch_tx_details(proxy: JsonRPCSession, solana: JsonRPCSession, hashes: tp.List[str]) -> tp.Dict[str, tp.Dict]:
+    """Get solana transactions count, accounts count and gas limit of neon transactions with two batch requests"""
+    responses = proxy.send_batch_rpc(
+        [("neon_getSolanaTransactionByNeonTransaction", [tx]) for tx in hashes]
+        + [("eth_getTransactionByHash", [tx]) for tx in hashes]
+    )
+    solana_txs = [response.get("result") or [] for response in responses[: len(hashes)]]
+    neon_txs = [response.get("result") for response in responses[len(hashes) :]]
+    first_txs = [(i, txs[0]) for i, txs in enumerate(solana_txs) if txs]
+    solana_responses = {}
+    if first_txs:
+        config = {"encoding": "json", "maxSupportedTransactionVersion": 0}
+        batch = solana.send_batch_rpc([("getTransaction", [signature, config]) for _, signature in first_txs])
+        solana_responses = {i: response.get("result") for (i, _), response in zip(first_txs, batch)}
+
+    details = {}
+    for i, tx in enumerate(hashes):
+        neon_tx = neon_txs[i]
+        details[tx] = {
+            "accounts": count_solana_accounts(solana_responses.get(i)),
+            "trx": len(solana_txs[i]),
+            "estimated_gas": int(neon_tx["gas"], 16) if neon_tx and neon_tx.get("gas") else None,
+        }
+    return details
+
 
+def prepare_report_data(directory):
+    network = os.environ.get("NETWORK")
+    proxy_url = NETWORK_MANAGER.get_network_param(network, "proxy_url")
+    solana_url = NETWORK_MANAGER.get_network_param(network, "solana_url")
+    web3_client = NeonChainWeb3Client(proxy_url)
+    proxy, solana = JsonRPCSession(proxy_url), JsonRPCSession(solana_url)
+    reports = load_reports(directory)
+
+    cache_path = pathlib.Path(directory) / COST_CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+    hashes = list({action["tx"] for actions in reports.values() for action in actions} - cache.keys())
+    batches = [hashes[i : i + BATCH_SIZE] for i in range(0, len(hashes), BATCH_SIZE)]
+    print(f"Fetch {len(hashes)} transactions, {len(cache)} are cached")
+    fetched = {}
+    with Pool(CONCURRENCY) as pool:
+        for details in pool.imap_unordered(lambda batch: fetch_tx_details(proxy, solana, batch), batches):
+            fetched.update(details)
+    # incomplete results are fetched again next time
+    cache.update({tx: d for tx, d in fetched.items() if d["accounts"] is not None and d["estimated_gas"]})
+    cache_path.write_text(json.dumps(cache))
+
+    token_usd_price = web3_client.get_token_usd_gas_price()
+    out = {}
     for app in reports:
         out[app] = []
         for action in reports[app]:
-            accounts, trx = get_solana_accounts_in_tx(action["tx"])
-            tx = web3_client.get_transaction_by_hash(action["tx"])
-            estimated_gas = int(tx.gas) if tx and tx.gas else None
+            tx_details = fetched.get(action["tx"]) or cache[action["tx"]]
+            estimated_gas = tx_details.get("estimated_gas")
             used_gas = int(action["usedGas"])
             row = [action["name"]]
             fee = used_gas * int(action["gasPrice"]) / 1000000000000000000
             used_gas_percentage = round(used_gas * 100 / estimated_gas, 2) if estimated_gas else None
             row.append(fee)
-            row.append(fee * web3_client.get_token_usd_gas_price())
-            row.append(accounts)
-            row.append(trx)
+            row.append(fee * token_usd_price)
+            row.append(tx_details.get("accounts"))
+            row.append(tx_details.get("trx"))
             row.append(estimated_gas)
             row.append(used_gas)
             row.append(used_gas_percentage)
@@ -1,19 +1,29 @@
+import threading
+from multiprocessing.dummy import Pool
+
 from utils import web3client
 from utils import faucet
 
+# Limits the number of simultaneous faucet requests made by all the callers in the process
+FAUCET_CONCURRENCY = 16
+faucet_semaphore = threading.BoundedSemaphore(FAUCET_CONCURRENCY)
+
 
 def prepare_wallets_with_balance(settings, count=8, airdrop_amount=20000):
     print(f"Preparing {count} wallets with balances")
     web3_client = web3client.NeonChainWeb3Client(settings["proxy_url"])
     faucet_client = faucet.Faucet(settings["faucet_url"], web3_client)
-    private_keys = []
+    accounts = [web3_client.eth.account.create() for _ in range(count)]
+
+    def fund(index):
+        # the first wallet gets more tokens
+        for _ in range(3 if index == 0 else 1):
+            with faucet_semaphore:
+                faucet_client.request_neon(accounts[index].address, airdrop_amount)
+
+    with Pool(min(count, FAUCET_CONCURRENCY) or 1) as pool:
+        pool.map(fund, range(count))
 
-    for i in range(count):
-        acc = web3_client.eth.account.create()
-        faucet_client.request_neon(acc.address, airdrop_amount)
-        if i == 0:
-            for _ in range(2):
-                faucet_client.request_neon(acc.address, airdrop_amount)
-        private_keys.append(acc.key.hex())
+    private_keys = [acc.key.hex() for acc in accounts]
     print("All private keys: ", ",".join(private_keys))
-    return private_keys
\ No newline at end of file
+    return private_keys
@@ -0,0 +1,129 @@
+"""Check that transactions saved by load tests (SAVE_TRANSACTIONS) reached Neon and Solana.
+
+Neon receipts are requested in JSON-RPC batches and Solana signatures with getSignatureStatuses in chunks of 256,
+several requests at a time on asyncio. Missing and failed transactions are streamed to a JSONL report.
+"""
+import asyncio
+import glob
+import json
+import typing as tp
+
+import aiohttp
+
+NEON_BATCH_SIZE = 100
+SOLANA_CHUNK_SIZE = 256
+DEFAULT_CONCURRENCY = 8
+
+
+def load_captures(patterns: tp.Iterable[str]) -> tp.Dict[str, tp.List[str]]:
+    """Merge capture files: JSON {neon: [solana]} of older runs and JSONL {"neon", "solana"} rows"""
+    transactions = {}
+    for path in sorted({path for pattern in patterns for path in glob.glob(pattern)}):
+        with open(path, "r") as f:
+            if path.endswith(".jsonl"):
+                rows = (json.loads(line) for line in f if line.strip())
+                captured = {row["neon"]: row["solana"] for row in rows}
+            else:
+                captured = json.load(f)
+        for neon_tx, solana_txs in captured.items():
+            # a row without solana transactions doesn't hide ones found in another file
+            transactions[neon_tx] = solana_txs or transactions.get(neon_tx) or []
+    return transactions
+
+
+def _chunks(items: tp.Sequence, size: int) -> tp.Iterator[tp.Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class LostTransactionsChecker:
+    def __init__(self, proxy_url: str, solana_url: str, report: tp.TextIO, concurrency: int = DEFAULT_CONCURRENCY):
+        self.proxy_url = proxy_url
+        self.solana_url = solana_url
+        self.report = report
+        self.concurrency = concurrency
+        self.counts = {chain: {"checked": 0, "missing": 0, "failed": 0} for chain in ("neon", "solana")}
+
+    def _add(self, chain: str, tx: str, status: tp.Optional[str], details: tp.Any = None) -> None:
+        self.counts[chain]["checked"] += 1
+        if status is None:
+            return
+        self.counts[chain][status] += 1
+        self.report.write(json.dumps({"chain": chain, "tx": tx, "status": status, "details": details}) + "\n")
+        self.report.flush()
+
+    async def _post(self, session: aiohttp.ClientSession, url: str, body: tp.Any) -> tp.Any:
+        async with session.post(url, json=body) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _check_neon(self, session: aiohttp.ClientSession, hashes: tp.Sequence[str]) -> None:
+        body = [
+            {"jsonrpc": "2.0", "method": "eth_getTransactionReceipt", "params": [tx], "id": i}
+            for i, tx in enumerate(hashes)
+        ]
+        try:
+            responses = {item["id"]: item for item in await self._post(session, self.proxy_url, body)}
+        except Exception as e:
+            responses = {i: {"error": str(e)} for i in range(len(hashes))}
+        for i, tx in enumerate(hashes):
+            response = responses.get(i, {"error": "no response"})
+            receipt = response.get("result")
+            if receipt is None:
+                self._add("neon", tx, "missing", response.get("error"))
+            elif int(receipt["status"], 16) != 1:
+                self._add("neon", tx, "failed", {"blockNumber": receipt["blockNumber"]})
+            else:
+                self._add("neon", tx, None)
+
+    async def _check_solana(self, session: aiohttp.ClientSession, signatures: tp.Sequence[str]) -> None:
+        body = {
+            "jsonrpc": "2.0",
+            "method": "getSignatureStatuses",
+            "params": [list(signatures), {"searchTransactionHistory": True}],
+            "id": 0,
+        }
+        try:
+            response = await self._post(session, self.solana_url, body)
+            statuses = response["result"]["value"]
+        except Exception as e:
+            for signature in signatures:
+                self._add("solana", signature, "missing", str(e))
+            return
+        for signature, status in zip(signatures, statuses):
+            if status is None:
+                self._add("solana", signature, "missing")
+            elif status.get("err") is not None:
+                self._add("solana", signature, "failed", status["err"])
+            else:
+                self._add("solana", signature, None)
+
+    async def check(self, transactions: tp.Dict[str, tp.List[str]]) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(coroutine):
+            async with semaphore:
+                await coroutine
+
+        neon_txs = list(transactions)
+        solana_txs = [signature for signatures in transactions.values() for signature in signatures]
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120)) as session:
+            await asyncio.gather(
+                *(limited(self._check_neon(session, batch)) for batch in _chunks(neon_txs, NEON_BATCH_SIZE)),
+                *(limited(self._check_solana(session, chunk)) for chunk in _chunks(solana_txs, SOLANA_CHUNK_SIZE)),
+            )
+
+
+def check_lost_transactions(
+    proxy_url: str,
+    solana_url: str,
+    patterns: tp.Iterable[str],
+    report_path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> tp.Dict[str, tp.Dict[str, int]]:
+    transactions = load_captures(patterns)
+    print(f"Loaded {len(transactions)} neon transactions")
+    with open(report_path, "w") as report:
+        checker = LostTransactionsChecker(proxy_url, solana_url, report, concurrency)
+        asyncio.run(checker.check(transactions))
+    return checker.counts
@@ -5,7 +5,7 @@ from types import SimpleNamespace
 from hexbytes import HexBytes
 from web3 import types
 
-from clickfile import EnvName
+from utils.types import EnvName
 from integration.tests.basic.helpers.assert_message import AssertMessage
 from integration.tests.basic.helpers.basic import NeonEventType, SolanaInstruction
 from utils.models.result import NeonGetTransactionResult, SolanaByNeonTransaction
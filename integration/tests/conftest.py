@@ -1,7 +1,5 @@
 import inspect
-import json
 import os
-import pathlib
 import random
 import string
 import time
@@ -18,8 +16,6 @@ from solana.rpc.types import TxOpts
 from web3.contract import Contract
 
 import allure
-from clickfile import network_manager
-from utils import web3client
 from utils.accounts import EthAccounts
 from utils.apiclient import JsonRPCSession
 from utils.consts import COUNTER_ID, LAMPORT_PER_SOL, MULTITOKEN_MINTS
@@ -27,7 +23,7 @@ from utils.erc20 import ERC20
 from utils.erc20wrapper import ERC20Wrapper
 from utils.evm_loader import EvmLoader
 from utils.operator import Operator
-from utils.prices import get_sol_price
+from utils.stand_info import get_stand_info
 from utils.web3client import NeonChainWeb3Client, Web3Client
 
 NEON_AIRDROP_AMOUNT = 1_000
@@ -42,10 +38,7 @@ def pytest_collection_modifyitems(config, items):
     if network_name == "geth":
         return
 
-    settings = network_manager.get_network_object(network_name)
-    web3_client = web3client.NeonChainWeb3Client(settings["proxy_url"])
-
-    raw_proxy_version = web3_client.get_proxy_version()["result"]
+    raw_proxy_version = get_stand_info(config).proxy_version
 
     if "Neon-proxy/" in raw_proxy_version:
         raw_proxy_version = raw_proxy_version.split("Neon-proxy/")[1].strip()
@@ -60,11 +53,7 @@ def pytest_collection_modifyitems(config, items):
     else:
         deselected_marks.append("only_devnet")
 
-    envs_file = config.getoption("--envs")
-    with open(pathlib.Path().parent.parent / envs_file, "r+") as f:
-        environments = json.load(f)
-
-    if len(environments[network_name]["network_ids"]) == 1:
+    if len(config.environment.network_ids) == 1:
         deselected_marks.append("multipletokens")
 
     for item in items:
@@ -475,6 +464,8 @@ def revert_contract_caller(web3_client, accounts, revert_contract):
 @pytest.fixture(scope="session")
 def sol_price() -> float:
     """Get SOL price from Solana mainnet"""
+    from utils.prices import get_sol_price  # pythclient is heavy, import it only when the price is needed
+
     price = get_sol_price()
     started = time.time()
     timeout = 120
@@ -16,7 +16,7 @@ from .utils.constants import NEON_CORE_API_URL, NEON_CORE_API_RPC_URL, SOLANA_UR
 from .utils.contract import deploy_contract, make_contract_call_trx
 from .utils.neon_api_rpc_client import NeonApiRpcClient
 from .utils.storage import create_holder
-from .utils.neon_api_client import NeonApiClient
+from .utils.neon_api_client import CachedNeonApiClient, NeonApiClient
 from .utils.transaction_checks import check_transaction_logs_have_text
 
 
@@ -256,6 +256,13 @@ def neon_api_client():
     return client
 
 
+@pytest.fixture(scope="session")
+def cached_neon_api_client(evm_loader):
+    """For tests repeating the same calls, every emulation also reads the touched accounts from Solana"""
+    client = CachedNeonApiClient(url=NEON_CORE_API_URL, solana_client=evm_loader)
+    return client
+
+
 @pytest.fixture(scope="session")
 def neon_rpc_client():
     client = NeonApiRpcClient(url=NEON_CORE_API_RPC_URL)
@@ -1,6 +1,15 @@
+import pytest
 from eth_utils import abi, to_text
 
+from .utils.constants import NEON_CORE_API_URL
 from .utils.contract import deploy_contract, get_contract_bin
+from .utils.neon_api_client import NeonApiClient
+
+
+@pytest.fixture(scope="module")
+def neon_api_client():
+    """The API itself is tested here, so emulations are not cached"""
+    return NeonApiClient(url=NEON_CORE_API_URL)
 
 
 
@@ -20,6 +20,9 @@ from semantic_version import Version
 
 from web3.auto import w3
 
+# deploy_contract is called by many fixtures, they share the pooled connections
+neon_api_client = NeonApiClient(url=NEON_CORE_API_URL)
+
 
 def get_contract_bin(
     contract: str,
@@ -126,8 +129,6 @@ def deploy_contract(
     contract_name: tp.Optional[str] = None,
     version: str = "0.7.6",
 ):
-    neon_api_client = NeonApiClient(url=NEON_CORE_API_URL)
-
     contract_code = get_contract_bin(contract_file_name, contract_name=contract_name, version=version)
     if encoded_args is None:
         encoded_args = b""
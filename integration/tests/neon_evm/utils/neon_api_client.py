@@ -1,36 +1,84 @@
+import asyncio
+import collections
+import copy
+import threading
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
 import eth_abi
 import requests
 from eth_utils import abi
+from requests.adapters import HTTPAdapter
+from solana.publickey import PublicKey
+from solana.rpc.commitment import Confirmed
+from solana.rpc.types import DataSliceOpts
 
 from utils.evm_loader import CHAIN_ID
+from utils.layouts import BALANCE_ACCOUNT_LAYOUT, CONTRACT_ACCOUNT_LAYOUT, STORAGE_CELL_LAYOUT
+from utils.solana_client import SolanaClient
 from utils.types import Caller, Contract
 
+# independent emulations are sent at most this many at a time, the session keeps as many connections
+EMULATE_CONCURRENCY = 8
+# the revision of contract accounts and storage cells, nonce and balance of balance accounts are in these bytes
+REVISION_HEADER_SIZE = max(
+    layout.sizeof() for layout in (BALANCE_ACCOUNT_LAYOUT, CONTRACT_ACCOUNT_LAYOUT, STORAGE_CELL_LAYOUT)
+)
+MAX_ACCOUNTS_PER_REQUEST = 100
+
+
+def pooled_session(pool_size: int = EMULATE_CONCURRENCY) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+def emulate_body(sender, contract, data=bytes(), chain_id=CHAIN_ID, value="0x0", max_steps_to_execute=500000):
+    if isinstance(data, bytes):
+        data = data.hex()
+    return {
+        "step_limit": max_steps_to_execute,
+        "tx": {"from": sender, "to": contract, "data": data, "chain_id": chain_id, "value": value},
+        "accounts": [],
+    }
+
 
 class NeonApiClient:
-    def __init__(self, url):
+    def __init__(self, url, session: tp.Optional[requests.Session] = None, concurrency: int = EMULATE_CONCURRENCY):
         self.url = url
         self.headers = {"Content-Type": "application/json"}
+        self.concurrency = concurrency
+        self.session = session or pooled_session(concurrency)
 
     def emulate(self, sender, contract, data=bytes(), chain_id=CHAIN_ID, value='0x0', max_steps_to_execute=500000):
-        if isinstance(data, bytes):
-            data = data.hex()
-        body = {
-            "step_limit": max_steps_to_execute,
-            "tx": {
-                "from": sender,
-                "to": contract,
-                "data": data,
-                "chain_id": chain_id,
-                "value": value
-            },
-            "accounts": []
-        }
-        resp = requests.post(url=f"{self.url}/emulate", json=body, headers=self.headers)
+        body = emulate_body(sender, contract, data, chain_id, value, max_steps_to_execute)
+        resp = self.session.post(url=f"{self.url}/emulate", json=body, headers=self.headers)
         if resp.status_code == 200:
             return resp.json()["value"]
         else:
             return resp.json()
 
+    def emulate_many(self, calls: tp.Sequence[tp.Dict]) -> tp.List[tp.Dict]:
+        """Emulate independent calls concurrently, every call is a dict of emulate kwargs, results are in order"""
+        with ThreadPoolExecutor(min(self.concurrency, len(calls) or 1)) as executor:
+            return list(executor.map(lambda kwargs: self.emulate(**kwargs), calls))
+
+    async def emulate_many_async(self, calls: tp.Sequence[tp.Dict]) -> tp.List[tp.Dict]:
+        """emulate_many for asyncio code"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+
+            async def emulate(kwargs):
+                async with session.post(f"{self.url}/emulate", json=emulate_body(**kwargs)) as resp:
+                    result = await resp.json(content_type=None)
+                    return result["value"] if resp.status == 200 else result
+
+            return list(await asyncio.gather(*(emulate(kwargs) for kwargs in calls)))
+
 
 
     def emulate_contract_call(self, sender, contract, function_signature, params=None):
@@ -48,12 +96,12 @@ class NeonApiClient:
             "contract": contract_id,
             "index": index
         }
-        return requests.post(url=f"{self.url}/storage", json=body, headers=self.headers).json()
+        return self.session.post(url=f"{self.url}/storage", json=body, headers=self.headers).json()
 
 
     def get_holder(self, public_key):
         body = {"pubkey": f"{public_key}"}
-        return requests.post(url=f"{self.url}/holder", json=body, headers=self.headers).json()
+        return self.session.post(url=f"{self.url}/holder", json=body, headers=self.headers).json()
 
     def get_balance(self, ether, chain_id = CHAIN_ID):
         body = {
@@ -61,7 +109,7 @@ class NeonApiClient:
                 { "address": ether, "chain_id": chain_id }
             ]
         }
-        return requests.post(url=f"{self.url}/balance", json=body, headers=self.headers).json()
+        return self.session.post(url=f"{self.url}/balance", json=body, headers=self.headers).json()
 
     def call_contract_get_function(self, sender, contract, function_signature: str, args=None):
         data = abi.function_signature_to_4byte_selector(function_signature)
@@ -79,3 +127,90 @@ class NeonApiClient:
             data
         )
         return result["steps_executed"]
+
+
+class CachedNeonApiClient(NeonApiClient):
+    """Emulation results are reused while the Solana accounts touched by the call keep their revisions.
+
+    An entry is keyed by sender, contract, calldata, value, chain id and step limit, and keeps the headers, lamports
+    and owners of the solana_accounts of the result. A repeated call reads them with getMultipleAccounts and emulates
+    again only if any of them changed, e.g. after a transaction bumped a revision or the sender nonce.
+
+    The accounts are read before and after the emulation, and the result is cached only if they are the same, so a
+    transaction landed during the emulation can't leave a stale result. The accounts aren't known before the first
+    emulation of a call, so only its accounts are kept and the result is cached from the next emulation.
+    """
+
+    def __init__(self, url, solana_client: SolanaClient, max_size: int = 1024, **kwargs):
+        super().__init__(url, **kwargs)
+        self.solana_client = solana_client
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # (pubkeys, revisions, result), the result is None until it is verified by a repeated emulation
+        self._cache: tp.OrderedDict[tp.Tuple, tp.Tuple[tp.List[str], tp.Tuple, tp.Optional[tp.Dict]]] = (
+            collections.OrderedDict()
+        )
+        # emulate_many calls emulate from threads
+        self._lock = threading.Lock()
+
+    def revisions(self, pubkeys: tp.Sequence[str]) -> tp.Tuple[tp.Optional[tp.Tuple[bytes, int, str]], ...]:
+        """Header, lamports and owner of every account, None for missing ones"""
+        revisions = []
+        for i in range(0, len(pubkeys), MAX_ACCOUNTS_PER_REQUEST):
+            accounts = self.solana_client.get_multiple_accounts(
+                [PublicKey(pubkey) for pubkey in pubkeys[i : i + MAX_ACCOUNTS_PER_REQUEST]],
+                commitment=Confirmed,
+                data_slice=DataSliceOpts(offset=0, length=REVISION_HEADER_SIZE),
+            ).value
+            revisions.extend(
+                (bytes(account.data), account.lamports, str(account.owner)) if account is not None else None
+                for account in accounts
+            )
+        return tuple(revisions)
+
+    def emulate(self, sender, contract, data=bytes(), chain_id=CHAIN_ID, value='0x0', max_steps_to_execute=500000):
+        key = (
+            sender.lower(),
+            contract.lower() if contract else None,
+            data.hex() if isinstance(data, bytes) else data,
+            chain_id,
+            value,
+            max_steps_to_execute,
+        )
+        with self._lock:
+            entry = self._cache.get(key)
+        expected, before = None, None
+        if entry is not None:
+            expected, revisions, result = entry
+            before = self.revisions(expected)
+            if result is not None and before == revisions:
+                with self._lock:
+                    self.hits += 1
+                    if key in self._cache:
+                        self._cache.move_to_end(key)
+                return copy.deepcopy(result)
+
+        result = super().emulate(sender, contract, data, chain_id, value, max_steps_to_execute)
+        with self._lock:
+            self.misses += 1
+        # errors are not cached
+        if "solana_accounts" not in result:
+            return result
+        pubkeys = [item["pubkey"] for item in result["solana_accounts"]]
+        after = self.revisions(pubkeys)
+        if pubkeys == expected and before == after:
+            entry = (pubkeys, after, copy.deepcopy(result))
+        else:
+            # the first emulation or accounts changed during it, the next one is checked against these accounts
+            entry = (pubkeys, after, None)
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -1,26 +1,41 @@
+import asyncio
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
 import requests
 
 from utils.evm_loader import CHAIN_ID
+from .neon_api_client import EMULATE_CONCURRENCY, emulate_body, pooled_session
 
 
 class NeonApiRpcClient:
-    def __init__(self, url):
+    def __init__(self, url, session: tp.Optional[requests.Session] = None, concurrency: int = EMULATE_CONCURRENCY):
         self.url = url
         self.headers = {"Content-Type": "application/json"}
+        self.concurrency = concurrency
+        self.session = session or pooled_session(concurrency)
 
-    def post(self, method, params):
-        body = {
+    @staticmethod
+    def _body(method, params):
+        return {
             "jsonrpc": "2.0",
             "id": 1,
             "method": method,
             "params": [params],
         }
-        resp = requests.post(url=f"{self.url}", json=body, headers=self.headers).json()
+
+    @staticmethod
+    def _unwrap(resp):
         if "result" in resp:
             return resp['result']
         else:
             return resp['error']
 
+    def post(self, method, params):
+        resp = self.session.post(url=f"{self.url}", json=self._body(method, params), headers=self.headers).json()
+        return self._unwrap(resp)
+
     def get_storage_at(self, contract, index="0x0"):
         params = {"contract": contract, "index": index}
         return self.post("get_storage_at", params)
@@ -31,21 +46,25 @@ class NeonApiRpcClient:
         return self.post("balance", params)
 
     def emulate(self, sender, contract, data=bytes(), chain_id=CHAIN_ID, value='0x0', max_steps_to_execute=500000):
-        if isinstance(data, bytes):
-            data = data.hex()
-        params = {
-            "step_limit": max_steps_to_execute,
-            "tx": {
-                "from": sender,
-                "to": contract,
-                "data": data,
-                "chain_id": chain_id,
-                "value": value
-            },
-            "accounts": []
-        }
+        params = emulate_body(sender, contract, data, chain_id, value, max_steps_to_execute)
         return self.post("emulate", params)
 
+    def emulate_many(self, calls: tp.Sequence[tp.Dict]) -> tp.List[tp.Dict]:
+        """Emulate independent calls concurrently, every call is a dict of emulate kwargs, results are in order"""
+        with ThreadPoolExecutor(min(self.concurrency, len(calls) or 1)) as executor:
+            return list(executor.map(lambda kwargs: self.emulate(**kwargs), calls))
+
+    async def emulate_many_async(self, calls: tp.Sequence[tp.Dict]) -> tp.List[tp.Dict]:
+        """emulate_many for asyncio code"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+
+            async def emulate(kwargs):
+                async with session.post(self.url, json=self._body("emulate", emulate_body(**kwargs))) as resp:
+                    return self._unwrap(await resp.json(content_type=None))
+
+            return list(await asyncio.gather(*(emulate(kwargs) for kwargs in calls)))
+
     def get_contract(self, address):
         params = {"contract": address}
         return self.post("contract", params)
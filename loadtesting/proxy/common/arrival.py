@@ -0,0 +1,171 @@
+"""Open-model load: transactions are issued by a timer at the target rate, not after the previous receipt.
+
+Arrivals follow an absolute timeline, so a slow proxy doesn't lower the offered load. Arrivals which can't be
+started because `--max-in-flight` transactions are already pending are counted as dropped.
+"""
+import dataclasses
+import logging
+import time
+import typing as tp
+
+import gevent
+import tabulate
+from gevent.pool import Pool
+from locust import events
+from locust.runners import MasterRunner
+
+from .transport import get_users_count
+
+LOG = logging.getLogger(__name__)
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=10,
+        help="Target rate of transactions per second for all users of all workers",
+    )
+    parser.add_argument(
+        "--rate-schedule",
+        type=str,
+        default="",
+        help='Rate steps "<seconds>:<tps>,...", e.g. "60:10,120:50", the last rate is kept after the schedule ends',
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1000,
+        help="Max number of pending transactions per user, arrivals above the limit are dropped",
+    )
+    parser.add_argument(
+        "--arrival-users",
+        type=int,
+        default=0,
+        help="Number of users of all workers the rate is split between, by default the number the master starts",
+    )
+
+
+@dataclasses.dataclass
+class RateSchedule:
+    steps: tp.List[tp.Tuple[float, float]]
+
+    @classmethod
+    def from_options(cls, options) -> "RateSchedule":
+        steps = []
+        for step in filter(None, options.rate_schedule.split(",")):
+            duration, rate = step.split(":")
+            steps.append((float(duration.strip().rstrip("s")), float(rate)))
+        return cls(steps or [(0, options.arrival_rate)])
+
+    @classmethod
+    def per_user(cls, environment) -> "RateSchedule":
+        """Share of the target rate of one user"""
+        options = environment.parsed_options
+        users = options.arrival_users or getattr(options, "arrival_total_users", 0) or get_users_count(environment)
+        return cls.from_options(options).scaled(1 / users)
+
+    def scaled(self, factor: float) -> "RateSchedule":
+        return RateSchedule([(duration, rate * factor) for duration, rate in self.steps])
+
+    def rate_at(self, elapsed: float) -> float:
+        for duration, rate in self.steps:
+            if elapsed < duration:
+                return rate
+            elapsed -= duration
+        return self.steps[-1][1]
+
+
+@dataclasses.dataclass
+class ArrivalStats:
+    offered: int = 0
+    dropped: int = 0
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    started: tp.Optional[float] = None
+
+    def report(self) -> str:
+        elapsed = time.monotonic() - self.started if self.started else 0
+        offered_tps = self.offered / elapsed if elapsed else 0
+        achieved_tps = self.completed / elapsed if elapsed else 0
+        return (
+            tabulate.tabulate(
+                [
+                    ["Offered", self.offered, offered_tps],
+                    ["Completed", self.completed, achieved_tps],
+                    ["Failed", self.failed, self.failed / elapsed if elapsed else 0],
+                    ["Dropped", self.dropped, self.dropped / elapsed if elapsed else 0],
+                ],
+                headers=["Transactions", "Count", "TPS"],
+                tablefmt="fancy_outline",
+                numalign="right",
+                floatfmt=".2f",
+            )
+            + f"\nIn flight: {self.in_flight}, max in flight: {self.max_in_flight}, duration: {elapsed:.0f}s"
+        )
+
+
+# one per worker process, shared by all its users
+arrival_stats = ArrivalStats()
+
+
+@events.test_start.add_listener
+def share_users_count(environment, **kwargs):
+    # workers know only their share of users, fewer while ramping up; the master passes its custom options with
+    # every spawn message, so the total number of users goes with them
+    if isinstance(environment.runner, MasterRunner):
+        environment.parsed_options.arrival_total_users = environment.runner.target_user_count
+
+
+@events.test_stop.add_listener
+def report_arrival_stats(environment, **kwargs):
+    if isinstance(environment.runner, MasterRunner) or not arrival_stats.offered:
+        return
+    LOG.info(f"\n{10 * '_'} Offered vs achieved load {10 * '_'}\n{arrival_stats.report()}\n")
+
+
+def _track(inject: tp.Callable[[], tp.Any], stats: ArrivalStats) -> None:
+    stats.in_flight += 1
+    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+    try:
+        inject()
+        stats.completed += 1
+    except Exception as e:
+        stats.failed += 1
+        LOG.debug(f"Transaction failed: {e}")
+    finally:
+        stats.in_flight -= 1
+
+
+def run_arrivals(
+    schedule: RateSchedule,
+    inject: tp.Callable[[], tp.Any],
+    max_in_flight: int,
+    stats: ArrivalStats = arrival_stats,
+) -> None:
+    """Start inject in a new greenlet at the scheduled rate, runs until the user is stopped"""
+    pool = Pool(max_in_flight)
+    started = time.monotonic()
+    if stats.started is None:
+        stats.started = started
+    next_arrival = started
+    try:
+        while True:
+            delay = next_arrival - time.monotonic()
+            if delay > 0:
+                gevent.sleep(delay)
+            rate = schedule.rate_at(next_arrival - started)
+            if rate <= 0:
+                next_arrival += 1
+                continue
+            stats.offered += 1
+            if pool.full():
+                stats.dropped += 1
+            else:
+                pool.spawn(_track, inject, stats)
+            next_arrival += 1 / rate
+    finally:
+        pool.kill(block=False)
@@ -1,54 +1,40 @@
 import os
-import json
 import logging
 import time
-import random
 import typing as tp
 from functools import lru_cache
 
 import web3.types
 import requests
-import gevent
-from gevent.pool import Pool
 from locust import TaskSet, events
 
 from utils import helpers
 from utils.faucet import Faucet
 from utils.web3client import NeonChainWeb3Client
 
-from .events import statistics_collector, save_transaction
+from . import lifecycle
+from .events import save_transaction
+from .instrumentation import instrument_class
+from .registry import publish_account, registry
+from .saver import TransactionSaver, default_path
+from .transport import get_users_count, make_provider
 
 LOG = logging.getLogger(__name__)
 
-saved_transactions = []
+# hashes of sent transactions are resolved to solana transactions in background while the test runs
+saved_transactions = TransactionSaver(default_path()) if "SAVE_TRANSACTIONS" in os.environ else None
+
+
+@events.test_start.add_listener
+def start_transactions_saver(environment: "locust.env.Environment", **kwargs):
+    if saved_transactions is not None:
+        saved_transactions.start(environment.credentials["proxy_url"])
 
 
 @events.test_stop.add_listener
 def save_transactions_list(environment: "locust.env.Environment", **kwargs):
-    if "SAVE_TRANSACTIONS" in os.environ:
-        web3_client = NeonWeb3ClientExt(
-            environment.credentials["proxy_url"])
-
-        def get_solana_trx(tr):
-            return tr, web3_client.get_solana_trx_by_neon(tr)
-
-        trx = {}
-        print("Start save transactions list")
-        pool = Pool(10)
-        tasks = [pool.spawn(get_solana_trx, t) for t in saved_transactions]
-        gevent.joinall(tasks)
-
-        for res in tasks:
-            if res.value is None:
-                continue
-            tr, resp = res.value
-            if "result" not in resp:
-                print(f"Can't get solana trx from tx {tr}: {resp}")
-                continue
-            trx[tr] = resp["result"]
-        with (open(f"transactions-{random.randint(0, 1000)}.json", "w+")) as f:
-            json.dump(trx, f)
-        print("Results saved")
+    if saved_transactions is not None:
+        saved_transactions.close()
 
 
 def init_session(size: int = 1000) -> requests.Session:
@@ -64,17 +50,25 @@ def init_session(size: int = 1000) -> requests.Session:
 class NeonWeb3ClientExt(NeonChainWeb3Client):
     """Extends Neon Web3 client adds statistics metrics"""
 
-    def __getattribute__(self, item):
-        ignore_list = ["create_account", "_send_transaction"]
-        try:
-            attr = object.__getattribute__(self, item)
-        except AttributeError:
-            attr = super(NeonWeb3ClientExt, self).__getattr__(item)
-        if callable(attr) and item not in ignore_list:
-            attr = statistics_collector()(attr)
-            if "SAVE_TRANSACTIONS" in os.environ:
-                attr = save_transaction(saved_transactions)(attr)
-        return attr
+    def send_transaction(self, account, transaction, gas_multiplier=None, timeout=120) -> web3.types.TxReceipt:
+        if not lifecycle.enabled:
+            return super().send_transaction(account, transaction, gas_multiplier, timeout)
+        return lifecycle.send_tracked(self, account, transaction, timeout)
+
+    def send_tokens(self, from_, to, value, gas=None, gas_price=None, nonce=None) -> web3.types.TxReceipt:
+        if not lifecycle.enabled:
+            return super().send_tokens(from_, to, value, gas, gas_price, nonce)
+        transaction = self.make_raw_tx(
+            from_, to, amount=value, gas=gas, gas_price=gas_price, nonce=nonce, estimate_gas=True
+        )
+        return lifecycle.send_tracked(self, from_, transaction)
+
+
+instrument_class(
+    NeonWeb3ClientExt,
+    ignore=["create_account"],
+    decorators=[save_transaction(saved_transactions)] if saved_transactions is not None else [],
+)
 
 
 class NeonProxyTasksSet(TaskSet):
@@ -86,10 +80,15 @@ class NeonProxyTasksSet(TaskSet):
 
     def setup(self) -> None:
         """Prepare data requirements"""
-        # create new shared account for each simulating user
+        # take a spare shared account or create a new one and share it with all workers
+        self.account = registry.take()
+        if self.account is not None:
+            self.check_balance()
+            LOG.info(f"Shared account {self.account.address} taken")
+            return
         self.account = self.web3_client.create_account()
         self.check_balance()
-        self.user.environment.shared.accounts.append(self.account)
+        publish_account(self.user.environment, self.account)
         LOG.info(f"New account {self.account.address} created")
 
     def prepare_account(self) -> None:
@@ -102,13 +101,12 @@ class NeonProxyTasksSet(TaskSet):
     def on_start(self) -> None:
         """on_start is called when a Locust start before any task is scheduled"""
         # setup class once
-        session = init_session(
-            int(self.user.environment.parsed_options.num_users or self.user.environment.runner.target_user_count) * 100
-        )
+        session = init_session(get_users_count(self.user.environment))
         self.credentials = self.user.environment.credentials
         LOG.info(f"Create web3 client to: {self.credentials['proxy_url']}")
         self.web3_client = NeonWeb3ClientExt(
-            self.credentials["proxy_url"]
+            self.credentials["proxy_url"],
+            provider=make_provider(self.user.environment, self.credentials["proxy_url"]),
         )
         self.faucet = Faucet(
             self.credentials["faucet_url"], self.web3_client, session=session)
@@ -0,0 +1,219 @@
+"""Corpus of pre-signed transactions for max-rate replay.
+
+File layout: MAGIC, u32 header length, JSON header, then records of u8 kind, u16 length and a raw signed
+transaction. Records go round-robin over the senders in nonce order, so a sequential replay never leaves a sender
+with a nonce gap longer than the number of senders. Signing is done offline on a process pool.
+"""
+import dataclasses
+import json
+import logging
+import math
+import multiprocessing
+import pathlib
+import struct
+import typing as tp
+from multiprocessing.dummy import Pool as ThreadPool
+
+import eth_abi
+import web3
+from eth_account import Account
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b"NEONTXC1"
+KINDS = ("transfer", "erc20", "swap")
+DEFAULT_MIX = "transfer=1"
+
+GAS_MARGIN = 1.2
+TOKEN_SUPPLY = web3.Web3.to_wei(10_000_000, "ether")
+SWAP_AMOUNT = web3.Web3.to_wei(1, "gwei")
+MAX_UINT_256 = 2**256 - 1
+
+_HEADER_SIZE = struct.Struct("<I")
+_RECORD = struct.Struct("<BH")
+
+# signer state of a pool process, set once by _init_signer
+_signer: tp.Dict[str, tp.Any] = {}
+
+
+def encode_call(signature: str, types: tp.Sequence[str], args: tp.Sequence[tp.Any]) -> str:
+    selector = web3.Web3.keccak(text=signature)[:4]
+    return web3.Web3.to_hex(selector + eth_abi.encode(list(types), list(args)))
+
+
+def erc20_call(method: str, address: str, amount: int) -> str:
+    return encode_call(f"{method}(address,uint256)", ["address", "uint256"], [address, amount])
+
+
+def parse_mix(mix: str) -> tp.List[int]:
+    """Expand "transfer=8,erc20=1" into the repeating pattern of kind indexes"""
+    pattern = []
+    for item in filter(None, mix.split(",")):
+        kind, _, weight = item.partition("=")
+        pattern.extend([KINDS.index(kind.strip())] * int(weight or 1))
+    if not pattern:
+        raise ValueError(f"Empty transactions mix: {mix!r}")
+    return pattern
+
+
+def shard_path(path: tp.Union[str, pathlib.Path], index: int) -> pathlib.Path:
+    path = pathlib.Path(path)
+    return path.with_name(f"{path.stem}.{index}{path.suffix}")
+
+
+@dataclasses.dataclass
+class CorpusHeader:
+    chain_id: int
+    gas_price: int
+    mix: str
+    senders: tp.List[str]
+    start_nonces: tp.List[int]
+    per_sender: int
+
+    @property
+    def count(self) -> int:
+        return len(self.senders) * self.per_sender
+
+    def to_bytes(self) -> bytes:
+        payload = json.dumps(dataclasses.asdict(self)).encode()
+        return MAGIC + _HEADER_SIZE.pack(len(payload)) + payload
+
+    @classmethod
+    def read(cls, file: tp.BinaryIO) -> "CorpusHeader":
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file.name} is not a transactions corpus")
+        (size,) = _HEADER_SIZE.unpack(file.read(_HEADER_SIZE.size))
+        return cls(**json.loads(file.read(size)))
+
+
+def prepare_templates(
+    web3_client,
+    accounts: tp.Sequence,
+    mix: str,
+    per_sender: int,
+    uniswap: tp.Optional[tp.Dict] = None,
+    jobs: int = 8,
+) -> tp.Dict[int, tp.List[tp.Dict]]:
+    """Deploy and distribute what the mix needs, return per kind, per sender transaction fields without nonce"""
+    kinds = set(parse_mix(mix))
+    recipients = [accounts[(i + 1) % len(accounts)].address for i in range(len(accounts))]
+    templates = {}
+
+    def send(account, to, data):
+        tx = web3_client.make_raw_tx(account, to, data=data, estimate_gas=True)
+        web3_client.send_transaction(account, tx)
+
+    if KINDS.index("transfer") in kinds:
+        templates[KINDS.index("transfer")] = [{"to": r, "value": 1, "data": "0x"} for r in recipients]
+
+    if KINDS.index("erc20") in kinds:
+        owner = accounts[0]
+        token, _ = web3_client.deploy_and_get_contract(
+            "EIPs/ERC20/ERC20.sol", version="0.8.0", account=owner, constructor_args=["Corpus", "CRP", TOKEN_SUPPLY]
+        )
+        LOG.info(f"Corpus ERC20 token address: {token.address}")
+        # the owner sends all of them itself, the others need a share
+        share = TOKEN_SUPPLY // len(accounts)
+        for account in accounts[1:]:
+            send(owner, token.address, erc20_call("transfer", account.address, share))
+        templates[KINDS.index("erc20")] = [
+            {"to": token.address, "value": 0, "data": erc20_call("transfer", r, 1)} for r in recipients
+        ]
+
+    if KINDS.index("swap") in kinds:
+        if not uniswap:
+            raise ValueError("Swap transactions need Uniswap contracts, deploy them with the `uniswap` locust tag")
+        signer = web3_client.eth.account.from_key(uniswap["signer"])
+        router = uniswap["router"]
+        path = [uniswap["token_contracts"]["wNEON"], uniswap["token_contracts"]["USDC"]]
+
+        def prepare_swapper(account):
+            send(account, path[0], erc20_call("approve", router, MAX_UINT_256))
+
+        amount = SWAP_AMOUNT * per_sender
+        for account in accounts:
+            # one signer, so its nonces must go in order
+            send(signer, path[0], erc20_call("transfer", account.address, amount))
+        with ThreadPool(min(jobs, len(accounts))) as pool:
+            pool.map(prepare_swapper, accounts)
+        signature = "swapExactTokensForTokens(uint256,uint256,address[],address,uint256)"
+        types = ["uint256", "uint256", "address[]", "address", "uint256"]
+        templates[KINDS.index("swap")] = [
+            {
+                "to": router,
+                "value": 0,
+                "data": encode_call(signature, types, [SWAP_AMOUNT, 0, path, account.address, MAX_UINT_256]),
+            }
+            for account in accounts
+        ]
+
+    for kind, fields in templates.items():
+        sample = {"from": accounts[0].address, **fields[0]}
+        gas = math.ceil(web3_client.eth.estimate_gas(sample) * GAS_MARGIN)
+        LOG.info(f"Gas limit of {KINDS[kind]} transactions: {gas}")
+        for item in fields:
+            item["gas"] = gas
+    return templates
+
+
+def _init_signer(keys, templates, header: CorpusHeader) -> None:
+    _signer.update(
+        accounts=[Account.from_key(key) for key in keys],
+        templates=templates,
+        header=header,
+        pattern=parse_mix(header.mix),
+    )
+
+
+def _sign_block(offsets: tp.Tuple[int, int]) -> bytes:
+    """Sign the transactions of all senders for nonce offsets [start, stop) and serialize them as records"""
+    accounts, templates, header, pattern = (_signer[k] for k in ("accounts", "templates", "header", "pattern"))
+    records = bytearray()
+    for offset in range(*offsets):
+        for index, account in enumerate(accounts):
+            kind = pattern[(offset + index) % len(pattern)]
+            transaction = {
+                **templates[kind][index],
+                "nonce": header.start_nonces[index] + offset,
+                "chainId": header.chain_id,
+                "gasPrice": header.gas_price,
+            }
+            raw = account.sign_transaction(transaction).rawTransaction
+            records += _RECORD.pack(kind, len(raw))
+            records += raw
+    return bytes(records)
+
+
+def write_corpus(
+    path: tp.Union[str, pathlib.Path],
+    header: CorpusHeader,
+    keys: tp.Sequence[str],
+    templates: tp.Dict[int, tp.List[tp.Dict]],
+    processes: tp.Optional[int] = None,
+    block_size: int = 100,
+) -> None:
+    """Sign header.per_sender transactions of every sender on a process pool and stream them to path"""
+    blocks = [(start, min(start + block_size, header.per_sender)) for start in range(0, header.per_sender, block_size)]
+    written = 0
+    with open(path, "wb") as file, multiprocessing.Pool(
+        processes, initializer=_init_signer, initargs=(keys, templates, header)
+    ) as pool:
+        file.write(header.to_bytes())
+        # imap keeps the blocks order, so nonces of every sender stay sequential in the file
+        for records in pool.imap(_sign_block, blocks):
+            file.write(records)
+            written += 1
+            if written % 100 == 0 or written == len(blocks):
+                LOG.info(f"Signed {written}/{len(blocks)} blocks of {path}")
+
+
+def iter_corpus(path: tp.Union[str, pathlib.Path]) -> tp.Iterator[tp.Tuple[str, bytes]]:
+    """Stream (kind, raw transaction) records of the corpus"""
+    with open(path, "rb", buffering=1 << 20) as file:
+        CorpusHeader.read(file)
+        while True:
+            prefix = file.read(_RECORD.size)
+            if len(prefix) < _RECORD.size:
+                return
+            kind, size = _RECORD.unpack(prefix)
+            yield KINDS[kind], file.read(size)
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 
 from locust import events
 
+from .registry import prepare_shared_accounts, registry
+
 
 LOG = logging.getLogger(__name__)
 
@@ -33,6 +35,8 @@ def arg_parser(parser):
 @events.test_start.add_listener
 def make_env_preparation(environment, **kwargs):
     neon = NeonGlobalEnv()
+    # accounts are shared with the other workers
+    neon.accounts = registry.accounts
     environment.shared = neon
 
 
@@ -47,3 +51,9 @@ def load_credentials(environment, **kwargs):
     with open(path, "r") as fp:
         f = json.load(fp)
         environment.credentials = f[network]
+
+
+@events.test_start.add_listener
+def share_accounts(environment, **kwargs):
+    """Runs after load_credentials, the master needs them to fund the shared accounts"""
+    prepare_shared_accounts(environment)
@@ -0,0 +1,90 @@
+"""Low overhead instrumentation of client calls for locust statistics.
+
+Wrappers are built once per method (see `instrument_class`), a call costs two perf_counter reads and one
+`events.request.fire`. Only the outermost instrumented call of a greenlet is reported, so internal calls
+(e.g. `get_nonce` inside `send_neon`) don't inflate request counts.
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import time
+import typing as tp
+
+from locust import events
+
+LOG = logging.getLogger(__name__)
+
+_perf_counter = time.perf_counter
+_request_event = events.request
+
+# gevent keeps a separate context for every greenlet, the value is the request type of the outermost call
+_inside_call = contextvars.ContextVar("inside_instrumented_call", default="")
+
+
+def request_type_for(method_name: str) -> str:
+    return method_name.replace("_", " ").title()
+
+
+def current_request_type() -> str:
+    """Request type of the instrumented call in progress in this greenlet, empty outside of them"""
+    return _inside_call.get()
+
+
+def fire_request(
+    request_type: str,
+    name: str,
+    started: float,
+    response: tp.Any = None,
+    exception: tp.Optional[Exception] = None,
+    response_length: int = 0,
+) -> None:
+    _request_event.fire(
+        request_type=request_type,
+        name=name,
+        response_time=(_perf_counter() - started) * 1000,
+        response_length=response_length,
+        response=response,
+        exception=exception,
+        context={},
+    )
+
+
+def instrument(func: tp.Callable, request_type: str, name: str = "") -> tp.Callable:
+    """Report every outermost call of func to locust as a request"""
+
+    @functools.wraps(func)
+    def wrap(*args, **kwargs) -> tp.Any:
+        if _inside_call.get():
+            return func(*args, **kwargs)
+        token = _inside_call.set(request_type)
+        started = _perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        except Exception as err:
+            fire_request(request_type, name, started, exception=err)
+            LOG.error(f"Call {request_type} is failed: {err} passed args: `{args}`, passed kwargs: `{kwargs}`")
+            raise
+        finally:
+            _inside_call.reset(token)
+        fire_request(request_type, name, started, response=response)
+        return response
+
+    return wrap
+
+
+def instrument_class(
+    cls: type,
+    ignore: tp.Iterable[str] = (),
+    decorators: tp.Sequence[tp.Callable[[tp.Callable], tp.Callable]] = (),
+) -> type:
+    """Replace public methods of cls (and its bases) by instrumented ones once, at class creation"""
+    ignore = set(ignore)
+    for klass in reversed(cls.__mro__[:-1]):
+        for method_name, attr in list(vars(klass).items()):
+            if method_name.startswith("_") or method_name in ignore or not inspect.isfunction(attr):
+                continue
+            for decorator in decorators:
+                attr = decorator(attr)
+            setattr(cls, method_name, instrument(attr, request_type_for(method_name)))
+    return cls
@@ -0,0 +1,208 @@
+"""Transaction lifecycle phases recorded into HDR histograms per task type.
+
+With `--lifecycle` every transaction sent by `NeonWeb3ClientExt` is timestamped when it is signed, accepted by
+eth_sendRawTransaction, first seen by eth_getTransactionByHash, has a receipt and its block is finalized.
+Phase durations go to histograms keyed by (task, phase). Workers send them to the master with every stats report
+and the master merges them, so percentiles are exact for the whole run. The table is logged and saved to
+`--lifecycle-csv` when the test stops.
+"""
+import csv
+import logging
+import time
+import typing as tp
+
+import gevent
+import tabulate
+from hdrh.histogram import HdrHistogram
+from locust import events
+from locust.runners import LocalRunner, MasterRunner, WorkerRunner
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from .instrumentation import current_request_type
+
+LOG = logging.getLogger(__name__)
+
+PHASES = ("sign", "accept", "pending", "execution", "finalization", "total")
+PERCENTILES = (50, 90, 99, 99.9)
+POLL_INTERVAL = 0.1
+FINALIZED_POLL_INTERVAL = 0.5
+# values are microseconds from 1us to 1 hour with 3 significant digits
+MAX_VALUE_US = 3600 * 1_000_000
+SIGNIFICANT_DIGITS = 3
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--lifecycle",
+        default=False,
+        action="store_true",
+        help="Record sign/accept/pending/execution/finalization phases of transactions, adds RPC polling",
+    )
+    parser.add_argument(
+        "--lifecycle-csv",
+        type=str,
+        default="lifecycle.csv",
+        help="File for the percentiles of transaction phases",
+    )
+
+
+class PhaseHistograms:
+    def __init__(self) -> None:
+        self.histograms: tp.Dict[tp.Tuple[str, str], HdrHistogram] = {}
+
+    def _get(self, task: str, phase: str) -> HdrHistogram:
+        key = (task, phase)
+        if key not in self.histograms:
+            self.histograms[key] = HdrHistogram(1, MAX_VALUE_US, SIGNIFICANT_DIGITS)
+        return self.histograms[key]
+
+    def record(self, task: str, phase: str, seconds: float) -> None:
+        self._get(task, phase).record_value(min(max(int(seconds * 1_000_000), 1), MAX_VALUE_US))
+
+    def encode(self) -> tp.Dict[str, str]:
+        return {f"{task}\t{phase}": h.encode().decode() for (task, phase), h in self.histograms.items()}
+
+    def merge(self, encoded: tp.Dict[str, str]) -> None:
+        for key, value in encoded.items():
+            self._get(*key.split("\t")).decode_and_add(value)
+
+    def clear(self) -> None:
+        self.histograms.clear()
+
+    def rows(self) -> tp.List[tp.List]:
+        rows = []
+        for task, phase in sorted(self.histograms, key=lambda k: (k[0], PHASES.index(k[1]))):
+            h = self.histograms[(task, phase)]
+            percentiles = [h.get_value_at_percentile(p) / 1000 for p in PERCENTILES]
+            rows.append([task, phase, h.get_total_count(), *percentiles, h.get_max_value() / 1000])
+        return rows
+
+    def headers(self) -> tp.List[str]:
+        return ["Task", "Phase", "Count", *(f"p{p} ms" for p in PERCENTILES), "Max ms"]
+
+
+class FinalizationWatcher:
+    """One greenlet per process follows the finalized block and completes the waiting transactions"""
+
+    def __init__(self, histograms: PhaseHistograms) -> None:
+        self.histograms = histograms
+        self.waiting: tp.List[tp.Tuple[int, str, float]] = []
+        self.greenlet: tp.Optional[gevent.Greenlet] = None
+
+    def add(self, web3_client, block_number: int, task: str, receipt_at: float) -> None:
+        self.waiting.append((block_number, task, receipt_at))
+        if self.greenlet is None:
+            self.greenlet = gevent.spawn(self._run, web3_client)
+
+    def _run(self, web3_client) -> None:
+        while True:
+            try:
+                finalized = web3_client.eth.get_block("finalized")["number"]
+            except Exception as e:
+                LOG.warning(f"Finalization phase is not recorded, can't get the finalized block: {e}")
+                self.waiting.clear()
+                return
+            now = time.perf_counter()
+            waiting = []
+            for block_number, task, receipt_at in self.waiting:
+                if block_number <= finalized:
+                    self.histograms.record(task, "finalization", now - receipt_at)
+                else:
+                    waiting.append((block_number, task, receipt_at))
+            self.waiting = waiting
+            gevent.sleep(FINALIZED_POLL_INTERVAL)
+
+    def stop(self) -> None:
+        if self.greenlet is not None:
+            self.greenlet.kill(block=False)
+            self.greenlet = None
+        self.waiting.clear()
+
+
+histograms = PhaseHistograms()
+finalization = FinalizationWatcher(histograms)
+enabled = False
+
+
+def send_tracked(
+    web3_client,
+    account: "eth_account.signers.local.LocalAccount",
+    transaction: tp.Dict,
+    timeout: int = 120,
+) -> "web3.types.TxReceipt":
+    """Sign, send and wait for the receipt like Web3Client.send_transaction, recording every phase"""
+    task = current_request_type() or "Transaction"
+    started = time.perf_counter()
+    signed_tx = web3_client.eth.account.sign_transaction(transaction, account.key)
+    signed_at = time.perf_counter()
+    tx_hash = web3_client.eth.send_raw_transaction(signed_tx.rawTransaction)
+    accepted_at = time.perf_counter()
+    seen_at = None
+    while True:
+        try:
+            if seen_at is None:
+                web3_client.eth.get_transaction(tx_hash)
+                seen_at = time.perf_counter()
+            receipt = web3_client.eth.get_transaction_receipt(tx_hash)
+            break
+        except TransactionNotFound:
+            if time.perf_counter() - started > timeout:
+                raise TimeExhausted(f"Transaction {tx_hash.hex()} is not in the chain after {timeout} seconds")
+            gevent.sleep(POLL_INTERVAL)
+    receipt_at = time.perf_counter()
+
+    histograms.record(task, "sign", signed_at - started)
+    histograms.record(task, "accept", accepted_at - signed_at)
+    histograms.record(task, "pending", seen_at - accepted_at)
+    histograms.record(task, "execution", receipt_at - seen_at)
+    histograms.record(task, "total", receipt_at - started)
+    finalization.add(web3_client, receipt["blockNumber"], task, receipt_at)
+    return receipt
+
+
+@events.test_start.add_listener
+def enable_tracking(environment, **kwargs):
+    global enabled
+    enabled = environment.parsed_options.lifecycle
+    histograms.clear()
+
+
+@events.report_to_master.add_listener
+def send_histograms(client_id, data, **kwargs):
+    if histograms.histograms:
+        data["lifecycle"] = histograms.encode()
+        histograms.clear()
+
+
+@events.worker_report.add_listener
+def merge_histograms(client_id, data, **kwargs):
+    histograms.merge(data.get("lifecycle", {}))
+
+
+def export(environment) -> None:
+    finalization.stop()
+    if not histograms.histograms:
+        return
+    rows = histograms.rows()
+    table = tabulate.tabulate(rows, headers=histograms.headers(), tablefmt="fancy_outline", floatfmt=".2f")
+    LOG.info(f"\n{10 * '_'} Transaction lifecycle phases {10 * '_'}\n{table}\n")
+    with open(environment.parsed_options.lifecycle_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(histograms.headers())
+        writer.writerows(rows)
+
+
+@events.test_stop.add_listener
+def export_local(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner):
+        finalization.stop()
+    elif isinstance(environment.runner, LocalRunner):
+        export(environment)
+
+
+@events.quitting.add_listener
+def export_distributed(environment, **kwargs):
+    # the master stops before the last reports of workers arrive
+    if isinstance(environment.runner, MasterRunner):
+        export(environment)
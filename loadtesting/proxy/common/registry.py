@@ -0,0 +1,117 @@
+"""Accounts registry shared by all workers of a distributed run.
+
+With `--shared-accounts N` the master (or the only process of a local run) creates and funds N accounts once and
+sends every worker its shard of them as spare accounts for its users, together with the whole list as recipients.
+Accounts created later by a worker are published through the master to the other workers, so transfers target
+accounts of all workers and scaling out doesn't multiply the setup cost.
+"""
+import logging
+import typing as tp
+
+import gevent
+from eth_account import Account
+from gevent.pool import Pool
+from locust import events
+from locust.runners import MasterRunner, WorkerRunner
+
+from utils.faucet import Faucet
+from utils.web3client import NeonChainWeb3Client
+
+LOG = logging.getLogger(__name__)
+
+ACCOUNTS_MESSAGE = "neon_accounts"
+ACCOUNT_ADDED_MESSAGE = "neon_account_added"
+FUND_CONCURRENCY = 16
+FUND_AMOUNT = 1000
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--shared-accounts",
+        type=int,
+        default=0,
+        help="Number of accounts created once for all workers and split between them, 0 - every user makes its own",
+    )
+
+
+class AccountsRegistry:
+    """Accounts known to this process: all of them are recipients, spare ones are given to new users"""
+
+    def __init__(self) -> None:
+        self.accounts: tp.List["eth_account.signers.local.LocalAccount"] = []
+        self.spare: tp.List["eth_account.signers.local.LocalAccount"] = []
+        self._addresses: tp.Set[str] = set()
+
+    def add(self, keys: tp.Iterable[str], spare: bool = False) -> None:
+        for key in keys:
+            account = Account.from_key(key)
+            if spare:
+                self.spare.append(account)
+            if account.address not in self._addresses:
+                self._addresses.add(account.address)
+                self.accounts.append(account)
+
+    def take(self) -> tp.Optional["eth_account.signers.local.LocalAccount"]:
+        return self.spare.pop() if self.spare else None
+
+
+# one per process, NeonGlobalEnv.accounts refers to its list
+registry = AccountsRegistry()
+
+
+def _on_accounts(environment, msg, **kwargs) -> None:
+    registry.add(msg.data.get("spare", []), spare=True)
+    registry.add(msg.data["keys"])
+    LOG.info(f"Registry has {len(registry.accounts)} accounts, {len(registry.spare)} of them are spare")
+
+
+def _relay_account(environment, msg, **kwargs) -> None:
+    registry.add(msg.data["keys"])
+    environment.runner.send_message(ACCOUNTS_MESSAGE, {"keys": msg.data["keys"]})
+
+
+@events.init.add_listener
+def register_messages(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner):
+        environment.runner.register_message(ACCOUNTS_MESSAGE, _on_accounts)
+    elif isinstance(environment.runner, MasterRunner):
+        environment.runner.register_message(ACCOUNT_ADDED_MESSAGE, _relay_account)
+
+
+def publish_account(environment, account: "eth_account.signers.local.LocalAccount") -> None:
+    """Add the account to the registry of this process and of all workers"""
+    key = account.key.hex()
+    registry.add([key])
+    if isinstance(environment.runner, WorkerRunner):
+        environment.runner.send_message(ACCOUNT_ADDED_MESSAGE, {"keys": [key]})
+
+
+def create_funded_accounts(environment, count: int) -> tp.List[str]:
+    web3_client = NeonChainWeb3Client(environment.credentials["proxy_url"])
+    faucet = Faucet(environment.credentials["faucet_url"], web3_client)
+    accounts = [web3_client.create_account() for _ in range(count)]
+    pool = Pool(FUND_CONCURRENCY)
+    gevent.joinall(
+        [pool.spawn(faucet.request_neon, account.address, FUND_AMOUNT) for account in accounts], raise_error=True
+    )
+    return [account.key.hex() for account in accounts]
+
+
+def prepare_shared_accounts(environment) -> None:
+    """Create the shared accounts once and send every worker its shard, workers only receive them"""
+    count = environment.parsed_options.shared_accounts
+    if isinstance(environment.runner, WorkerRunner) or not count or registry.accounts:
+        return
+    LOG.info(f"Create {count} shared accounts")
+    keys = create_funded_accounts(environment, count)
+    registry.add(keys)
+    if not isinstance(environment.runner, MasterRunner):
+        registry.add(keys, spare=True)
+        return
+    clients = list(environment.runner.clients.all)
+    for index, client in enumerate(clients):
+        shard = keys[index :: len(clients)]
+        # sent before the spawn message, so workers have their accounts before users start
+        environment.runner.send_message(ACCOUNTS_MESSAGE, {"keys": keys, "spare": shard}, client_id=client.id)
+    LOG.info(f"Shared accounts are split between {len(clients)} workers")
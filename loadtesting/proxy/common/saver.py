@@ -0,0 +1,105 @@
+"""Background capture of SAVE_TRANSACTIONS data with constant memory.
+
+Hashes go to a bounded queue, a greenlet resolves their Solana transactions with batched
+neon_getSolanaTransactionByNeonTransaction calls while the test runs and appends them to a JSONL file.
+If the resolver falls behind and the queue is full, hashes are written unresolved instead of being kept in memory.
+"""
+import json
+import logging
+import os
+import typing as tp
+
+import gevent
+from gevent.queue import Empty, Full, Queue
+
+from utils.apiclient import JsonRPCSession
+
+LOG = logging.getLogger(__name__)
+
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 1
+DRAIN_TIMEOUT = 30
+
+
+class TransactionSaver:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.queue: Queue = Queue(QUEUE_SIZE)
+        self.saved = 0
+        self.spilled = 0
+        # batch taken from the queue and not written yet
+        self._batch: tp.List[str] = []
+        self._file: tp.Optional[tp.TextIO] = None
+        self._greenlet: tp.Optional[gevent.Greenlet] = None
+        self.rpc_client: tp.Optional[JsonRPCSession] = None
+
+    def start(self, proxy_url: str) -> None:
+        self.rpc_client = JsonRPCSession(proxy_url)
+        self._greenlet = gevent.spawn(self._run)
+
+    def append(self, tx_hash: str) -> None:
+        """Same interface as the list it replaces, see events.save_transaction"""
+        try:
+            self.queue.put_nowait(tx_hash)
+        except Full:
+            self.spilled += 1
+            self._write([{"neon": tx_hash, "solana": None}])
+
+    def _write(self, rows: tp.List[tp.Dict]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.writelines(json.dumps(row) + "\n" for row in rows)
+        self._file.flush()
+
+    def _fill_batch(self) -> None:
+        self._batch.append(self.queue.get())
+        try:
+            while len(self._batch) < BATCH_SIZE:
+                self._batch.append(self.queue.get(timeout=FLUSH_INTERVAL))
+        except Empty:
+            pass
+
+    def _resolve(self, batch: tp.List[str]) -> None:
+        try:
+            responses = self.rpc_client.send_batch_rpc(
+                [("neon_getSolanaTransactionByNeonTransaction", [tx_hash]) for tx_hash in batch]
+            )
+        except Exception as e:
+            LOG.warning(f"Can't get solana transactions of {len(batch)} transactions: {e}")
+            responses = [{"error": str(e)}] * len(batch)
+        rows = []
+        for tx_hash, response in zip(batch, responses):
+            if "result" not in response:
+                LOG.info(f"Can't get solana trx from tx {tx_hash}: {response}")
+            rows.append({"neon": tx_hash, "solana": response.get("result")})
+        self._write(rows)
+        self.saved += len(rows)
+
+    def _run(self) -> None:
+        while True:
+            self._fill_batch()
+            self._resolve(self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        """Resolve what is left in the queue, spill the rest if it takes too long"""
+        if self._greenlet is None:
+            return
+        self._greenlet.kill()
+        with gevent.Timeout(DRAIN_TIMEOUT, False):
+            while self._batch or not self.queue.empty():
+                self._batch = self._batch or [self.queue.get() for _ in range(min(BATCH_SIZE, self.queue.qsize()))]
+                self._resolve(self._batch)
+                self._batch = []
+        rest = self._batch + [self.queue.get() for _ in range(self.queue.qsize())]
+        self.spilled += len(rest)
+        self._write([{"neon": tx_hash, "solana": None} for tx_hash in rest])
+        self._file.close()
+        self._file = None
+        self._greenlet = None
+        LOG.info(f"Saved {self.saved} resolved and {self.spilled} unresolved transactions to {self.path}")
+
+
+def default_path() -> str:
+    return f"transactions-{os.getpid()}.jsonl"
@@ -0,0 +1,71 @@
+import logging
+import typing as tp
+
+import web3
+from geventhttpclient import HTTPClient, URL
+from locust import events
+from web3.exceptions import Web3Exception
+from web3.types import RPCEndpoint, RPCResponse
+
+LOG = logging.getLogger(__name__)
+
+# One pool of keep-alive connections per host is shared by all users of the worker
+_clients: tp.Dict[tp.Tuple[str, int], HTTPClient] = {}
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--web3-transport",
+        type=str,
+        choices=["gevent", "requests"],
+        default="gevent",
+        include_in_web_ui=False,
+        help="HTTP transport used by web3 clients: gevent-native connection pool or requests",
+    )
+
+
+def get_http_client(url: URL, concurrency: int, timeout: float) -> HTTPClient:
+    key = (url.host, url.port)
+    if key not in _clients:
+        LOG.info(f"Create HTTP connection pool to {url.host}:{url.port} with {concurrency} connections")
+        _clients[key] = HTTPClient.from_url(
+            url,
+            concurrency=concurrency,
+            connection_timeout=timeout,
+            network_timeout=timeout,
+            headers={"Content-Type": "application/json"},
+        )
+    return _clients[key]
+
+
+class GeventHTTPProvider(web3.providers.JSONBaseProvider):
+    """JSON-RPC provider which sends requests through a pooled gevent-native HTTP client"""
+
+    def __init__(self, endpoint_uri: str, concurrency: int = 10, timeout: float = 30):
+        super().__init__()
+        self.endpoint_uri = endpoint_uri
+        self._url = URL(endpoint_uri)
+        self._client = get_http_client(self._url, concurrency, timeout)
+
+    def make_request(self, method: RPCEndpoint, params: tp.Any) -> RPCResponse:
+        response = self._client.post(self._url.request_uri, body=self.encode_rpc_request(method, params))
+        # the body has to be read completely to return the connection to the pool
+        body = response.read()
+        if response.status_code >= 400:
+            raise Web3Exception(f"HTTP {response.status_code} from {self.endpoint_uri}: {body}")
+        return self.decode_rpc_response(body)
+
+    def __str__(self) -> str:
+        return f"GeventHTTP connection {self.endpoint_uri}"
+
+
+def make_provider(environment: "locust.env.Environment", endpoint_uri: str) -> tp.Optional[GeventHTTPProvider]:
+    """Return a provider selected by --web3-transport, None means the default HTTPProvider"""
+    if environment.parsed_options.web3_transport != "gevent":
+        return None
+    return GeventHTTPProvider(endpoint_uri, concurrency=get_users_count(environment))
+
+
+def get_users_count(environment: "locust.env.Environment") -> int:
+    return max(int(environment.parsed_options.num_users or environment.runner.target_user_count or 1), 1)
@@ -0,0 +1,96 @@
+import itertools
+import logging
+import random
+import time
+
+import web3
+from locust import tag, task, User, events
+
+from loadtesting.proxy.common.arrival import RateSchedule, run_arrivals
+from loadtesting.proxy.common.base import NeonProxyTasksSet
+from loadtesting.proxy.common.instrumentation import fire_request
+
+LOG = logging.getLogger(__name__)
+
+# gas price is requested at most once in this period (seconds)
+GAS_PRICE_TTL = 10
+TRANSFER_GAS = 30_000
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--arrival-accounts",
+        type=int,
+        default=10,
+        help="Number of sender accounts per user, transactions are sent from them in turn",
+    )
+
+
+@tag("arrival_rate")
+class ArrivalRateTasksSet(NeonProxyTasksSet):
+    """Sends neon transfers at a fixed rate independent of the receipts latency"""
+
+    def on_start(self) -> None:
+        super().on_start()
+        self.setup()
+        self.log = logging.getLogger("arrival-consumer[%s]" % self.account.address[-8:])
+        self.accounts = [self.account]
+        for _ in range(self.user.environment.parsed_options.arrival_accounts - 1):
+            self.prepare_account()
+            self.accounts.append(self.account)
+        self.nonces = {account.address: self.web3_client.get_nonce(account) for account in self.accounts}
+        self.senders = itertools.cycle(self.accounts)
+        self.chain_id = self.web3_client.chain_id
+        self.gas_price = self.web3_client.gas_price()
+        self.gas_price_updated = time.monotonic()
+
+    def get_gas_price(self) -> int:
+        if time.monotonic() - self.gas_price_updated > GAS_PRICE_TTL:
+            self.gas_price_updated = time.monotonic()
+            self.gas_price = self.web3_client.gas_price()
+        return self.gas_price
+
+    def send_transfer(self) -> None:
+        """Sign and send one transfer, then wait for its receipt"""
+        sender = next(self.senders)
+        recipient = random.choice(self.user.environment.shared.accounts)
+        # nonce is reserved before any switch to another greenlet
+        nonce = self.nonces[sender.address]
+        self.nonces[sender.address] += 1
+        transaction = {
+            "from": sender.address,
+            "to": recipient.address,
+            "value": web3.Web3.to_wei(1, "gwei"),
+            "nonce": nonce,
+            "chainId": self.chain_id,
+            "gasPrice": self.get_gas_price(),
+            "gas": TRANSFER_GAS,
+        }
+        signed_tx = self.web3_client.eth.account.sign_transaction(transaction, sender.key)
+
+        started = time.perf_counter()
+        try:
+            tx_hash = self.web3_client.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except Exception as e:
+            fire_request("Arrival Send", "", started, exception=e)
+            self.nonces[sender.address] = self.web3_client.get_nonce(sender)
+            raise
+        fire_request("Arrival Send", "", started)
+        try:
+            receipt = self.web3_client.eth.wait_for_transaction_receipt(tx_hash)
+        except Exception as e:
+            fire_request("Arrival Receipt", "", started, exception=e)
+            raise
+        fire_request("Arrival Receipt", "", started, response=receipt)
+
+    @task
+    def task_send_at_arrival_rate(self) -> None:
+        options = self.user.environment.parsed_options
+        schedule = RateSchedule.per_user(self.user.environment)
+        self.log.info(f"Start open-model load with schedule {schedule.steps}")
+        run_arrivals(schedule, self.send_transfer, options.max_in_flight)
+
+
+class ArrivalRateUser(User):
+    tasks = {ArrivalRateTasksSet: 1}
@@ -0,0 +1,83 @@
+import logging
+import pathlib
+import time
+import typing as tp
+
+from gevent.pool import Pool
+from locust import tag, task, User, events
+from locust.exception import StopUser
+
+from utils.web3client import NeonChainWeb3Client
+
+from loadtesting.proxy.common import env  # noqa: F401 loads environment.credentials
+from loadtesting.proxy.common.corpus import iter_corpus, shard_path
+from loadtesting.proxy.common.instrumentation import fire_request
+from loadtesting.proxy.common.transport import GeventHTTPProvider
+
+LOG = logging.getLogger(__name__)
+
+# one stream per worker process, its users take transactions from it in turn
+_streams: tp.Dict[pathlib.Path, tp.Iterator[tp.Tuple[str, bytes]]] = {}
+
+
+@events.init_command_line_parser.add_listener
+def arg_parser(parser):
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default="corpus.bin",
+        help="Pre-signed transactions file made by `clickfile.py locust corpus`, "
+        "workers use their own shard <name>.<worker index>.bin if it exists",
+    )
+    parser.add_argument(
+        "--replay-concurrency",
+        type=int,
+        default=100,
+        help="Number of transactions sent at the same time by one user",
+    )
+
+
+def get_stream(environment: "locust.env.Environment") -> tp.Iterator[tp.Tuple[str, bytes]]:
+    path = pathlib.Path(environment.parsed_options.corpus)
+    shard = shard_path(path, getattr(environment.runner, "worker_index", 0))
+    if shard.exists():
+        path = shard
+    if path not in _streams:
+        LOG.info(f"Replay transactions from {path}")
+        _streams[path] = iter_corpus(path)
+    return _streams[path]
+
+
+@tag("replay")
+class ReplayUser(User):
+    """Sends the corpus through send_raw_transaction as fast as the proxy accepts it, receipts aren't awaited"""
+
+    def on_start(self) -> None:
+        options = self.environment.parsed_options
+        proxy_url = self.environment.credentials["proxy_url"]
+        provider = None
+        if options.web3_transport == "gevent":
+            provider = GeventHTTPProvider(proxy_url, concurrency=options.replay_concurrency)
+        self.web3_client = NeonChainWeb3Client(proxy_url, provider=provider)
+        self.stream = get_stream(self.environment)
+
+    def send_next(self) -> None:
+        # reading the file doesn't switch greenlets, so the shared stream is never entered twice
+        for kind, raw in self.stream:
+            started = time.perf_counter()
+            try:
+                self.web3_client.eth.send_raw_transaction(raw)
+            except Exception as e:
+                fire_request("Replay Send", kind, started, exception=e)
+                continue
+            fire_request("Replay Send", kind, started, response_length=len(raw))
+
+    @task
+    def task_replay(self) -> None:
+        concurrency = self.environment.parsed_options.replay_concurrency
+        pool = Pool(concurrency)
+        for _ in range(concurrency):
+            pool.spawn(self.send_next)
+        pool.join()
+        LOG.info("All transactions of the corpus are sent")
+        raise StopUser()
@@ -0,0 +1,93 @@
+"""Transaction history of tracer API load tests in an indexed SQLite file.
+
+The preparation stage appends every transaction as soon as it is done, so the history isn't kept in memory and
+isn't lost if the stage is interrupted. Each RPC type has its own table whose rowids go 1..N, so a random
+transaction is one primary key lookup and memory stays constant however long the history is. The file is
+memory-mapped by SQLite and opened by every locust process separately.
+"""
+import json
+import logging
+import pathlib
+import random
+import sqlite3
+import typing as tp
+
+LOG = logging.getLogger(__name__)
+
+MMAP_SIZE = 1 << 30
+
+
+class TransactionHistory:
+    def __init__(self, path: tp.Union[str, pathlib.Path]) -> None:
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        # the history doesn't change while it is sampled, counts are read once
+        self._counts: tp.Dict[str, int] = {}
+
+    @staticmethod
+    def _table(rpc_type: str) -> str:
+        if not rpc_type.isidentifier():
+            raise ValueError(f"Wrong RPC type {rpc_type!r}")
+        return f"history_{rpc_type}"
+
+    def append(self, rpc_type: str, sender: str, record: tp.Dict) -> None:
+        table = self._table(rpc_type)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, sender TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        self._connection.execute(f"INSERT INTO {table} (sender, data) VALUES (?, ?)", (sender, json.dumps(record)))
+
+    def count(self, rpc_type: str) -> int:
+        if rpc_type not in self._counts:
+            try:
+                (self._counts[rpc_type],) = self._connection.execute(
+                    f"SELECT COALESCE(MAX(id), 0) FROM {self._table(rpc_type)}"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                self._counts[rpc_type] = 0
+        return self._counts[rpc_type]
+
+    def random(self, rpc_type: str) -> tp.Dict:
+        """Return a random transaction of the RPC type with its sender in `from`"""
+        count = self.count(rpc_type)
+        if not count:
+            raise LookupError(f"No `{rpc_type}` transactions in {self.path}")
+        sender, data = self._connection.execute(
+            f"SELECT sender, data FROM {self._table(rpc_type)} WHERE id = ?", (random.randint(1, count),)
+        ).fetchone()
+        return {**json.loads(data), "from": sender}
+
+    def __len__(self) -> int:
+        tables = self._connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'history_%'"
+        ).fetchall()
+        return sum(self.count(name[len("history_") :]) for (name,) in tables)
+
+    def import_json(self, path: tp.Union[str, pathlib.Path]) -> None:
+        """Convert the history dumped as {rpc_type: {sender: [transactions]}} by older preparation stages"""
+        with open(path, "r") as fp:
+            history = json.load(fp)
+        self._connection.execute("BEGIN")
+        for rpc_type, senders in history.items():
+            for sender, transactions in senders.items():
+                for transaction in transactions:
+                    self.append(rpc_type, sender, transaction)
+        self._connection.execute("COMMIT")
+        self._counts.clear()
+        LOG.info(f"Transaction history {path} is imported to {self.path}")
+
+    def clear(self) -> None:
+        """Drop transactions of all RPC types"""
+        tables = self._connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'history_%'"
+        ).fetchall()
+        for (name,) in tables:
+            self._connection.execute(f"DROP TABLE {name}")
+        self._counts.clear()
+
+    def close(self) -> None:
+        self._connection.close()
@@ -1,15 +1,12 @@
 import enum
 import functools
-import json
 import logging
 import math
 import os
 import pathlib
-import random
 import sys
 import time
 import typing as tp
-import uuid
 from dataclasses import dataclass
 
 import gevent
@@ -18,13 +15,17 @@ import web3
 from locust import User, TaskSet, task, events, tag
 
 from loadtesting.proxy.common import env
+from loadtesting.proxy.common.instrumentation import fire_request
+from loadtesting.tracerapi.history import TransactionHistory
 from utils import apiclient
 from utils.web3client import NeonChainWeb3Client
 
 LOG = logging.getLogger("neon_client")
 
 # where save dumped data
-DUMPED_DATA = "dumped_data/transaction.json"
+DUMPED_DATA = "dumped_data/transactions.db"
+# history dumped by older preparation stages, it is imported once
+LEGACY_DUMPED_DATA = "dumped_data/transaction.json"
 
 # url for history endpoint proxy
 NEON_RPC = os.environ.get("NEON_TRACING_URL", "")
@@ -46,7 +47,7 @@ class RPCType(enum.Enum):
 @dataclass
 class GlobalEnv:
     rpc_url: str = ""
-    transaction_history: tp.Dict = None
+    transaction_history: tp.Optional[TransactionHistory] = None
 
 
 @events.test_start.add_listener
@@ -57,90 +58,39 @@ def make_env_preparation(environment, **kwargs):
 
 @events.test_start.add_listener
 def load_transaction_history(environment, **kwargs):
-    # load transaction history
+    # open transaction history, only sampled rows are read from the file
     path = pathlib.Path(__file__).parent / DUMPED_DATA
+    legacy_path = pathlib.Path(__file__).parent / LEGACY_DUMPED_DATA
+    if not path.exists() and legacy_path.exists():
+        TransactionHistory(path).import_json(legacy_path)
     if path.exists():
-        with open(path, "r") as fp:
-            environment.shared.transaction_history = json.load(fp)
+        environment.shared.transaction_history = TransactionHistory(path)
 
 
-class LocustEventHandler(object):
-    """Implements custom Locust events handler"""
-
-    def __init__(self, request_event: "EventHook") -> None:
-        self.buffer: tp.Dict[str, tp.Any] = dict()
-        self._request_event = request_event
-
-    def init_event(
-        self,
-        task_id: str,
-        request_type: str,
-        task_name: tp.Optional[str] = "",
-        start_time: tp.Optional[float] = None,
-    ) -> None:
-        """Added data to buffer"""
-        params = dict(
-            name=task_name,
-            start_time=start_time or time.time(),
-            request_type=request_type,
-            start_perf_counter=time.perf_counter(),
-        )
-        self.buffer[task_id] = params
-        LOG.debug("- buffer - %s" % self.buffer)
-
-    def fire_event(self, task_id: str, **kwargs) -> None:
-        """Sends event to locust ."""
-        event = self.buffer.pop(task_id)
-        total_time = (time.perf_counter() - event["start_perf_counter"]) * 1000
-        request_meta = dict(
-            name=event["name"],
-            request_type=event["request_type"],
-            response=event.get("response"),
-            response_time=total_time,
-            response_length=event.get("response_length", 0),
-            exception=event.get("exception"),
-            context={},
-        )
-        self._request_event.fire(**request_meta)
-        LOG.debug(
-            "- %s : %s - %sms"
-            % (event["request_type"], event["event_type"], total_time)
-        )
-
-
-locust_events_handler = LocustEventHandler(events.request)
+# locust request type for every RPC method, e.g. `getBalance`
+REQUEST_TYPES = {method: f"`{method.rsplit('_')[1]}`" for rpc_type in RPCType for method in rpc_type.value}
 
 
 def statistics_collector(func: tp.Callable) -> tp.Callable:
     """Handle locust events."""
 
     @functools.wraps(func)
-    def wrap(*args, **kwargs) -> tp.Any:
-        task_id = str(uuid.uuid4())
-        request_type = f"`{args[1].rsplit('_')[1]}`"
-        event: tp.Dict[str, tp.Any] = dict(
-            task_id=task_id,
-            request_type=request_type,
-            task_name=f"[{kwargs.pop('req_type')}]",
-        )
-        locust_events_handler.init_event(**event)
+    def wrap(self, method: str, *args, **kwargs) -> tp.Any:
+        request_type = REQUEST_TYPES[method]
+        task_name = f"[{kwargs.pop('req_type')}]"
+        started = time.perf_counter()
         response = None
         try:
-            response = func(*args, **kwargs)
+            response = func(self, method, *args, **kwargs)
             if "error" in response:
                 raise web3.exceptions.ValidationError(response["error"])
-            event = dict(
-                response=response,
-                response_length=sys.getsizeof(response),
-                event_type="success",
-            )
         except Exception as err:
-            event = dict(event_type="failure", exception=err)
+            fire_request(request_type, task_name, started, exception=err)
             LOG.error(
                 f"Web3 RPC call {request_type} is failed: {err} passed args: `{args}`, passed kwargs: `{kwargs}`"
             )
-        locust_events_handler.buffer[task_id].update(event)
-        locust_events_handler.fire_event(task_id)
+            return response
+        fire_request(request_type, task_name, started, response=response)
         return response
 
     return wrap
@@ -180,7 +130,7 @@ class BaseEthRPCATasksSet(TaskSet):
     """
 
     _rpc_client: tp.Optional[ExtJsonRPCSession] = None
-    _transaction_history: tp.Optional[tp.Dict] = None
+    _transaction_history: tp.Optional[TransactionHistory] = None
     credentials: tp.Optional[tp.Dict] = None
 
     @staticmethod
@@ -223,11 +173,7 @@ class BaseEthRPCATasksSet(TaskSet):
 
     def _get_random_transaction(self, key: str) -> tp.Dict:
         """Return random transaction details from transaction history"""
-        transactions = self._transaction_history[RPCType.get(key)]
-        key = random.choice(list(transactions.keys()))
-        params = random.choice(transactions[key])
-        params["from"] = key
-        return params
+        return self._transaction_history.random(RPCType.get(key))
 
     def _do_call(
         self,
@@ -1,6 +1,4 @@
-import collections
 import functools
-import json
 import logging
 import pathlib
 import random
@@ -9,25 +7,37 @@ import typing as tp
 import gevent
 import web3
 from locust import User, between, events, tag, task
+from locust.runners import WorkerRunner
 from loadtesting.proxy import locustfile as head
+from loadtesting.tracerapi.history import TransactionHistory
 
 RETRIEVE_STORE_VERSION = "0.8.10"
 """RetrieveStore contract version
 """
 
-DEFAULT_DUMP_FILE = "dumped_data/transaction.json"
+DEFAULT_DUMP_FILE = "dumped_data/transactions.db"
 """Default file name for transaction history
 """
 
-transaction_history = collections.defaultdict(
-    functools.partial(collections.defaultdict, list)
-)
-"""Transactions storage {account: [{blockNumber, blockHash, contractAddress},]}
+transaction_history: tp.Optional[TransactionHistory] = None
+"""Transactions storage, every transaction is written as soon as it is done
 """
 
 LOG = logging.getLogger("neon_client")
 
 
+@events.test_start.add_listener
+def open_history(environment, **kwargs) -> None:
+    """Test start event handler"""
+    global transaction_history
+    dumped_path = pathlib.Path(__file__).parent.parent / DEFAULT_DUMP_FILE
+    LOG.info(f"Dump transaction history to `{dumped_path.as_posix()}`")
+    transaction_history = TransactionHistory(dumped_path)
+    # the history of previous runs is replaced, the master starts before workers and clears it once
+    if not isinstance(environment.runner, WorkerRunner):
+        transaction_history.clear()
+
+
 def dump_history(attr) -> tp.Callable:
     """Save transaction history"""
 
@@ -37,14 +47,16 @@ def dump_history(attr) -> tp.Callable:
         def wrapper(self, *args, **kwargs) -> tp.Any:
             tx, info = func(self, *args, **kwargs)
             if tx:
-                transaction_history[attr][str(tx["from"])].append(
+                transaction_history.append(
+                    attr,
+                    str(tx["from"]),
                     {
                         "blockHash": tx["blockHash"].hex(),
                         "blockNumber": hex(tx["blockNumber"]),
                         "contract": tx.get("contract", ""),
                         "to": str(tx["to"]),
                         "additional_info": info,
-                    }
+                    },
                 )
             return tx
 
@@ -56,13 +68,8 @@ def dump_history(attr) -> tp.Callable:
 @events.test_stop.add_listener
 def teardown(*args, **kwargs) -> None:
     """Test stop event handler"""
-    if transaction_history:
-        dumped_path = pathlib.Path(__file__).parent.parent / DEFAULT_DUMP_FILE
-        dumped_path.parents[0].mkdir(parents=True, exist_ok=True)
-        with open(dumped_path, "w") as fp:
-            LOG.info(
-                f"Dumped transaction history to `{dumped_path.as_posix()}`")
-            json.dump(transaction_history, fp=fp, indent=4, sort_keys=True)
+    if transaction_history is not None:
+        LOG.info(f"Dumped {len(transaction_history)} transactions to `{transaction_history.path.as_posix()}`")
 
 
 @tag("store")
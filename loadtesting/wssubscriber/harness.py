@@ -0,0 +1,293 @@
+"""Load harness for the websocket subscriber service.
+
+Thousands of eth_subscribe sockets (newHeads and logs with several topic filters) are opened on asyncio, then
+EventCaller events are emitted at a fixed rate. Every log notification is matched to its transaction by hash, so
+latency is measured per subscriber from eth_sendRawTransaction to the notification. The notifications each filter
+must get are known from the topics of the mined transactions, so drops are counted exactly. newHeads subscribers
+are checked for gaps in block numbers and their latency is the spread after the first subscriber got the head.
+"""
+import asyncio
+import json
+import logging
+import time
+import typing as tp
+from dataclasses import dataclass, field
+
+import aiohttp
+import websockets
+from eth_account import Account
+from hdrh.histogram import HdrHistogram
+from web3 import Web3
+
+LOG = logging.getLogger(__name__)
+
+EVENT1_TOPIC = Web3.keccak(text="Event1(string)").hex()
+EVENT2_TOPIC = Web3.keccak(text="Event2(string,string)").hex()
+# calls are emitted in turn, their indexed texts let the filters select by argument
+EMITS = (("callEvent1", ("a",)), ("callEvent1", ("b",)), ("callEvent2", ("a", "b")))
+FILTERS = {
+    "logs_all": [],
+    "logs_event1": [EVENT1_TOPIC],
+    "logs_event2": [EVENT2_TOPIC],
+    "logs_text_a": [None, Web3.keccak(text="a").hex()],
+}
+KINDS = ("newHeads", *FILTERS)
+PERCENTILES = (50, 90, 99)
+CONNECT_CONCURRENCY = 100
+RECEIPT_TIMEOUT = 120
+# values are microseconds from 1us to 10 minutes with 3 significant digits
+MAX_VALUE_US = 600 * 1_000_000
+
+
+def emitted_topics(method: str, args: tp.Sequence[str]) -> tp.List[str]:
+    event = EVENT1_TOPIC if method == "callEvent1" else EVENT2_TOPIC
+    return [event, *(Web3.keccak(text=arg).hex() for arg in args)]
+
+
+def topics_match(topic_filter: tp.List, topics: tp.List[str]) -> bool:
+    """eth_subscribe semantics: None is any topic, a list is any of its topics"""
+    for position, expected in enumerate(topic_filter):
+        if expected is None:
+            continue
+        if position >= len(topics):
+            return False
+        if topics[position] not in (expected if isinstance(expected, list) else [expected]):
+            return False
+    return True
+
+
+@dataclass
+class Subscriber:
+    kind: str
+    subscribed: bool = False
+    received: int = 0
+    gaps: int = 0
+    last_block: tp.Optional[int] = None
+
+
+@dataclass
+class KindStats:
+    histogram: HdrHistogram = field(default_factory=lambda: HdrHistogram(1, MAX_VALUE_US, 3))
+
+    def record(self, seconds: float) -> None:
+        self.histogram.record_value(min(max(int(seconds * 1_000_000), 1), MAX_VALUE_US))
+
+
+class SubscriptionLoad:
+    def __init__(self, ws_url: str, proxy_url: str, contract: tp.Any, key: str, subscribers: int) -> None:
+        self.ws_url = ws_url
+        self.proxy_url = proxy_url
+        self.contract = contract
+        self.account = Account.from_key(key)
+        self.subscribers = [Subscriber(KINDS[i % len(KINDS)]) for i in range(subscribers)]
+        self.stats = {kind: KindStats() for kind in KINDS}
+        # hash -> perf_counter when it was sent
+        self.sent: tp.Dict[str, float] = {}
+        self.topics: tp.Dict[str, tp.List[str]] = {}
+        self.head_first_seen: tp.Dict[int, float] = {}
+        self.expected_logs: tp.Optional[int] = None
+        self.delivered_logs = 0
+        self.notifications = 0
+        self.ready = 0
+        self.all_ready = asyncio.Event()
+        self.all_delivered = asyncio.Event()
+        self.first_sent: tp.Optional[float] = None
+        self.last_notification: tp.Optional[float] = None
+
+    async def _rpc(self, session: aiohttp.ClientSession, body: tp.Any) -> tp.Any:
+        async with session.post(self.proxy_url, json=body) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _call(self, session: aiohttp.ClientSession, method: str, params: tp.List) -> tp.Any:
+        response = await self._rpc(session, {"jsonrpc": "2.0", "method": method, "params": params, "id": 0})
+        if "error" in response:
+            raise RuntimeError(f"{method} failed: {response['error']}")
+        return response["result"]
+
+    def _mark_ready(self) -> None:
+        self.ready += 1
+        if self.ready == len(self.subscribers):
+            self.all_ready.set()
+
+    def _on_log(self, subscriber: Subscriber, log: tp.Dict, now: float) -> None:
+        sent_at = self.sent.get(log["transactionHash"])
+        if sent_at is None:
+            return
+        subscriber.received += 1
+        self.stats[subscriber.kind].record(now - sent_at)
+        self.delivered_logs += 1
+        if self.expected_logs is not None and self.delivered_logs >= self.expected_logs:
+            self.all_delivered.set()
+
+    def _on_head(self, subscriber: Subscriber, head: tp.Dict, now: float) -> None:
+        number = int(head["number"], 16)
+        subscriber.received += 1
+        if subscriber.last_block is not None and number > subscriber.last_block + 1:
+            subscriber.gaps += number - subscriber.last_block - 1
+        subscriber.last_block = max(number, subscriber.last_block or 0)
+        first_seen = self.head_first_seen.setdefault(number, now)
+        self.stats["newHeads"].record(now - first_seen)
+
+    async def _subscribe(self, subscriber: Subscriber, connect_limit: asyncio.Semaphore) -> None:
+        if subscriber.kind == "newHeads":
+            params = ["newHeads"]
+        else:
+            params = ["logs", {"address": self.contract.address, "topics": FILTERS[subscriber.kind]}]
+        try:
+            async with connect_limit:
+                ws = await websockets.connect(self.ws_url, max_size=None, open_timeout=60)
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": params}))
+                response = json.loads(await ws.recv())
+            if "result" not in response:
+                raise RuntimeError(response.get("error"))
+        except Exception as e:
+            LOG.warning(f"Can't subscribe to {subscriber.kind}: {e}")
+            self._mark_ready()
+            return
+        subscriber.subscribed = True
+        self._mark_ready()
+        try:
+            async for message in ws:
+                now = time.perf_counter()
+                result = json.loads(message)["params"]["result"]
+                self.notifications += 1
+                self.last_notification = now
+                if subscriber.kind == "newHeads":
+                    self._on_head(subscriber, result, now)
+                else:
+                    self._on_log(subscriber, result, now)
+        finally:
+            await ws.close()
+
+    async def _emit(self, session: aiohttp.ClientSession, events: int, rate: float) -> None:
+        chain_id = int(await self._call(session, "eth_chainId", []), 16)
+        gas_price = int(await self._call(session, "eth_gasPrice", []), 16)
+        nonce = int(await self._call(session, "eth_getTransactionCount", [self.account.address, "pending"]), 16)
+        calls = []
+        for method, args in EMITS:
+            data = self.contract.encodeABI(fn_name=method, args=args)
+            transaction = {"from": self.account.address, "to": self.contract.address, "data": data}
+            gas = int(await self._call(session, "eth_estimateGas", [transaction]), 16)
+            calls.append((method, args, data, gas))
+
+        started = time.perf_counter()
+        self.first_sent = started
+        for i in range(events):
+            # open model: the next event is due at its time whatever the previous response time was
+            await asyncio.sleep(max(0.0, started + i / rate - time.perf_counter()))
+            method, args, data, gas = calls[i % len(calls)]
+            signed = self.account.sign_transaction(
+                {
+                    "to": self.contract.address,
+                    "data": data,
+                    "gas": gas,
+                    "gasPrice": gas_price,
+                    "nonce": nonce,
+                    "chainId": chain_id,
+                    "value": 0,
+                }
+            )
+            tx_hash = signed.hash.hex()
+            self.sent[tx_hash] = time.perf_counter()
+            try:
+                await self._call(session, "eth_sendRawTransaction", [signed.rawTransaction.hex()])
+            except Exception as e:
+                LOG.warning(f"Event {i} is not sent: {e}")
+                del self.sent[tx_hash]
+                nonce = int(await self._call(session, "eth_getTransactionCount", [self.account.address, "pending"]), 16)
+                continue
+            nonce += 1
+            self.topics[tx_hash] = emitted_topics(method, args)
+
+    async def _wait_receipts(self, session: aiohttp.ClientSession) -> tp.Dict[str, bool]:
+        """Status of every sent transaction, the ones without receipts are failed"""
+        statuses = {}
+        pending = list(self.topics)
+        deadline = time.perf_counter() + RECEIPT_TIMEOUT
+        while pending and time.perf_counter() < deadline:
+            body = [
+                {"jsonrpc": "2.0", "method": "eth_getTransactionReceipt", "params": [tx], "id": i}
+                for i, tx in enumerate(pending)
+            ]
+            responses = {item["id"]: item for item in await self._rpc(session, body)}
+            waiting = []
+            for i, tx in enumerate(pending):
+                receipt = responses.get(i, {}).get("result")
+                if receipt is None:
+                    waiting.append(tx)
+                else:
+                    statuses[tx] = int(receipt["status"], 16) == 1
+            pending = waiting
+            if pending:
+                await asyncio.sleep(1)
+        statuses.update({tx: False for tx in pending})
+        return statuses
+
+    def _expected_per_subscriber(self, statuses: tp.Dict[str, bool]) -> tp.Dict[str, int]:
+        mined = [self.topics[tx] for tx, ok in statuses.items() if ok]
+        return {kind: sum(topics_match(FILTERS[kind], topics) for topics in mined) for kind in FILTERS}
+
+    async def run(self, events: int, rate: float, drain: float) -> tp.List[tp.List]:
+        connect_limit = asyncio.Semaphore(CONNECT_CONCURRENCY)
+        tasks = [asyncio.create_task(self._subscribe(subscriber, connect_limit)) for subscriber in self.subscribers]
+        await self.all_ready.wait()
+        LOG.info(f"{sum(s.subscribed for s in self.subscribers)} of {len(self.subscribers)} subscribers are ready")
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
+            await self._emit(session, events, rate)
+            statuses = await self._wait_receipts(session)
+        expected = self._expected_per_subscriber(statuses)
+        self.expected_logs = sum(expected[s.kind] for s in self.subscribers if s.subscribed and s.kind != "newHeads")
+        if self.delivered_logs >= self.expected_logs:
+            self.all_delivered.set()
+        try:
+            await asyncio.wait_for(self.all_delivered.wait(), drain)
+        except asyncio.TimeoutError:
+            LOG.warning(f"{self.expected_logs - self.delivered_logs} log notifications are not delivered in {drain}s")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return self.rows(expected)
+
+    def rows(self, expected: tp.Dict[str, int]) -> tp.List[tp.List]:
+        rows = []
+        for kind in KINDS:
+            subscribers = [s for s in self.subscribers if s.kind == kind]
+            subscribed = [s for s in subscribers if s.subscribed]
+            delivered = sum(s.received for s in subscribed)
+            if kind == "newHeads":
+                dropped = sum(s.gaps for s in subscribed)
+            else:
+                dropped = sum(max(expected[kind] - s.received, 0) for s in subscribed)
+            total = delivered + dropped if kind == "newHeads" else expected[kind] * len(subscribed)
+            h = self.stats[kind].histogram
+            percentiles = [h.get_value_at_percentile(p) / 1000 for p in PERCENTILES]
+            rows.append(
+                [
+                    kind,
+                    len(subscribed),
+                    len(subscribers) - len(subscribed),
+                    delivered,
+                    round(dropped * 100 / total, 2) if total else 0,
+                    *percentiles,
+                    h.get_max_value() / 1000,
+                ]
+            )
+        return rows
+
+    def throughput(self) -> float:
+        """Notifications per second received by all subscribers since the first event was sent"""
+        if self.first_sent is None or self.last_notification is None or self.last_notification <= self.first_sent:
+            return 0.0
+        return self.notifications / (self.last_notification - self.first_sent)
+
+
+HEADERS = ["Kind", "Subscribers", "Failed", "Notifications", "Dropped %", *(f"p{p} ms" for p in PERCENTILES), "Max ms"]
+
+
+def run_subscription_load(
+    ws_url: str, proxy_url: str, contract: tp.Any, key: str, subscribers: int, events: int, rate: float, drain: float
+) -> tp.Tuple[tp.List[tp.List], float]:
+    load = SubscriptionLoad(ws_url, proxy_url, contract, key, subscribers)
+    rows = asyncio.run(load.run(events, rate, drain))
+    return rows, load.throughput()
@@ -32,6 +32,9 @@ def setup_logging(log_level=logging.DEBUG):
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+    # Accounts of every built Solana instruction, enable for debugging of a single test
+    logging.getLogger("utils.instructions").setLevel(logging.INFO)
+
     return logger
 
 
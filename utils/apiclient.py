@@ -39,6 +39,21 @@ class JsonRPCSession(Session):
 
         return response_body
 
+    def send_batch_rpc(self, calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.List]]]) -> tp.List[tp.Dict]:
+        """Send several calls in one JSON-RPC batch, responses are returned in the order of calls"""
+        body = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": req_id}
+            for req_id, (method, params) in enumerate(calls)
+        ]
+        resp = self.post(self.url, json=body, timeout=60)
+        response_body = resp.json()
+        if not isinstance(response_body, list):
+            raise AssertionError(f"Batch request is not supported: {response_body}")
+
+        responses = {item["id"]: item for item in response_body}
+        assert len(responses) == len(calls), "Response must contain an item for every request"
+        return [responses[req_id] for req_id in range(len(calls))]
+
     def get_contract_code(self, contract_address: str) -> str:
         response = self.send_rpc("eth_getCode", [contract_address, "latest"])
         return response["result"]
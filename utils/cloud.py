@@ -1,41 +1,125 @@
 import os
 import boto3
+import hashlib
 import pathlib
 import mimetypes
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 
 NEON_TESTS_BUCKET_NAME = os.environ.get("AWS_S3_BUCKET", "neon-test-allure")
+# files are copied in parallel, large ones in parts, at most this many requests at a time
+SYNC_CONCURRENCY = 16
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNKSIZE, multipart_chunksize=MULTIPART_CHUNKSIZE, max_concurrency=4
+)
 
 
+# AWS_ENDPOINT_URL points the client to a local S3 stand-in (moto, minio)
 client = boto3.client("s3", region_name=os.environ.get("AWS_REGION", "eu-central-1"))
 
 
-def download(source, destination, bucket=NEON_TESTS_BUCKET_NAME):
-    files = list_bucket(source, bucket)
-    for f in files:
-        dst_file = pathlib.Path(destination) / f["Key"].split(str(source))[1][1:]
-        if not dst_file.parent.exists():
-            dst_file.parent.mkdir(parents=True)
-        client.download_file(bucket, f["Key"], str(dst_file))
+def local_etag(path: pathlib.Path, chunk_size: int = MULTIPART_CHUNKSIZE) -> str:
+    """ETag S3 gives to the file uploaded with TRANSFER_CONFIG: md5, or md5 of the part md5s for multipart"""
+    parts = []
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            parts.append(hashlib.md5(chunk).digest())
+    if path.stat().st_size < chunk_size:
+        return parts[0].hex() if parts else hashlib.md5().hexdigest()
+    return f"{hashlib.md5(b''.join(parts)).hexdigest()}-{len(parts)}"
+
+
+def is_unchanged(path: pathlib.Path, obj: tp.Optional[tp.Dict]) -> bool:
+    return (
+        obj is not None
+        and path.is_file()
+        and path.stat().st_size == obj["Size"]
+        and local_etag(path) == obj["ETag"].strip('"')
+    )
+
+
+def _run_parallel(func: tp.Callable, items: tp.List) -> None:
+    with ThreadPoolExecutor(SYNC_CONCURRENCY) as executor:
+        # list() re-raises the first failed transfer
+        list(executor.map(func, items))
+
+
+def download(source, destination, bucket=NEON_TESTS_BUCKET_NAME) -> tp.Tuple[int, int]:
+    """Download the objects under the prefix which differ from the local files, returns (downloaded, skipped)"""
+    prefix = f"{str(source).rstrip('/')}/"
+    changed = []
+    skipped = 0
+    for obj in iter_objects(prefix, bucket):
+        dst_file = pathlib.Path(destination) / obj["Key"][len(prefix) :]
+        if is_unchanged(dst_file, obj):
+            skipped += 1
+        else:
+            changed.append((obj["Key"], dst_file))
+
+    def fetch(item):
+        key, dst_file = item
+        dst_file.parent.mkdir(parents=True, exist_ok=True)
+        client.download_file(bucket, key, str(dst_file), Config=TRANSFER_CONFIG)
 
+    _run_parallel(fetch, changed)
+    print(f"Downloaded {len(changed)} files from {bucket}/{prefix}, {skipped} are unchanged")
+    return len(changed), skipped
 
-def upload(source, destination, bucket=NEON_TESTS_BUCKET_NAME):
+
+def upload(source, destination, bucket=NEON_TESTS_BUCKET_NAME) -> tp.Tuple[int, int]:
+    """Upload the files which differ from the objects in the bucket, returns (uploaded, skipped)"""
     source = pathlib.Path(source)
     destination = pathlib.Path(destination)
 
     if source.is_file():
-        mimetype = mimetypes.guess_type(source.name)[0]
-        client.upload_file(str(source), bucket, str(destination / source.name), ExtraArgs={"ContentType": mimetype})
-        return
+        # the destination may hold many other objects, only the one of the file is compared
+        key = str(destination / source.name)
+        files = {key: source}
+        remote = {key: head_object(key, bucket)}
+    else:
+        files = {str(destination / f.relative_to(source)): f for f in source.glob("**/*") if f.is_file()}
+        remote = {obj["Key"]: obj for obj in iter_objects(f"{destination}/", bucket)}
+    changed = [(key, f) for key, f in files.items() if not is_unchanged(f, remote.get(key))]
+
+    def send(item):
+        key, f = item
+        mimetype = mimetypes.guess_type(f.name)[0] or "binary/octet-stream"
+        client.upload_file(str(f), bucket, key, ExtraArgs={"ContentType": mimetype}, Config=TRANSFER_CONFIG)
+
+    _run_parallel(send, changed)
+    print(f"Uploaded {len(changed)} files to {bucket}/{destination}, {len(files) - len(changed)} are unchanged")
+    return len(changed), len(files) - len(changed)
+
+
+def head_object(key, bucket=NEON_TESTS_BUCKET_NAME) -> tp.Optional[tp.Dict]:
+    """The object in the format of list_objects_v2, None if there is no such key"""
+    try:
+        head = client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+    return {"Key": key, "Size": head["ContentLength"], "ETag": head["ETag"]}
+
+
+def iter_objects(prefix, bucket=NEON_TESTS_BUCKET_NAME) -> tp.Iterator[tp.Dict]:
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=str(prefix)):
+        yield from page.get("Contents", [])
+
 
-    for f in source.glob("**/*"):
-        if not f.is_file():
-            continue
-        mimetype = mimetypes.guess_type(f.name)[0]
-        client.upload_file(
-            str(f), bucket, str(destination / f.relative_to(source)), ExtraArgs={"ContentType": mimetype}
-        )
+def list_prefixes(prefix, bucket=NEON_TESTS_BUCKET_NAME) -> tp.List[str]:
+    """Common prefixes one level below the prefix, like directories"""
+    paginator = client.get_paginator("list_objects_v2")
+    return [
+        common["Prefix"]
+        for page in paginator.paginate(Bucket=bucket, Prefix=str(prefix), Delimiter="/")
+        for common in page.get("CommonPrefixes", [])
+    ]
 
 
 def list_bucket(directory, bucket=NEON_TESTS_BUCKET_NAME):
-    result = client.list_objects_v2(Bucket=bucket, Prefix=str(directory))
-    return result.get("Contents", [])
+    return list(iter_objects(directory, bucket))
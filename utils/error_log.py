@@ -1,8 +1,8 @@
-import contextlib
 import json
+import os
 from pathlib import Path
 from collections import defaultdict
-from typing import Optional, Type, Generator
+from typing import Iterator, Type
 
 import pydantic
 from filelock import FileLock
@@ -20,79 +20,80 @@ class ErrorLogModel(pydantic.BaseModel):
 
 
 class ErrorLog:
+    """Append-only JSON lines, one record per failure, error or comment.
+
+    Every record is written with a single O_APPEND write, so xdist workers add records without locks and without
+    reading the file. The records are aggregated into ErrorLogModel only when the log is read.
+    """
+
     def __init__(self, file_path: str = CMD_ERROR_LOG):
         self.model: Type[ErrorLogModel] = ErrorLogModel
         self.root_dir: Path = Path(__file__).resolve().parent.parent
         self.file_path: Path = self.root_dir / file_path
         self.lock = FileLock(lock_file=self.file_path.with_suffix(self.file_path.suffix + ".lock"), is_singleton=True)
 
+    def clear(self) -> bool:
         with self.lock:
-            if not self.file_path.exists():
-                self.__create()
+            try:
+                self.file_path.write_text("")
+            except FileNotFoundError:
+                return False
+            else:
+                return True
+
+    def _append(self, records: list[dict]) -> None:
+        data = "".join(json.dumps(record) + "\n" for record in records).encode()
+        fd = os.open(self.file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
-    def __create(self) -> bool:
+    def _records(self) -> Iterator[dict]:
         try:
-            data = self.model().model_dump_json(indent=4)
-            self.file_path.write_text(data)
+            with self.file_path.open() as f:
+                for line in f:
+                    # a line can be cut if a writer was killed
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
         except FileNotFoundError:
-            return False
-        else:
-            return True
-
-    def clear(self) -> bool:
-        with self.lock:
-            return self.__create()
+            return
 
     def read(self) -> ErrorLogModel:
-        with self.file_path.open() as f:
-            data = json.load(f)
-            log = self.model(**data)
+        log = self.model()
+        for record in self._records():
+            if record["kind"] == "failure":
+                log.failures[record["group"]].append(record["name"])
+            elif record["kind"] == "error":
+                log.errors[record["group"]].append(record["name"])
+            elif record["kind"] == "comment":
+                log.comments.append(record["text"])
         return log
 
     def has_logs(self) -> bool:
-        log = self.read()
-        return bool(log.failures or log.errors)
+        return any(record["kind"] in ("failure", "error") for record in self._records())
 
-    def add_failure(self, test_group: TestGroup, test_name: str) -> ErrorLogModel:
-        with self._update() as log:
-            log.failures[test_group].append(test_name)
-        return log
+    def add_failure(self, test_group: TestGroup, test_name: str) -> None:
+        self.add_failures(test_group, [test_name])
 
-    def add_error(self, test_group: TestGroup, test_name: str) -> ErrorLogModel:
-        with self._update() as log:
-            log.errors[test_group].append(test_name)
-        return log
-
-    def add_failures(self, test_group: TestGroup, test_names: list[str]) -> ErrorLogModel:
-        with self._update() as log:
-            log.failures[test_group].extend(test_names)
-        return log
+    def add_error(self, test_group: TestGroup, test_name: str) -> None:
+        self._append([{"kind": "error", "group": test_group, "name": test_name}])
 
-    @contextlib.contextmanager
-    def _update(self) -> Generator[ErrorLogModel, None, None]:
-        with self.lock:
-            log = self.read()
+    def add_failures(self, test_group: TestGroup, test_names: list[str]) -> None:
+        self._append([{"kind": "failure", "group": test_group, "name": name} for name in test_names])
 
-            yield log
-
-            data = log.model_dump_json(indent=4)
-            self.file_path.write_text(data)
-
-    def add_comment(self, text: str) -> ErrorLogModel:
-        with self._update() as log:
-            log.comments.append(text)
-        return log
+    def add_comment(self, text: str) -> None:
+        self._append([{"kind": "comment", "text": text}])
 
     def get_count_by_group(self) -> dict[TestGroup, int]:
         """Get count of both failed and errored tests by group"""
-        log = self.read()
-        failed_by_group = {group: len(log.failures[group]) for group in log.failures if len(log.failures[group]) > 0}
-        errored_by_group = {group: len(log.errors[group]) for group in log.errors if len(log.errors[group]) > 0}
-        count_by_group = {
-            key: failed_by_group.get(key, 0) + errored_by_group.get(key, 0)
-            for key in failed_by_group.keys() | errored_by_group.keys()
-        }
-        return count_by_group
+        count_by_group = defaultdict(int)
+        for record in self._records():
+            if record["kind"] in ("failure", "error"):
+                count_by_group[record["group"]] += 1
+        return dict(count_by_group)
 
 
 error_log = ErrorLog()
@@ -0,0 +1,309 @@
+"""Fixture setup/teardown profiler (enabled by `--profile-fixtures`).
+
+Time spent inside a fixture is split into RPC calls (HTTP requests made by web3, faucet, solana clients),
+contract compilation (solcx) and explicit waits (time.sleep), the rest is reported as "other".
+"""
+import contextlib
+import functools
+import hashlib
+import json
+import pathlib
+import time
+import typing as tp
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import pytest
+from _pytest.config import Config
+from _pytest.config.argparsing import Parser
+
+CATEGORIES = ("rpc", "compile", "wait")
+DEFAULT_REPORT_PATH = "fixtures-profile.json"
+FINGERPRINT_DEPTH = 4
+
+_perf_counter = time.perf_counter
+
+
+@dataclass
+class FixtureStats:
+    name: str
+    scope: str
+    location: str = ""
+    setups: int = 0
+    setup_time: float = 0.0
+    teardown_time: float = 0.0
+    categories: tp.Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    mutated: tp.Optional[bool] = None
+
+    @property
+    def total_time(self) -> float:
+        return self.setup_time + self.teardown_time
+
+    def merge(self, other: "FixtureStats") -> None:
+        self.setups += other.setups
+        self.setup_time += other.setup_time
+        self.teardown_time += other.teardown_time
+        for category, spent in other.categories.items():
+            self.categories[category] += spent
+        if other.mutated is not None:
+            self.mutated = bool(self.mutated) or other.mutated
+
+    def recommendation(self) -> str:
+        if self.mutated is not False:
+            return ""
+        if self.scope != "session" and self.setups > 1:
+            return "widen scope to session"
+        return "safe to cache"
+
+
+@dataclass
+class _Frame:
+    stats: FixtureStats
+    started: float = field(default_factory=_perf_counter)
+    children: float = 0.0
+    category: tp.Optional[str] = None
+
+
+class FixtureProfiler:
+    """Collects per-fixture timings and attributes them to categories"""
+
+    def __init__(self):
+        self.stats: tp.Dict[tp.Tuple[str, str, str], FixtureStats] = {}
+        self._stack: tp.List[_Frame] = []
+        self._patches: tp.List[tp.Tuple[tp.Any, str, tp.Any]] = []
+
+    def get_stats(self, fixturedef) -> FixtureStats:
+        key = (fixturedef.argname, fixturedef.scope, fixturedef.baseid)
+        if key not in self.stats:
+            self.stats[key] = FixtureStats(fixturedef.argname, fixturedef.scope, fixturedef.baseid)
+        return self.stats[key]
+
+    def start(self, stats: FixtureStats) -> _Frame:
+        frame = _Frame(stats)
+        self._stack.append(frame)
+        return frame
+
+    def stop(self, frame: _Frame, phase: str) -> None:
+        self._stack.remove(frame)
+        elapsed = _perf_counter() - frame.started
+        if self._stack:
+            self._stack[-1].children += elapsed
+        if phase == "setup":
+            frame.stats.setups += 1
+            frame.stats.setup_time += elapsed - frame.children
+        else:
+            frame.stats.teardown_time += elapsed - frame.children
+
+    @contextlib.contextmanager
+    def measure(self, stats: FixtureStats, phase: str):
+        frame = self.start(stats)
+        try:
+            yield frame
+        finally:
+            self.stop(frame, phase)
+
+    @contextlib.contextmanager
+    def category(self, name: str):
+        frame = self._stack[-1] if self._stack else None
+        if frame is None or frame.category is not None:
+            yield
+            return
+        frame.category = name
+        started = _perf_counter()
+        try:
+            yield
+        finally:
+            frame.category = None
+            frame.stats.categories[name] += _perf_counter() - started
+
+    def instrument(self, owner: tp.Any, attr: str, category: str) -> None:
+        original = getattr(owner, attr)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            with self.category(category):
+                return original(*args, **kwargs)
+
+        setattr(owner, attr, wrapper)
+        self._patches.append((owner, attr, original))
+
+    def install(self) -> None:
+        self.instrument(time, "sleep", "wait")
+        with contextlib.suppress(ImportError):
+            import requests
+
+            self.instrument(requests.Session, "send", "rpc")
+        with contextlib.suppress(ImportError):
+            import httpx
+
+            self.instrument(httpx.Client, "send", "rpc")
+        with contextlib.suppress(ImportError):
+            import solcx
+
+            for attr in ("compile_files", "compile_source", "install_solc"):
+                self.instrument(solcx, attr, "compile")
+
+    def uninstall(self) -> None:
+        while self._patches:
+            owner, attr, original = self._patches.pop()
+            setattr(owner, attr, original)
+
+    def ranked(self) -> tp.List[FixtureStats]:
+        return sorted(self.stats.values(), key=lambda s: s.total_time, reverse=True)
+
+    def dump(self) -> tp.List[tp.Dict]:
+        result = []
+        for stats in self.stats.values():
+            data = {**vars(stats), "categories": dict(stats.categories)}
+            result.append(data)
+        return result
+
+    def load(self, data: tp.List[tp.Dict]) -> None:
+        for item in data:
+            other = FixtureStats(**{**item, "categories": defaultdict(float, item["categories"])})
+            key = (other.name, other.scope, other.location)
+            if key in self.stats:
+                self.stats[key].merge(other)
+            else:
+                self.stats[key] = other
+
+
+def fingerprint(value: tp.Any) -> tp.Optional[str]:
+    """Return a hash of the fixture value state or None if it can't be computed"""
+    digest = hashlib.sha1()
+    seen = set()
+
+    def walk(obj, depth):
+        if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+            digest.update(repr(obj).encode())
+            return
+        digest.update(type(obj).__name__.encode())
+        if depth >= FINGERPRINT_DEPTH or id(obj) in seen:
+            digest.update(str(id(obj)).encode())
+            return
+        seen.add(id(obj))
+        if isinstance(obj, dict):
+            for key, item in obj.items():
+                walk(key, depth + 1)
+                walk(item, depth + 1)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            digest.update(str(len(obj)).encode())
+            for item in obj:
+                walk(item, depth + 1)
+        elif hasattr(obj, "__dict__"):
+            for key, item in vars(obj).items():
+                digest.update(key.encode())
+                walk(item, depth + 1)
+        else:
+            digest.update(str(id(obj)).encode())
+
+    try:
+        walk(value, 0)
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def pytest_addoption(parser: Parser):
+    group = parser.getgroup("fixtures-profile", "Fixtures profiling")
+    group.addoption(
+        "--profile-fixtures",
+        action="store_true",
+        default=False,
+        help="Measure setup/teardown time of fixtures and print a ranked report",
+    )
+    group.addoption(
+        "--profile-fixtures-report",
+        action="store",
+        default=DEFAULT_REPORT_PATH,
+        help="Where to save the fixtures profile in json format",
+    )
+
+
+def pytest_configure(config: Config):
+    if config.getoption("--profile-fixtures"):
+        profiler = FixtureProfiler()
+        profiler.install()
+        config.fixture_profiler = profiler
+
+
+def pytest_unconfigure(config: Config):
+    profiler = getattr(config, "fixture_profiler", None)
+    if profiler is not None:
+        profiler.uninstall()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    profiler: tp.Optional[FixtureProfiler] = getattr(request.config, "fixture_profiler", None)
+    if profiler is None:
+        yield
+        return
+
+    stats = profiler.get_stats(fixturedef)
+    state = {}
+
+    def teardown_finished():
+        if "teardown" in state:
+            profiler.stop(state.pop("teardown"), "teardown")
+
+    def teardown_started():
+        if "fingerprint" in state and fixturedef.cached_result is not None:
+            changed = fingerprint(fixturedef.cached_result[0]) != state["fingerprint"]
+            stats.mutated = bool(stats.mutated) or changed
+        state["teardown"] = profiler.start(stats)
+
+    # finalizers are called in the reverse order, so fixture's own teardown is surrounded by these two
+    fixturedef.addfinalizer(teardown_finished)
+    with profiler.measure(stats, "setup"):
+        outcome = yield
+    fixturedef.addfinalizer(teardown_started)
+
+    if outcome.excinfo is None:
+        value = fingerprint(outcome.get_result())
+        if value is not None:
+            state["fingerprint"] = value
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    profiler: tp.Optional[FixtureProfiler] = getattr(session.config, "fixture_profiler", None)
+    if profiler is not None and hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["fixture_profile"] = json.dumps(profiler.dump())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    profiler: tp.Optional[FixtureProfiler] = getattr(node.config, "fixture_profiler", None)
+    data = getattr(node, "workeroutput", {}).get("fixture_profile")
+    if profiler is not None and data:
+        profiler.load(json.loads(data))
+
+
+def pytest_terminal_summary(terminalreporter, config: Config):
+    profiler: tp.Optional[FixtureProfiler] = getattr(config, "fixture_profiler", None)
+    if profiler is None or hasattr(config, "workerinput"):
+        return
+
+    ranked = profiler.ranked()
+    terminalreporter.section("fixtures profile")
+    header = f"{'fixture':<40} {'scope':<8} {'runs':>5} {'setup':>9} {'teardown':>9} "
+    header += " ".join(f"{category:>8}" for category in CATEGORIES)
+    header += f" {'other':>8}  recommendation"
+    terminalreporter.write_line(header)
+    for stats in ranked:
+        categories = [stats.categories.get(category, 0.0) for category in CATEGORIES]
+        other = max(stats.total_time - sum(categories), 0.0)
+        line = f"{stats.name[:40]:<40} {stats.scope:<8} {stats.setups:>5} "
+        line += f"{stats.setup_time:>8.2f}s {stats.teardown_time:>8.2f}s "
+        line += " ".join(f"{spent:>7.2f}s" for spent in categories)
+        line += f" {other:>7.2f}s  {stats.recommendation()}"
+        terminalreporter.write_line(line)
+
+    report_path = pathlib.Path(config.getoption("--profile-fixtures-report"))
+    report = profiler.dump()
+    for data, stats in zip(report, profiler.stats.values()):
+        data["recommendation"] = stats.recommendation()
+    report.sort(key=lambda item: item["setup_time"] + item["teardown_time"], reverse=True)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=4)
+    terminalreporter.write_line(f"Fixtures profile saved to {report_path.absolute()}")
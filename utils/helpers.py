@@ -2,6 +2,7 @@ import os
 import pathlib
 import random
 import string
+import struct
 import time
 import typing
 import typing as tp
@@ -16,6 +17,7 @@ from eth_utils import keccak
 from solana.publickey import PublicKey
 from solcx import link_code
 
+_U64 = struct.Struct("<Q")
 
 
 @allure.step("Get contract abi")
@@ -174,13 +176,18 @@ def solana_pubkey_to_bytes32(solana_pubkey):
     return byte_data
 
 def serialize_instruction(program_id, instruction) -> bytes:
-    program_id_bytes = solana_pubkey_to_bytes32(PublicKey(program_id))
-    serialized = program_id_bytes + len(instruction.keys).to_bytes(8, "little")
-
-    for key in instruction.keys:
-        serialized += bytes(key.pubkey)
-        serialized += key.is_signer.to_bytes(1, "little")
-        serialized += key.is_writable.to_bytes(1, "little")
-
-    serialized += len(instruction.data).to_bytes(8, "little") + instruction.data
-    return serialized
\ No newline at end of file
+    keys = instruction.keys
+    data = instruction.data
+    # program id, keys count, 32 bytes key + signer + writable per key, data length, data
+    buffer = bytearray(48 + 34 * len(keys) + len(data))
+    buffer[:32] = bytes(PublicKey(program_id))
+    _U64.pack_into(buffer, 32, len(keys))
+    offset = 40
+    for key in keys:
+        buffer[offset : offset + 32] = bytes(key.pubkey)
+        buffer[offset + 32] = key.is_signer
+        buffer[offset + 33] = key.is_writable
+        offset += 34
+    _U64.pack_into(buffer, offset, len(data))
+    buffer[offset + 8 :] = data
+    return bytes(buffer)
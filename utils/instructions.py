@@ -1,3 +1,5 @@
+import logging
+import struct
 import typing as tp
 from hashlib import sha256
 
@@ -14,10 +16,25 @@ from spl.token.instructions import get_associated_token_address
 
 from utils.types import TreasuryPool
 
+LOG = logging.getLogger(__name__)
+
 DEFAULT_UNITS = 1_400_000
 DEFAULT_HEAP_FRAME = 256 * 1024
 DEFAULT_ADDITIONAL_FEE = 0
 
+_U64 = struct.Struct("<Q")
+# step_count and index of the iterative instructions
+_STEP = struct.Struct("<II")
+
+
+def writable_accounts(accounts: tp.Iterable[PublicKey]) -> tp.List[AccountMeta]:
+    return [AccountMeta(acc, is_signer=False, is_writable=True) for acc in accounts]
+
+
+def log_accounts(builder: str, **accounts: tp.Any) -> None:
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug("%s accounts: %s", builder, ", ".join(f"{name}: {value}" for name, value in accounts.items()))
+
 
 class ComputeBudget:
     @staticmethod
@@ -57,7 +74,7 @@ class TransactionWithComputeBudget(Transaction):
 def make_WriteHolder(
     operator: PublicKey, evm_loader_id: PublicKey, holder_account: PublicKey, hash: bytes, offset: int, payload: bytes
 ):
-    d = bytes([0x26]) + hash + offset.to_bytes(8, byteorder="little") + payload
+    d = b"".join((b"\x26", hash, _U64.pack(offset), payload))
 
     return TransactionInstruction(
         program_id=evm_loader_id,
@@ -80,22 +97,22 @@ def make_ExecuteTrxFromInstruction(
     system_program=sp.SYS_PROGRAM_ID,
     tag=0x32,
 ):
-    data = bytes([tag]) + treasury_buffer + message
-    print("make_ExecuteTrxFromInstruction accounts")
-    print("Operator: ", operator.public_key)
-    print("Treasury: ", treasury_address)
-    print("Operator eth solana: ", operator_balance)
+    data = b"".join((bytes((tag,)), treasury_buffer, message))
+    operator_pubkey = operator.public_key
+    log_accounts(
+        "make_ExecuteTrxFromInstruction",
+        operator=operator_pubkey,
+        treasury=treasury_address,
+        operator_balance=operator_balance,
+        additional=additional_accounts,
+    )
     accounts = [
-        AccountMeta(pubkey=operator.public_key, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=operator_pubkey, is_signer=True, is_writable=True),
         AccountMeta(pubkey=treasury_address, is_signer=False, is_writable=True),
         AccountMeta(pubkey=operator_balance, is_signer=False, is_writable=True),
         AccountMeta(system_program, is_signer=False, is_writable=True),
     ]
-    for acc in additional_accounts:
-        print("Additional acc ", acc)
-        accounts.append(
-            AccountMeta(acc, is_signer=False, is_writable=True),
-        )
+    accounts.extend(writable_accounts(additional_accounts))
 
     return TransactionInstruction(program_id=evm_loader_id, data=data, keys=accounts)
 
@@ -112,28 +129,26 @@ def make_ExecuteTrxFromAccount(
     system_program=sp.SYS_PROGRAM_ID,
     tag=0x33,
 ):
-    data = bytes([tag]) + treasury_buffer
-    print("make_ExecuteTrxFromInstruction accounts")
-    print("Operator: ", operator.public_key)
-    print("Treasury: ", treasury_address)
-    print("Operator eth solana: ", operator_balance)
+    data = bytes((tag,)) + treasury_buffer
+    operator_pubkey = operator.public_key
+    log_accounts(
+        "make_ExecuteTrxFromAccount",
+        operator=operator_pubkey,
+        treasury=treasury_address,
+        operator_balance=operator_balance,
+        additional=additional_accounts,
+    )
     accounts = [
         AccountMeta(pubkey=holder_address, is_signer=False, is_writable=True),
-        AccountMeta(pubkey=operator.public_key, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=operator_pubkey, is_signer=True, is_writable=True),
         AccountMeta(pubkey=treasury_address, is_signer=False, is_writable=True),
         AccountMeta(pubkey=operator_balance, is_signer=False, is_writable=True),
         AccountMeta(system_program, is_signer=False, is_writable=True),
     ]
-    for acc in additional_accounts:
-        print("Additional acc ", acc)
-        accounts.append(
-            AccountMeta(acc, is_signer=False, is_writable=True),
-        )
+    accounts.extend(writable_accounts(additional_accounts))
     if additional_signers:
         for acc in additional_signers:
-            accounts.append(
-                AccountMeta(acc.public_key, is_signer=True, is_writable=True),
-            )
+            accounts.append(AccountMeta(pubkey=acc.public_key, is_signer=True, is_writable=True))
     return TransactionInstruction(program_id=evm_loader_id, data=data, keys=accounts)
 
 
@@ -151,25 +166,24 @@ def make_ExecuteTrxFromAccountDataIterativeOrContinue(
 ):
     # 0x35 - TransactionStepFromAccount
     # 0x36 - TransactionStepFromAccountNoChainId
-    data = tag.to_bytes(1, "little") + treasury.buffer + step_count.to_bytes(4, "little") + index.to_bytes(4, "little")
-    print("make_ExecuteTrxFromAccountDataIterativeOrContinue accounts")
-    print("Holder: ", holder_address)
-    print("Operator: ", operator.public_key)
-    print("Treasury: ", treasury.account)
-    print("Operator eth solana: ", operator_balance)
+    data = b"".join((bytes((tag,)), treasury.buffer, _STEP.pack(step_count, index)))
+    operator_pubkey = operator.public_key
+    log_accounts(
+        "make_ExecuteTrxFromAccountDataIterativeOrContinue",
+        holder=holder_address,
+        operator=operator_pubkey,
+        treasury=treasury.account,
+        operator_balance=operator_balance,
+        additional=additional_accounts,
+    )
     accounts = [
         AccountMeta(pubkey=holder_address, is_signer=False, is_writable=True),
-        AccountMeta(pubkey=operator.public_key, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=operator_pubkey, is_signer=True, is_writable=True),
         AccountMeta(pubkey=treasury.account, is_signer=False, is_writable=True),
         AccountMeta(pubkey=operator_balance, is_signer=False, is_writable=True),
         AccountMeta(sys_program_id, is_signer=False, is_writable=True),
     ]
-
-    for acc in additional_accounts:
-        print("Additional acc ", acc)
-        accounts.append(
-            AccountMeta(acc, is_signer=False, is_writable=True),
-        )
+    accounts.extend(writable_accounts(additional_accounts))
 
     return TransactionInstruction(program_id=evm_loader_id, data=data, keys=accounts)
 
@@ -187,7 +201,7 @@ def make_PartialCallOrContinueFromRawEthereumTX(
     system_program=sp.SYS_PROGRAM_ID,
     tag=0x34,  # TransactionStepFromInstruction
 ):
-    data = bytes([tag]) + treasury.buffer + step_count.to_bytes(4, "little") + index.to_bytes(4, "little") + instruction
+    data = b"".join((bytes((tag,)), treasury.buffer, _STEP.pack(step_count, index), instruction))
 
     accounts = [
         AccountMeta(pubkey=storage_address, is_signer=False, is_writable=True),
@@ -196,10 +210,7 @@ def make_PartialCallOrContinueFromRawEthereumTX(
         AccountMeta(pubkey=operator_balance, is_signer=False, is_writable=True),
         AccountMeta(system_program, is_signer=False, is_writable=True),
     ]
-    for acc in additional_accounts:
-        accounts.append(
-            AccountMeta(acc, is_signer=False, is_writable=True),
-        )
+    accounts.extend(writable_accounts(additional_accounts))
 
     return TransactionInstruction(program_id=evm_loader_id, data=data, keys=accounts)
 
@@ -212,18 +223,14 @@ def make_Cancel(
     hash: bytes,
     additional_accounts: tp.List[PublicKey],
 ):
-    data = bytes([0x37]) + hash
+    data = b"\x37" + hash
 
     accounts = [
         AccountMeta(pubkey=storage_address, is_signer=False, is_writable=True),
         AccountMeta(pubkey=operator.public_key, is_signer=True, is_writable=True),
         AccountMeta(pubkey=operator_balance, is_signer=False, is_writable=True),
     ]
-
-    for acc in additional_accounts:
-        accounts.append(
-            AccountMeta(acc, is_signer=False, is_writable=True),
-        )
+    accounts.extend(writable_accounts(additional_accounts))
 
     return TransactionInstruction(program_id=evm_loader_id, data=data, keys=accounts)
 
@@ -286,7 +293,7 @@ def make_CreateBalanceAccount(
     contract_pubkey: PublicKey,
     chain_id,
 ) -> TransactionInstruction:
-    print("createBalanceAccount: {}".format(account_pubkey))
+    log_accounts("make_CreateBalanceAccount", balance=account_pubkey)
 
     data = bytes([0x30]) + ether_address + chain_id.to_bytes(8, "little")
     return TransactionInstruction(
@@ -309,7 +316,7 @@ def make_SyncNative(account: PublicKey):
 
 def make_CreateAccountWithSeed(funding, base, seed, lamports, space, program):
     created = PublicKey(sha256(bytes(base) + bytes(seed, "utf8") + bytes(program)).digest())
-    print(f"Created: {created}")
+    log_accounts("make_CreateAccountWithSeed", created=created)
     return sp.create_account_with_seed(
         sp.CreateAccountWithSeedParams(
             from_pubkey=funding,
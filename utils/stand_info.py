@@ -0,0 +1,78 @@
+"""Stand metadata (versions, chain id, EVM params) fetched once per test run.
+
+The controller fetches metadata with one batched request and passes it to xdist workers, the result is also kept
+in the pytest cache dir for `--stand-info-ttl` seconds, so the following runs don't touch the proxy at all.
+"""
+import dataclasses
+import time
+import typing as tp
+
+from _pytest.config import Config
+
+from utils.apiclient import JsonRPCSession
+
+CACHE_KEY = "neon/stand_info"
+DEFAULT_TTL = 300
+
+RPC_METHODS = {
+    "proxy_version": "neon_proxy_version",
+    "evm_version": "web3_clientVersion",
+    "cli_version": "neon_cli_version",
+    "chain_id": "eth_chainId",
+    "evm_params": "neon_getEvmParams",
+}
+
+
+@dataclasses.dataclass
+class StandInfo:
+    proxy_url: str
+    proxy_version: tp.Optional[str] = None
+    evm_version: tp.Optional[str] = None
+    cli_version: tp.Optional[str] = None
+    chain_id: tp.Optional[int] = None
+    evm_params: tp.Dict[str, tp.Any] = dataclasses.field(default_factory=dict)
+    fetched_at: float = 0.0
+
+    @classmethod
+    def fetch(cls, proxy_url: str) -> "StandInfo":
+        responses = JsonRPCSession(proxy_url).send_batch_rpc([(method, None) for method in RPC_METHODS.values()])
+        info = cls(proxy_url=proxy_url, fetched_at=time.time())
+        for name, response in zip(RPC_METHODS, responses):
+            if response.get("result") is not None:
+                setattr(info, name, response["result"])
+        if isinstance(info.chain_id, str):
+            info.chain_id = int(info.chain_id, 16)
+        return info
+
+    def is_expired(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at > ttl
+
+
+def get_stand_info(config: Config) -> StandInfo:
+    """Return metadata of the stand selected by --network, RPC is called only when nothing is cached"""
+    info = getattr(config, "stand_info", None)
+    if info is not None:
+        return info
+
+    proxy_url = config.environment.proxy_url  # noqa
+    ttl = config.getoption("--stand-info-ttl")
+    cache = getattr(config, "cache", None)
+    cache_key = f"{CACHE_KEY}/{config.getoption('--network')}"
+
+    worker_input = getattr(config, "workerinput", {})
+    if "stand_info" in worker_input:
+        info = StandInfo(**worker_input["stand_info"])
+    elif cache is not None and ttl > 0:
+        cached = cache.get(cache_key, None)
+        if cached is not None and cached.get("proxy_url") == proxy_url:
+            info = StandInfo(**cached)
+            if info.is_expired(ttl):
+                info = None
+
+    if info is None:
+        info = StandInfo.fetch(proxy_url)
+        if cache is not None and ttl > 0:
+            cache.set(cache_key, dataclasses.asdict(info))
+
+    config.stand_info = info
+    return info
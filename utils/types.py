@@ -1,7 +1,13 @@
+from __future__ import annotations
+
+import enum
 import typing as tp
 from dataclasses import dataclass
-from solana.publickey import PublicKey
-from solana.keypair import Keypair
+
+if tp.TYPE_CHECKING:
+    # solana is imported only for annotations to keep this module cheap for clickfile.py and conftest.py
+    from solana.publickey import PublicKey
+    from solana.keypair import Keypair
 
 
 @dataclass
@@ -43,3 +49,18 @@ TestGroup = tp.Literal[
     "evm",
     "compiler_compatibility",
 ]
+
+TEST_GROUPS: tp.Tuple[TestGroup, ...] = tp.get_args(TestGroup)
+
+
+class EnvName(str, enum.Enum):
+    NIGHT_STAND = "night-stand"
+    RELEASE_STAND = "release-stand"
+    MAINNET = "mainnet"
+    DEVNET = "devnet"
+    TESTNET = "testnet"
+    LOCAL = "local"
+    TERRAFORM = "terraform"
+    GETH = "geth"
+    TRACER_CI = "tracer_ci"
+    CUSTOM = "custom"
@@ -26,11 +26,14 @@ class Web3Client:
         proxy_url: str,
         tracer_url: tp.Optional[tp.Any] = None,
         session: tp.Optional[tp.Any] = None,
+        provider: tp.Optional[web3.providers.BaseProvider] = None,
     ):
         self._proxy_url = proxy_url
         self._tracer_url = tracer_url
         self._chain_id = None
-        self._web3 = web3.Web3(web3.HTTPProvider(proxy_url, session=session, request_kwargs={"timeout": 30}))
+        if provider is None:
+            provider = web3.HTTPProvider(proxy_url, session=session, request_kwargs={"timeout": 30})
+        self._web3 = web3.Web3(provider)
 
     def __getattr__(self, item):
         return getattr(self._web3, item)
@@ -401,8 +404,9 @@ class NeonChainWeb3Client(Web3Client):
         proxy_url: str,
         tracer_url: tp.Optional[tp.Any] = None,
         session: tp.Optional[tp.Any] = None,
+        provider: tp.Optional[web3.providers.BaseProvider] = None,
     ):
-        super().__init__(proxy_url, tracer_url, session)
+        super().__init__(proxy_url, tracer_url, session, provider)
 
     @allure.step("Create account with balance")
     def create_account_with_balance(